@@ -1,15 +1,166 @@
 import os
-from dataclasses import dataclass
+import tempfile
+from dataclasses import dataclass, field
+from typing import Optional
+
+from utilities.custom_exceptions import ConfigError
+
+
+def _default_checkpoint_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "cma-checkpoints")
+
+
+def _default_change_detection_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "cma-run-digests")
+
+
+def _default_idempotency_db_path() -> str:
+    return os.path.join(tempfile.gettempdir(), "cma-idempotency.sqlite3")
+
+
+def _int_from_env(name: str, default: str) -> int:
+    value = os.getenv(name, default)
+    try:
+        return int(value)
+    except ValueError:
+        raise ConfigError(f"{name} must be a whole number, not '{value}'")
+
+
+def _float_from_env(name: str, default: str) -> float:
+    value = os.getenv(name, default)
+    try:
+        return float(value)
+    except ValueError:
+        raise ConfigError(f"{name} must be a number, not '{value}'")
+
+
+def _list_from_env(name: str) -> list[str]:
+    return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
 
 
 @dataclass
 class Config:
     blaise_api_url: str
     blaise_server_park: str
+    blaise_server_parks: list[str] = field(default_factory=list)
+    request_deadline_seconds: float = 540.0
+    deadline_margin_seconds: float = 15.0
+    checkpoint_store: str = "memory"
+    checkpoint_dir: str = field(default_factory=_default_checkpoint_dir)
+    checkpoint_chunk_size: int = 50
+    checkpoint_ttl_seconds: float = 86400.0
+    blaise_read_rate_limit: float = 20.0
+    blaise_read_burst: float = 20.0
+    blaise_write_rate_limit: float = 10.0
+    blaise_write_burst: float = 10.0
+    blaise_write_initial_concurrency: int = 2
+    blaise_write_min_concurrency: int = 1
+    blaise_write_max_concurrency: int = 8
+    blaise_write_latency_target_seconds: float = 1.0
+    users_cache_ttl_seconds: float = 60.0
+    questionnaire_cache_ttl_seconds: float = 300.0
+    case_scan_guid_chunk_size: int = 25
+    reconcile_batch_size: int = 50
+    sweep_roles: list[str] = field(default_factory=list)
+    change_detection_store: str = "none"
+    change_detection_dir: str = field(default_factory=_default_change_detection_dir)
+    idempotency_store: str = "memory"
+    idempotency_db_path: str = field(default_factory=_default_idempotency_db_path)
+    idempotency_ttl_seconds: float = 86400.0
+    orchestrator_transport: str = "local"
+    orchestrator_worker_url: Optional[str] = None
+    orchestrator_shard_size: int = 200
+    orchestrator_max_parallel_shards: int = 4
+    admission_donor_cases_max_concurrent: int = 4
+    admission_donor_cases_max_queue: int = 8
+    admission_get_users_by_role_max_concurrent: int = 32
+    admission_get_users_by_role_max_queue: int = 64
+    admission_queue_timeout_seconds: float = 10.0
+    blaise_cassette_mode: str = "off"
+    blaise_cassette_path: Optional[str] = None
+    blaise_cassette_replay_latency: bool = False
+    profiling_top_n: int = 15
+    profiling_sample_interval_ms: float = 5.0
+
+    def get_server_parks(self) -> list[str]:
+        return self.blaise_server_parks or [self.blaise_server_park]
 
     @classmethod
     def from_env(cls):
+        server_parks = _list_from_env("BLAISE_SERVER_PARKS")
         return cls(
             blaise_api_url=os.getenv("BLAISE_API_URL"),
-            blaise_server_park=os.getenv("BLAISE_SERVER_PARK"),
+            # The first listed park is the default when BLAISE_SERVER_PARK is not set
+            blaise_server_park=os.getenv("BLAISE_SERVER_PARK")
+            or (server_parks[0] if server_parks else None),
+            blaise_server_parks=server_parks,
+            request_deadline_seconds=_float_from_env("REQUEST_DEADLINE_SECONDS", "540"),
+            deadline_margin_seconds=_float_from_env("DEADLINE_MARGIN_SECONDS", "15"),
+            # A configured checkpoint directory means resumes should survive the instance
+            checkpoint_store=os.getenv("CHECKPOINT_STORE")
+            or ("file" if os.getenv("CHECKPOINT_DIR") else "memory"),
+            checkpoint_dir=os.getenv("CHECKPOINT_DIR") or _default_checkpoint_dir(),
+            checkpoint_chunk_size=_int_from_env("CHECKPOINT_CHUNK_SIZE", "50"),
+            checkpoint_ttl_seconds=_float_from_env("CHECKPOINT_TTL_SECONDS", "86400"),
+            blaise_read_rate_limit=_float_from_env("BLAISE_READ_RATE_LIMIT", "20"),
+            blaise_read_burst=_float_from_env("BLAISE_READ_BURST", "20"),
+            blaise_write_rate_limit=_float_from_env("BLAISE_WRITE_RATE_LIMIT", "10"),
+            blaise_write_burst=_float_from_env("BLAISE_WRITE_BURST", "10"),
+            blaise_write_initial_concurrency=_int_from_env(
+                "BLAISE_WRITE_INITIAL_CONCURRENCY", "2"
+            ),
+            blaise_write_min_concurrency=_int_from_env(
+                "BLAISE_WRITE_MIN_CONCURRENCY", "1"
+            ),
+            blaise_write_max_concurrency=_int_from_env(
+                "BLAISE_WRITE_MAX_CONCURRENCY", "8"
+            ),
+            blaise_write_latency_target_seconds=_float_from_env(
+                "BLAISE_WRITE_LATENCY_TARGET_SECONDS", "1.0"
+            ),
+            users_cache_ttl_seconds=_float_from_env("USERS_CACHE_TTL_SECONDS", "60"),
+            questionnaire_cache_ttl_seconds=_float_from_env(
+                "QUESTIONNAIRE_CACHE_TTL_SECONDS", "300"
+            ),
+            case_scan_guid_chunk_size=_int_from_env("CASE_SCAN_GUID_CHUNK_SIZE", "25"),
+            reconcile_batch_size=_int_from_env("RECONCILE_BATCH_SIZE", "50"),
+            sweep_roles=_list_from_env("SWEEP_ROLES"),
+            change_detection_store=os.getenv("CHANGE_DETECTION_STORE", "none"),
+            change_detection_dir=os.getenv("CHANGE_DETECTION_DIR")
+            or _default_change_detection_dir(),
+            idempotency_store=os.getenv("IDEMPOTENCY_STORE", "memory"),
+            idempotency_db_path=os.getenv("IDEMPOTENCY_DB_PATH")
+            or _default_idempotency_db_path(),
+            idempotency_ttl_seconds=_float_from_env("IDEMPOTENCY_TTL_SECONDS", "86400"),
+            orchestrator_transport=os.getenv("ORCHESTRATOR_TRANSPORT", "local"),
+            orchestrator_worker_url=os.getenv("ORCHESTRATOR_WORKER_URL"),
+            orchestrator_shard_size=_int_from_env("ORCHESTRATOR_SHARD_SIZE", "200"),
+            orchestrator_max_parallel_shards=_int_from_env(
+                "ORCHESTRATOR_MAX_PARALLEL_SHARDS", "4"
+            ),
+            admission_donor_cases_max_concurrent=_int_from_env(
+                "ADMISSION_DONOR_CASES_MAX_CONCURRENT", "4"
+            ),
+            admission_donor_cases_max_queue=_int_from_env(
+                "ADMISSION_DONOR_CASES_MAX_QUEUE", "8"
+            ),
+            admission_get_users_by_role_max_concurrent=_int_from_env(
+                "ADMISSION_GET_USERS_BY_ROLE_MAX_CONCURRENT", "32"
+            ),
+            admission_get_users_by_role_max_queue=_int_from_env(
+                "ADMISSION_GET_USERS_BY_ROLE_MAX_QUEUE", "64"
+            ),
+            admission_queue_timeout_seconds=_float_from_env(
+                "ADMISSION_QUEUE_TIMEOUT_SECONDS", "10"
+            ),
+            blaise_cassette_mode=os.getenv("BLAISE_CASSETTE_MODE", "off"),
+            blaise_cassette_path=os.getenv("BLAISE_CASSETTE_PATH"),
+            blaise_cassette_replay_latency=os.getenv(
+                "BLAISE_CASSETTE_REPLAY_LATENCY", "false"
+            ).lower()
+            == "true",
+            profiling_top_n=_int_from_env("PROFILING_TOP_N", "15"),
+            profiling_sample_interval_ms=_float_from_env(
+                "PROFILING_SAMPLE_INTERVAL_MS", "5"
+            ),
         )
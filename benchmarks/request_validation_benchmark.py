@@ -0,0 +1,65 @@
+import logging
+import sys
+import time
+from pathlib import Path
+
+import flask
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.validation_service import ValidationService  # noqa: E402
+from utilities.custom_exceptions import RequestError  # noqa: E402
+
+VALID_REQUEST = {"questionnaire_name": "IPS2402a", "role": "IPS Manager"}
+MALFORMED_REQUESTS = [
+    {},
+    {"questionnaire_name": None, "role": ""},
+    {"questionnaire_name": "IP2402a", "role": "Regional Manager"},
+    {"questionnaire_name": 2402, "role": ["IPS Manager"]},
+    {"questionnaire_name": "IPS2402a", "role": "IPS Manager", "resume_token": "../"},
+    ["not", "an", "object"],
+    "IPS2402a",
+]
+
+
+class PreparsedRequest:
+    def __init__(self, json_data) -> None:
+        self.json_data = json_data
+
+    def get_json(self):
+        return self.json_data
+
+
+def run(label: str, requests: list, iterations: int) -> None:
+    validation_service = ValidationService()
+    rejected = 0
+    start_time = time.perf_counter()
+    for i in range(iterations):
+        try:
+            validation_service.get_valid_request_values_for_create_donor_cases(
+                requests[i % len(requests)]
+            )
+        except RequestError:
+            rejected += 1
+    elapsed = time.perf_counter() - start_time
+    print(
+        f"{label:<32} {iterations / elapsed:>12,.0f} req/s "
+        f"{elapsed / iterations * 1_000_000:>8.2f} us/req  rejected={rejected}"
+    )
+
+
+def main(iterations: int = 100_000) -> None:
+    # Rejections log at ERROR, which would otherwise dominate the timings
+    logging.disable(logging.CRITICAL)
+    valid = [PreparsedRequest(VALID_REQUEST)]
+    malformed = [PreparsedRequest(body) for body in MALFORMED_REQUESTS]
+    storm = [malformed[i % len(malformed)] for i in range(9)] + valid
+    run("valid requests", valid, iterations)
+    run("malformed request storm", malformed, iterations)
+    run("90% malformed mix", storm, iterations)
+    flask_requests = [flask.Request.from_values(json=VALID_REQUEST)]
+    run("valid flask requests", flask_requests, iterations)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,156 @@
+import argparse
+import csv
+import json
+import logging
+import sys
+import time
+from typing import Optional, TextIO
+
+from appconfig.config import Config
+from models.bulk_operation_model import (
+    BULK_RESULT_FIELDS,
+    BulkOperationReport,
+    UserResult,
+)
+from services.bulk_operation_service import BulkOperationService
+from services.service_container import ServiceContainer
+from services.validation_service import VALID_ROLES, ValidationService
+
+
+class ProgressDisplay:
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+        self._start_time = time.perf_counter()
+        self._failed = 0
+
+    def __call__(self, completed: int, total: int, result: UserResult) -> None:
+        if result.status == "failed":
+            self._failed += 1
+        elapsed = time.perf_counter() - self._start_time
+        rate = completed / elapsed if elapsed > 0 else 0.0
+        self._stream.write(
+            f"\r[{completed:>{len(str(total))}}/{total}] "
+            f"{completed / total:6.1%}  {rate:7.1f} users/s  failed: {self._failed}"
+        )
+        if completed == total:
+            self._stream.write("\n")
+        self._stream.flush()
+
+
+def write_json(report: BulkOperationReport, stream: TextIO) -> None:
+    json.dump(report.to_dict(), stream, indent=2)
+    stream.write("\n")
+
+
+def write_csv(report: BulkOperationReport, stream: TextIO) -> None:
+    writer = csv.DictWriter(stream, fieldnames=BULK_RESULT_FIELDS)
+    writer.writeheader()
+    for result in report.results:
+        row = result.to_dict()
+        row["case_ids"] = " ".join(result.case_ids)
+        writer.writerow(row)
+
+
+OUTPUT_WRITERS = {"json": write_json, "csv": write_csv}
+
+
+def read_users_file(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as users_file:
+        return [line.strip() for line in users_file if line.strip()]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Run bulk donor case operations against a Blaise server park",
+    )
+    parser.add_argument(
+        "--server-park",
+        help="Server park the questionnaire is installed on (defaults to BLAISE_SERVER_PARK)",
+    )
+    parser.add_argument(
+        "--parallelism",
+        type=int,
+        default=4,
+        help="Number of users processed at the same time (defaults to 4)",
+    )
+    parser.add_argument("--output", choices=OUTPUT_WRITERS, default="json")
+    parser.add_argument(
+        "--output-file", help="File to write per-user results to (defaults to stdout)"
+    )
+    parser.add_argument(
+        "--progress",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Show a progress line on stderr (defaults to on when stderr is a terminal)",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log at INFO")
+
+    subparsers = parser.add_subparsers(dest="operation", required=True)
+    for operation, description in (
+        ("list", "List the donor cases of each user"),
+        ("create", "Create missing donor cases"),
+        ("reissue", "Reissue a new donor case for each user"),
+    ):
+        subparser = subparsers.add_parser(operation, help=description)
+        subparser.add_argument("questionnaire_name")
+        users = subparser.add_mutually_exclusive_group(required=True)
+        users.add_argument("--role", choices=VALID_ROLES)
+        users.add_argument("--users", nargs="+", metavar="USER")
+        users.add_argument("--users-file", help="File with one username per line")
+    return parser
+
+
+def run(
+    argv: Optional[list[str]] = None,
+    stdout: TextIO = sys.stdout,
+    stderr: TextIO = sys.stderr,
+) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING, stream=stderr
+    )
+
+    try:
+        config = Config.from_env()
+        if args.server_park:
+            config.blaise_server_park = args.server_park
+            config.blaise_server_parks = [args.server_park]
+        ValidationService.validate_config(config)
+        services = ServiceContainer(config)
+        bulk_operation_service = BulkOperationService(
+            services.blaise_service,
+            services.donor_case_service,
+            services.user_service,
+            services.guid_service,
+            args.parallelism,
+        )
+        users = read_users_file(args.users_file) if args.users_file else args.users
+        show_progress = args.progress if args.progress is not None else stderr.isatty()
+        operation = {
+            "list": bulk_operation_service.list_donor_cases,
+            "create": bulk_operation_service.create_donor_cases,
+            "reissue": bulk_operation_service.reissue_donor_cases,
+        }[args.operation]
+        report = operation(
+            config.blaise_server_park,
+            args.questionnaire_name,
+            role=args.role,
+            users=users,
+            progress=ProgressDisplay(stderr) if show_progress else None,
+        )
+    except Exception as e:
+        stderr.write(f"Error running {args.operation}: {e}\n")
+        return 1
+
+    if args.output_file:
+        with open(args.output_file, "w", encoding="utf-8", newline="") as output:
+            OUTPUT_WRITERS[args.output](report, output)
+    else:
+        OUTPUT_WRITERS[args.output](report, stdout)
+    stderr.write(f"{report.summary()}\n")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -1,16 +1,23 @@
 import logging
+import os
+from typing import Any, Optional
 
 from flask import Request
 
 from appconfig.config import Config
-from services.blaise_service import BlaiseService
-from services.donor_case_service import DonorCaseService
-from services.guid_service import GUIDService
-from services.user_service import UserService
-from services.validation_service import ValidationService
+from models.checkpoint_model import Checkpoint
+from models.reconcile_model import ReconcileResult
+from models.shard_model import OrchestrationReport
+from models.sweep_model import SweepReport
+from services.prefetch_service import PrefetchResult
+from services.service_container import ServiceContainer, get_service_container
+from services.validation_service import VALID_ROLES, ValidationService
+from utilities.admission_control import admission_controlled
 from utilities.custom_exceptions import (
     BlaiseError,
+    CheckpointError,
     ConfigError,
+    DeadlineExceeded,
     DonorCaseError,
     GuidError,
     QuestionnaireNotFound,
@@ -18,47 +25,86 @@ from utilities.custom_exceptions import (
     UsersError,
     UsersWithRoleNotFound,
 )
+from utilities.deadline import Deadline, deadline_scope
+from utilities.diagnostics import get_diagnostics
+from utilities.idempotency import idempotent
+from utilities.idempotency_store import IdempotencyStore, get_idempotency_store
 from utilities.logging import setup_logger
+from utilities.profiling import profiled
+from utilities.single_flight import SingleFlight
+from utilities.tracing import set_span_attribute, setup_tracer, traced_handler, tracer
 
 setup_logger()
+setup_tracer()
 
+validation_service = ValidationService()
+_create_donor_cases_flight = SingleFlight("create_donor_cases")
 
+
+def _get_config() -> Optional[Config]:
+    try:
+        return get_service_container().config
+    except Exception:
+        # Leave config errors for the handler to report
+        return None
+
+
+def _get_idempotency_store() -> Optional[IdempotencyStore]:
+    try:
+        return get_idempotency_store(get_service_container().config)
+    except Exception:
+        # Leave config errors for the handler to report
+        return None
+
+
+@traced_handler("reissue_new_donor_case")
+@idempotent(
+    "reissue_new_donor_case",
+    "Error reissuing IPS donor cases",
+    _get_idempotency_store,
+)
+@admission_controlled("donor_cases", "Error reissuing IPS donor cases", _get_config)
+@profiled("reissue_new_donor_case", _get_config)
 def reissue_new_donor_case(request: Request) -> tuple[str, int]:
     try:
         logging.info("Running Cloud Function - 'reissue_new_donor_case'")
-        validation_service = ValidationService()
-
         # Request Handler
-        questionnaire_name, user = (
-            validation_service.get_valid_request_values_for_reissue_new_donor_case(
-                request
+        with tracer.start_as_current_span("request_handler"):
+            questionnaire_name, user = (
+                validation_service.get_valid_request_values_for_reissue_new_donor_case(
+                    request
+                )
             )
-        )
 
         # Config Handler
-        blaise_config = Config.from_env()
-        validation_service.validate_config(blaise_config)
-        blaise_server_park = blaise_config.blaise_server_park
+        with tracer.start_as_current_span("config_handler"):
+            services = get_service_container()
+            blaise_config = services.config
 
         # Blaise Handler
-        blaise_service = BlaiseService(blaise_config)
-        validation_service.validate_questionnaire_exists(
-            questionnaire_name, blaise_config
-        )
+        with tracer.start_as_current_span("blaise_handler"):
+            blaise_server_park = services.server_park_service.resolve_server_park(
+                questionnaire_name
+            )
+            validation_service.validate_questionnaire_exists(
+                questionnaire_name, blaise_config, blaise_server_park
+            )
 
         # GUID Handler
-        guid_service = GUIDService(blaise_service)
-        guid = guid_service.get_guid(blaise_server_park, questionnaire_name)
+        with tracer.start_as_current_span("guid_handler"):
+            guid = services.guid_service.get_guid(
+                blaise_server_park, questionnaire_name, fresh=True
+            )
 
         # User Handler
-        user_service = UserService(blaise_service)
-        user_service.get_user_by_name(blaise_server_park, user)
+        with tracer.start_as_current_span("user_handler"):
+            services.user_service.get_user_by_name(blaise_server_park, user)
 
         # Donor Case Handler
-        donor_case_service = DonorCaseService(blaise_service)
-        donor_case_service.reissue_new_donor_case_for_user(
-            questionnaire_name, guid, user
-        )
+        with tracer.start_as_current_span("donor_case_handler"):
+            services.donor_case_service.reissue_new_donor_case_for_user(
+                questionnaire_name, guid, user
+            )
 
         logging.info("Finished Running Cloud Function - 'reissue_new_donor_case'")
         return f"Successfully reissued new donor case for user: {user}", 200
@@ -76,44 +122,76 @@ def reissue_new_donor_case(request: Request) -> tuple[str, int]:
         return error_message, 500
 
 
+@traced_handler("create_donor_cases")
+@idempotent(
+    "create_donor_cases",
+    "Error creating IPS donor cases",
+    _get_idempotency_store,
+)
+@profiled("create_donor_cases", _get_config)
 def create_donor_cases(request: Request) -> tuple[str, int]:
     try:
         logging.info("Running Cloud Function - 'create_donor_cases'")
-        validation_service = ValidationService()
-
         # Request Handler
-        questionnaire_name, role = (
-            validation_service.get_valid_request_values_for_create_donor_cases(request)
-        )
-
-        # Config Handler
-        blaise_config = Config.from_env()
-        validation_service.validate_config(blaise_config)
-        blaise_server_park = blaise_config.blaise_server_park
-
-        # Blaise Handler
-        blaise_service = BlaiseService(blaise_config)
-        validation_service.validate_questionnaire_exists(
-            questionnaire_name, blaise_config
-        )
+        with tracer.start_as_current_span("request_handler"):
+            request_values = (
+                validation_service.get_valid_request_for_create_donor_cases(request)
+            )
+            questionnaire_name = request_values["questionnaire_name"]
+            role = request_values["role"]
+            resume_token = request_values["resume_token"]
+            mode = request_values["mode"] or "direct"
+            dry_run = bool(request_values["dry_run"])
+            set_span_attribute("request.questionnaire_name", questionnaire_name)
+            set_span_attribute("request.role", role)
+    except (RequestError, AttributeError, ValueError) as e:
+        error_message = f"Error creating IPS donor cases: {e}"
+        logging.error(error_message)
+        return error_message, 400
+    except Exception as e:
+        error_message = f"Error creating IPS donor cases: {e}"
+        logging.error(error_message)
+        return error_message, 500
 
-        # GUID Handler
-        guid_service = GUIDService(blaise_service)
-        guid = guid_service.get_guid(blaise_server_park, questionnaire_name)
+    # Identical concurrent requests on this instance share one run and one response
+    return _create_donor_cases_flight.do(
+        (questionnaire_name, role, resume_token, mode, dry_run),
+        _create_donor_cases_for_role,
+        questionnaire_name,
+        role,
+        resume_token,
+        mode,
+        dry_run,
+    )
 
-        # User Handler
-        user_service = UserService(blaise_service)
-        users_with_role = user_service.get_users_by_role(blaise_server_park, role)
-        validation_service.validate_users_with_role_exist(users_with_role, role)
 
-        # Donor Case Handler
-        donor_case_service = DonorCaseService(blaise_service)
-        donor_case_service.check_and_create_donor_case_for_users(
-            questionnaire_name, guid, users_with_role
-        )
+# Admitted inside the flight, so requests that join a running one do not hold a slot
+@admission_controlled("donor_cases", "Error creating IPS donor cases", _get_config)
+def _create_donor_cases_for_role(
+    questionnaire_name: str,
+    role: str,
+    resume_token: Optional[str],
+    mode: str,
+    dry_run: bool = False,
+) -> tuple[Any, int]:
+    try:
+        # Config Handler
+        with tracer.start_as_current_span("config_handler"):
+            services = get_service_container()
+            blaise_config = services.config
+            deadline = Deadline.from_config(blaise_config)
 
-        logging.info("Finished Running Cloud Function - 'create_donor_cases'")
-        return f"Successfully created donor cases for user role: {role}", 200
+        # Every Blaise call in the run is bounded by the deadline, including the prefetch
+        with deadline_scope(deadline):
+            return _create_donor_cases_within_deadline(
+                services,
+                questionnaire_name,
+                role,
+                resume_token,
+                mode,
+                dry_run,
+                deadline,
+            )
     except (RequestError, AttributeError, ValueError, ConfigError) as e:
         error_message = f"Error creating IPS donor cases: {e}"
         logging.error(error_message)
@@ -122,35 +200,313 @@ def create_donor_cases(request: Request) -> tuple[str, int]:
         error_message = f"Error creating IPS donor cases: {e}"
         logging.error(error_message)
         return error_message, 404
-    except (QuestionnaireNotFound, UsersWithRoleNotFound) as e:
+    except (QuestionnaireNotFound, UsersWithRoleNotFound, CheckpointError) as e:
         error_message = f"Error creating IPS donor cases: {e}"
         logging.error(error_message)
         return error_message, 422
+    except DeadlineExceeded as e:
+        error_message = f"Error creating IPS donor cases: {e}"
+        logging.error(error_message)
+        return error_message, 504
     except (GuidError, UsersError, DonorCaseError, Exception) as e:
         error_message = f"Error creating IPS donor cases: {e}"
         logging.error(error_message)
         return error_message, 500
 
 
-def get_users_by_role(request: Request) -> tuple[list[str], int]:
+def _create_donor_cases_within_deadline(
+    services: ServiceContainer,
+    questionnaire_name: str,
+    role: str,
+    resume_token: Optional[str],
+    mode: str,
+    dry_run: bool,
+    deadline: Deadline,
+) -> tuple[Any, int]:
+    blaise_config = services.config
+    if resume_token:
+        # Blaise Handler
+        with tracer.start_as_current_span("blaise_handler"):
+            validation_service.validate_questionnaire_exists(
+                questionnaire_name,
+                blaise_config,
+                services.server_park_service.resolve_server_park(questionnaire_name),
+            )
+
+        # Donor Case Handler - resuming a checkpointed run skips the GUID, user and case scans
+        with tracer.start_as_current_span("donor_case_handler"):
+            result = services.donor_case_service.resume_donor_case_creation(
+                resume_token, questionnaire_name, role, deadline
+            )
+    else:
+        # With change detection the case scan waits until it is known to be needed
+        detect_changes = mode == "direct" and services.change_detection_service.enabled
+
+        # Prefetch Handler - the questionnaire, GUID and case reads run alongside the users read
+        with tracer.start_as_current_span("prefetch_handler"):
+            prefetched = services.prefetch_service.prefetch_for_donor_case_creation(
+                blaise_config,
+                questionnaire_name,
+                role,
+                include_existing_donor_cases=not detect_changes,
+            )
+            validation_service.validate_users_with_role_exist(
+                prefetched.users_with_role, role
+            )
+
+        if mode == "orchestrate":
+            # Orchestrator Handler - shards are created by workers and reported back here
+            with tracer.start_as_current_span("orchestrator_handler"):
+                report = services.orchestrator_service.orchestrate(
+                    questionnaire_name,
+                    prefetched.guid,
+                    role,
+                    prefetched.users_with_role,
+                    _get_existing_donor_cases(services, prefetched),
+                    deadline,
+                )
+            return _orchestration_response(report)
+
+        if mode == "reconcile":
+            # User Handler - served by the users download the prefetch just refreshed
+            with tracer.start_as_current_span("user_handler"):
+                ips_users = services.user_service.get_users_with_any_role(
+                    blaise_config.blaise_server_park, VALID_ROLES
+                )
+
+            # Reconcile Handler - missing cases are created and stale ones retired
+            with tracer.start_as_current_span("donor_case_handler"):
+                reconcile_result = services.reconcile_service.reconcile(
+                    questionnaire_name,
+                    prefetched.guid,
+                    role,
+                    prefetched.users_with_role,
+                    ips_users,
+                    _get_existing_donor_cases(services, prefetched),
+                    deadline,
+                    dry_run,
+                )
+            return _reconcile_response(reconcile_result)
+
+        if detect_changes:
+            # Change Detection Handler
+            with tracer.start_as_current_span("change_detection_handler"):
+                fingerprint = services.change_detection_service.fingerprint(
+                    prefetched.guid, prefetched.users_with_role
+                )
+                if services.change_detection_service.is_unchanged(
+                    questionnaire_name, role, fingerprint
+                ):
+                    logging.info(
+                        "Finished Running Cloud Function - 'create_donor_cases'"
+                    )
+                    return (
+                        f"Donor cases are up to date for user role: {role}. "
+                        "Nothing has changed since the last run",
+                        200,
+                    )
+
+        existing_donor_cases = _get_existing_donor_cases(services, prefetched)
+
+        # Donor Case Handler
+        with tracer.start_as_current_span("donor_case_handler"):
+            result = services.donor_case_service.check_and_create_donor_case_for_users(
+                questionnaire_name,
+                prefetched.guid,
+                prefetched.users_with_role,
+                deadline,
+                Checkpoint(questionnaire_name, role, prefetched.guid),
+                existing_donor_cases=existing_donor_cases,
+            )
+
+        if detect_changes and not result.is_partial:
+            services.change_detection_service.record(
+                questionnaire_name, role, fingerprint
+            )
+
+    if result.is_partial:
+        logging.warning(
+            "Partially finished Running Cloud Function - 'create_donor_cases'",
+            extra={"json_fields": result.to_dict()},
+        )
+        resume_scope = (
+            ". The checkpoint is held in memory, so only this instance can resume it"
+            if result.resume_token and services.config.checkpoint_store == "memory"
+            else ""
+        )
+        return (
+            f"Partially created donor cases for user role: {role} before the request deadline. "
+            f"{result.summary()}. Resume token: {result.resume_token}{resume_scope}",
+            202,
+        )
+
+    logging.info("Finished Running Cloud Function - 'create_donor_cases'")
+    return f"Successfully created donor cases for user role: {role}", 200
+
+
+def _get_existing_donor_cases(
+    services: ServiceContainer, prefetched: PrefetchResult
+) -> list[str]:
+    if prefetched.existing_donor_cases is not None:
+        return prefetched.existing_donor_cases
+
+    # Existing Donor Case Handler - the prefetch left the case scan until it was needed
+    with tracer.start_as_current_span("existing_donor_case_handler"):
+        return services.blaise_service.get_all_existing_donor_cases(prefetched.guid)
+
+
+def _reconcile_response(result: ReconcileResult) -> tuple[dict[str, Any], int]:
+    if not result.is_complete:
+        logging.warning(
+            "Partially finished Running Cloud Function - 'create_donor_cases'",
+            extra={"json_fields": result.to_dict()},
+        )
+        return result.to_dict(), 202
+
+    logging.info(
+        "Finished Running Cloud Function - 'create_donor_cases'",
+        extra={"json_fields": result.to_dict()},
+    )
+    return result.to_dict(), 200
+
+
+def _orchestration_response(report: OrchestrationReport) -> tuple[str, int]:
+    if not report.is_complete:
+        logging.warning(
+            "Partially finished Running Cloud Function - 'create_donor_cases'",
+            extra={"json_fields": report.to_dict()},
+        )
+        return (
+            f"Partially created donor cases for user role: {report.role}. "
+            f"{report.summary()}. Failed shards: {report.failed_shards}",
+            202,
+        )
+
+    logging.info(
+        "Finished Running Cloud Function - 'create_donor_cases'",
+        extra={"json_fields": report.to_dict()},
+    )
+    return (
+        f"Successfully created donor cases for user role: {report.role}. {report.summary()}",
+        200,
+    )
+
+
+@traced_handler("create_donor_cases_shard")
+@admission_controlled(
+    "donor_cases", "Error creating IPS donor cases shard", _get_config
+)
+@profiled("create_donor_cases_shard", _get_config)
+def create_donor_cases_shard(request: Request) -> tuple[Any, int]:
     try:
-        logging.info("Running Cloud Function - 'get-users-by-role'")
-        validation_service = ValidationService()
+        logging.info("Running Cloud Function - 'create_donor_cases_shard'")
 
         # Request Handler
-        role = validation_service.get_valid_request_value_for_get_users(request)
+        with tracer.start_as_current_span("request_handler"):
+            task = validation_service.get_valid_shard_task(request)
+            set_span_attribute("shard.index", task.shard_index)
+            set_span_attribute("shard.user_count", len(task.users))
 
         # Config Handler
-        blaise_config = Config.from_env()
-        validation_service.validate_config(blaise_config)
-        blaise_server_park = blaise_config.blaise_server_park
+        with tracer.start_as_current_span("config_handler"):
+            services = get_service_container()
+            deadline = Deadline.from_config(services.config)
+
+        # Donor Case Handler
+        with tracer.start_as_current_span("donor_case_handler"):
+            shard_result = services.shard_worker_service.run_shard(task, deadline)
+
+        logging.info("Finished Running Cloud Function - 'create_donor_cases_shard'")
+        return shard_result.to_dict(), 202 if shard_result.status == "partial" else 200
+    except (RequestError, AttributeError, ValueError, ConfigError) as e:
+        error_message = f"Error creating IPS donor cases shard: {e}"
+        logging.error(error_message)
+        return error_message, 400
+    except Exception as e:
+        error_message = f"Error creating IPS donor cases shard: {e}"
+        logging.error(error_message)
+        return error_message, 500
+
+
+@traced_handler("sweep_donor_cases")
+@admission_controlled("donor_cases", "Error sweeping IPS donor cases", _get_config)
+@profiled("sweep_donor_cases", _get_config)
+def sweep_donor_cases(request: Request) -> tuple[Any, int]:
+    try:
+        logging.info("Running Cloud Function - 'sweep_donor_cases'")
+        # Config Handler
+        with tracer.start_as_current_span("config_handler"):
+            services = get_service_container()
+            deadline = Deadline.from_config(services.config)
+
+        # Request Handler
+        with tracer.start_as_current_span("request_handler"):
+            roles = validation_service.get_valid_roles_for_sweep(
+                request, services.config.sweep_roles
+            )
+            set_span_attribute("request.roles", roles)
+
+        report = services.sweep_service.sweep(roles, deadline)
+        return _sweep_response(report)
+    except (RequestError, AttributeError, ValueError, ConfigError) as e:
+        error_message = f"Error sweeping IPS donor cases: {e}"
+        logging.error(error_message)
+        return error_message, 400
+    except BlaiseError as e:
+        error_message = f"Error sweeping IPS donor cases: {e}"
+        logging.error(error_message)
+        return error_message, 404
+    except DeadlineExceeded as e:
+        error_message = f"Error sweeping IPS donor cases: {e}"
+        logging.error(error_message)
+        return error_message, 504
+    except Exception as e:
+        error_message = f"Error sweeping IPS donor cases: {e}"
+        logging.error(error_message)
+        return error_message, 500
 
-        # Blaise Handler
-        blaise_service = BlaiseService(blaise_config)
+
+def _sweep_response(report: SweepReport) -> tuple[dict[str, Any], int]:
+    if not report.is_complete:
+        logging.warning(
+            "Partially finished Running Cloud Function - 'sweep_donor_cases'",
+            extra={"json_fields": report.to_dict()},
+        )
+        return report.to_dict(), 202
+
+    logging.info(
+        "Finished Running Cloud Function - 'sweep_donor_cases'",
+        extra={"json_fields": report.to_dict()},
+    )
+    return report.to_dict(), 200
+
+
+@traced_handler("get_users_by_role")
+@admission_controlled(
+    "get_users_by_role",
+    "Error retrieving users",
+    _get_config,
+    format_body=lambda message: [message],
+)
+@profiled("get_users_by_role", _get_config)
+def get_users_by_role(request: Request) -> tuple[list[str], int]:
+    try:
+        logging.info("Running Cloud Function - 'get-users-by-role'")
+        # Request Handler
+        with tracer.start_as_current_span("request_handler"):
+            role = validation_service.get_valid_request_value_for_get_users(request)
+
+        # Config Handler
+        with tracer.start_as_current_span("config_handler"):
+            services = get_service_container()
+            blaise_server_park = services.config.blaise_server_park
 
         # User Handler
-        user_service = UserService(blaise_service)
-        users_with_role = user_service.get_users_by_role(blaise_server_park, role)
+        with tracer.start_as_current_span("user_handler") as span:
+            users_with_role = services.user_service.get_users_by_role(
+                blaise_server_park, role
+            )
+            span.set_attribute("users.with_role_count", len(users_with_role))
 
         logging.info(f"Finished Running Cloud Function - 'get-users-by-role")
         return users_with_role, 200
@@ -166,3 +522,73 @@ def get_users_by_role(request: Request) -> tuple[list[str], int]:
         error_message = f"Error retrieving users: {e}"
         logging.error(error_message)
         return [error_message], 500
+
+
+def _warm_up_instance() -> dict[str, Any]:
+    # Config Handler
+    with tracer.start_as_current_span("config_handler"):
+        services = get_service_container()
+
+    # Warm-up Handler - each server park is warmed concurrently
+    with tracer.start_as_current_span("warmup_handler"):
+        summaries = services.server_park_service.map_server_parks(
+            services.warmup_service.warm_up
+        )
+    if len(summaries) == 1:
+        return summaries[0]
+    return {"server_parks": summaries}
+
+
+@traced_handler("warm_up")
+@profiled("warm_up", _get_config)
+def warm_up(request: Request) -> tuple[Any, int]:
+    try:
+        logging.info("Running Cloud Function - 'warm_up'")
+        summary = _warm_up_instance()
+        logging.info("Finished Running Cloud Function - 'warm_up'")
+        return summary, 200
+    except ConfigError as e:
+        error_message = f"Error warming up instance: {e}"
+        logging.error(error_message)
+        return error_message, 400
+    except BlaiseError as e:
+        error_message = f"Error warming up instance: {e}"
+        logging.error(error_message)
+        return error_message, 404
+    except Exception as e:
+        error_message = f"Error warming up instance: {e}"
+        logging.error(error_message)
+        return error_message, 500
+
+
+@traced_handler("diagnostics")
+def diagnostics(request: Request) -> tuple[Any, int]:
+    # Not admission controlled, so it still answers when the instance is saturated
+    report = get_diagnostics()
+    try:
+        services = get_service_container()
+        report["ready"] = True
+        report["blaise_client"] = {
+            "api_url": services.config.blaise_api_url,
+            "server_parks": services.config.get_server_parks(),
+            # blaise_restapi opens a new connection per call, so there is no pool to report
+            "connection_pool": None,
+        }
+        return report, 200
+    except Exception as e:
+        logging.error(f"Instance is not ready: {e}")
+        report["ready"] = False
+        report["not_ready_reason"] = str(e)
+        return report, 503
+
+
+def warm_up_on_instance_start() -> None:
+    if os.getenv("WARMUP_ON_START", "false").lower() != "true":
+        return
+    try:
+        _warm_up_instance()
+    except Exception as e:
+        logging.warning(f"Instance warm-up failed, continuing with cold caches: {e}")
+
+
+warm_up_on_instance_start()
@@ -0,0 +1,68 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+BULK_RESULT_FIELDS = ("user", "status", "case_ids", "error", "duration_ms")
+
+
+@dataclass
+class UserResult:
+    user: str
+    status: str
+    case_ids: list[str] = field(default_factory=list)
+    error: Optional[str] = None
+    duration_ms: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "user": self.user,
+            "status": self.status,
+            "case_ids": self.case_ids,
+            "error": self.error,
+            "duration_ms": self.duration_ms,
+        }
+
+
+@dataclass
+class BulkOperationReport:
+    operation: str
+    server_park: str
+    questionnaire_name: Optional[str]
+    results: list[UserResult] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+    @property
+    def status_counts(self) -> dict[str, int]:
+        return dict(sorted(Counter(result.status for result in self.results).items()))
+
+    @property
+    def failed(self) -> list[UserResult]:
+        return [result for result in self.results if result.status == "failed"]
+
+    @property
+    def users_per_second(self) -> float:
+        if self.duration_seconds <= 0:
+            return 0.0
+        return round(len(self.results) / self.duration_seconds, 1)
+
+    def summary(self) -> str:
+        counts = ", ".join(
+            f"{status}: {count}" for status, count in self.status_counts.items()
+        )
+        return (
+            f"{self.operation.capitalize()} processed {len(self.results)} users in "
+            f"{round(self.duration_seconds, 2)}s ({self.users_per_second} users/s). "
+            f"{counts or 'No users'}"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "operation": self.operation,
+            "server_park": self.server_park,
+            "questionnaire_name": self.questionnaire_name,
+            "summary": self.summary(),
+            "status_counts": self.status_counts,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "users_per_second": self.users_per_second,
+            "results": [result.to_dict() for result in self.results],
+        }
@@ -0,0 +1,34 @@
+import secrets
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+@dataclass
+class Checkpoint:
+    questionnaire_name: str
+    role: str
+    guid: str
+    resume_token: str = field(default_factory=lambda: secrets.token_urlsafe(16))
+    pending_users: list[str] = field(default_factory=list)
+    cursor: int = 0
+    users_done: list[str] = field(default_factory=list)
+    users_failed: list[str] = field(default_factory=list)
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def remaining_users(self) -> list[str]:
+        return self.pending_users[self.cursor :]
+
+    def prepare_for_resume(self) -> None:
+        # Failed users are retried first, successful users are never re-attempted
+        self.pending_users = self.users_failed + self.remaining_users
+        self.cursor = 0
+        self.users_failed = []
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Checkpoint":
+        return cls(**data)
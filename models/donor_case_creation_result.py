@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class DonorCaseCreationResult:
+    created: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    remaining: list[str] = field(default_factory=list)
+    deadline_exceeded: bool = False
+    resume_token: Optional[str] = None
+
+    @property
+    def is_partial(self) -> bool:
+        return len(self.remaining) > 0
+
+    def summary(self) -> str:
+        return (
+            f"Created: {len(self.created)}, "
+            f"skipped: {len(self.skipped)}, "
+            f"remaining: {len(self.remaining)}"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "created": self.created,
+            "skipped": self.skipped,
+            "remaining": self.remaining,
+            "deadline_exceeded": self.deadline_exceeded,
+            "resume_token": self.resume_token,
+        }
@@ -0,0 +1,23 @@
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+@dataclass
+class IdempotentResponse:
+    key: str
+    request_hash: str
+    body: Any
+    status_code: int
+    expires_at: float
+    stored_at: float = field(default_factory=time.time)
+
+    def is_expired(self, now: float) -> bool:
+        return now >= self.expires_at
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "IdempotentResponse":
+        return cls(**data)
@@ -0,0 +1,83 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+CREATE_ACTION = "create"
+RETIRE_ACTION = "retire"
+
+
+@dataclass
+class ReconcileAction:
+    action: str
+    user: str
+    case_id: str
+    status: str = "planned"
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "action": self.action,
+            "user": self.user,
+            "case_id": self.case_id,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+@dataclass
+class ReconcileResult:
+    questionnaire_name: str
+    role: str
+    dry_run: bool
+    actions: list[ReconcileAction] = field(default_factory=list)
+    kept: list[str] = field(default_factory=list)
+    deadline_exceeded: bool = False
+
+    def _count(self, action: str, status: str) -> int:
+        return sum(
+            1
+            for reconcile_action in self.actions
+            if reconcile_action.action == action and reconcile_action.status == status
+        )
+
+    @property
+    def created(self) -> int:
+        return self._count(CREATE_ACTION, "done")
+
+    @property
+    def retired(self) -> int:
+        return self._count(RETIRE_ACTION, "done")
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for action in self.actions if action.status == "failed")
+
+    @property
+    def not_run(self) -> int:
+        return sum(1 for action in self.actions if action.status == "not_run")
+
+    @property
+    def is_complete(self) -> bool:
+        return self.failed == 0 and self.not_run == 0
+
+    def summary(self) -> str:
+        if self.dry_run:
+            return (
+                f"Would create: {self._count(CREATE_ACTION, 'planned')}, "
+                f"would retire: {self._count(RETIRE_ACTION, 'planned')}, "
+                f"kept: {len(self.kept)}"
+            )
+        return (
+            f"Created: {self.created}, retired: {self.retired}, kept: {len(self.kept)}, "
+            f"failed: {self.failed}, not run: {self.not_run}"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "questionnaire_name": self.questionnaire_name,
+            "role": self.role,
+            "dry_run": self.dry_run,
+            "summary": self.summary(),
+            "deadline_exceeded": self.deadline_exceeded,
+            "kept": self.kept,
+            "actions": [action.to_dict() for action in self.actions],
+        }
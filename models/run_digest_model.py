@@ -0,0 +1,20 @@
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+@dataclass
+class RunDigest:
+    questionnaire_name: str
+    role: str
+    guid: str
+    users_hash: str
+    cma_record_count: int
+    recorded_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RunDigest":
+        return cls(**data)
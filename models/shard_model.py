@@ -0,0 +1,93 @@
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+
+@dataclass
+class ShardTask:
+    questionnaire_name: str
+    guid: str
+    role: str
+    shard_index: int
+    shard_count: int
+    users: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ShardTask":
+        return cls(**data)
+
+
+@dataclass
+class ShardResult:
+    shard_index: int
+    created: list[str] = field(default_factory=list)
+    remaining: list[str] = field(default_factory=list)
+    deadline_exceeded: bool = False
+    error: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return "failed"
+        if self.remaining:
+            return "partial"
+        return "complete"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "status": self.status}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ShardResult":
+        return cls(
+            shard_index=data["shard_index"],
+            created=data.get("created", []),
+            remaining=data.get("remaining", []),
+            deadline_exceeded=data.get("deadline_exceeded", False),
+            error=data.get("error"),
+        )
+
+
+@dataclass
+class OrchestrationReport:
+    questionnaire_name: str
+    role: str
+    skipped: list[str] = field(default_factory=list)
+    shards: list[ShardResult] = field(default_factory=list)
+
+    @property
+    def created(self) -> list[str]:
+        return [user for shard in self.shards for user in shard.created]
+
+    @property
+    def remaining(self) -> list[str]:
+        return [user for shard in self.shards for user in shard.remaining]
+
+    @property
+    def failed_shards(self) -> list[int]:
+        return [shard.shard_index for shard in self.shards if shard.status == "failed"]
+
+    @property
+    def is_complete(self) -> bool:
+        return all(shard.status == "complete" for shard in self.shards)
+
+    def summary(self) -> str:
+        return (
+            f"Shards: {len(self.shards)}, "
+            f"failed shards: {len(self.failed_shards)}, "
+            f"created: {len(self.created)}, "
+            f"skipped: {len(self.skipped)}, "
+            f"remaining: {len(self.remaining)}"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "questionnaire_name": self.questionnaire_name,
+            "role": self.role,
+            "created": self.created,
+            "skipped": self.skipped,
+            "remaining": self.remaining,
+            "failed_shards": self.failed_shards,
+            "shards": [shard.to_dict() for shard in self.shards],
+        }
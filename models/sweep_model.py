@@ -0,0 +1,70 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from models.donor_case_creation_result import DonorCaseCreationResult
+
+
+@dataclass
+class SweepEntry:
+    server_park: str
+    questionnaire_name: str
+    role: str
+    status: str = "not_run"
+    created: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    remaining: list[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def apply_result(self, result: DonorCaseCreationResult) -> None:
+        self.created = result.created
+        self.skipped = result.skipped
+        self.remaining = result.remaining
+        self.status = "partial" if result.is_partial else "complete"
+
+    def to_dict(self) -> dict:
+        return {
+            "server_park": self.server_park,
+            "questionnaire_name": self.questionnaire_name,
+            "role": self.role,
+            "status": self.status,
+            "created": len(self.created),
+            "skipped": len(self.skipped),
+            "remaining": len(self.remaining),
+            "error": self.error,
+        }
+
+
+@dataclass
+class SweepReport:
+    roles: list[str]
+    entries: list[SweepEntry] = field(default_factory=list)
+    deadline_exceeded: bool = False
+
+    def _count(self, status: str) -> int:
+        return sum(1 for entry in self.entries if entry.status == status)
+
+    @property
+    def questionnaires(self) -> list[str]:
+        return sorted({entry.questionnaire_name for entry in self.entries})
+
+    @property
+    def is_complete(self) -> bool:
+        return all(entry.status in ("complete", "no_users") for entry in self.entries)
+
+    def summary(self) -> str:
+        return (
+            f"Questionnaires: {len(self.questionnaires)}, roles: {len(self.roles)}, "
+            f"created: {sum(len(entry.created) for entry in self.entries)}, "
+            f"complete: {self._count('complete')}, no users: {self._count('no_users')}, "
+            f"partial: {self._count('partial')}, "
+            f"failed: {self._count('failed')}, not run: {self._count('not_run')}"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "summary": self.summary(),
+            "questionnaires": self.questionnaires,
+            "roles": self.roles,
+            "deadline_exceeded": self.deadline_exceeded,
+            "entries": [entry.to_dict() for entry in self.entries],
+        }
@@ -1,34 +1,97 @@
 import logging
-from typing import Any, Dict
-
-import blaise_restapi
+from typing import Any, Callable, Dict
 
 from appconfig.config import Config
 from models.donor_case_model import DonorCaseModel
-from utilities.custom_exceptions import BlaiseError
+from utilities.blaise_call_counter import CountingClient
+from utilities.blaise_cassette import get_blaise_client
+from utilities.concurrency_limiter import get_concurrency_limiter
+from utilities.custom_exceptions import BlaiseError, DeadlineExceeded
+from utilities.deadline import check_deadline
 from utilities.logging import function_name
+from utilities.rate_limiter import (
+    TokenBucket,
+    acquire_within_deadline,
+    get_rate_limiter,
+)
 from utilities.regex import extract_username_from_case_id
+from utilities.single_flight import SingleFlight
+from utilities.tracing import set_span_attribute, traced
+from utilities.ttl_cache import get_ttl_cache
+
+_read_flight = SingleFlight("blaise_reads")
 
 
 class BlaiseService:
     def __init__(self, config: Config) -> None:
         self._config = config
-        self.restapi_client = blaise_restapi.Client(
-            f"http://{self._config.blaise_api_url}"
-        )
+        self.restapi_client = CountingClient(get_blaise_client(self._config))
 
         self.cma_serverpark_name = "cma"
         self.cma_questionnaire = "CMA_Launcher"
 
+        # Limiters are shared by every BlaiseService in the process
+        self._read_limiter = get_rate_limiter(
+            "blaise_read", config.blaise_read_rate_limit, config.blaise_read_burst
+        )
+        self._write_limiter = get_rate_limiter(
+            "blaise_write", config.blaise_write_rate_limit, config.blaise_write_burst
+        )
+        self._write_concurrency_limiter = get_concurrency_limiter(
+            "blaise_write",
+            config.blaise_write_initial_concurrency,
+            config.blaise_write_min_concurrency,
+            config.blaise_write_max_concurrency,
+            config.blaise_write_latency_target_seconds,
+        )
+        self._users_cache = get_ttl_cache(
+            "blaise_users", config.users_cache_ttl_seconds
+        )
+        self._questionnaire_cache = get_ttl_cache(
+            "blaise_questionnaires", config.questionnaire_cache_ttl_seconds
+        )
+
+    @property
+    def max_write_concurrency(self) -> int:
+        return self._write_concurrency_limiter.max_limit
+
+    @staticmethod
+    def _throttle(limiter: TokenBucket) -> None:
+        wait_seconds = acquire_within_deadline(limiter)
+        if wait_seconds > 0:
+            set_span_attribute("rate_limiter.wait_ms", round(wait_seconds * 1000, 3))
+
+    def _read(self, func: Callable, *args) -> Any:
+        self._throttle(self._read_limiter)
+        return func(*args)
+
+    @traced("blaise.get_questionnaire")
     def get_questionnaire(
-        self, server_park: str, questionnaire_name: str
+        self, server_park: str, questionnaire_name: str, fresh: bool = False
     ) -> Dict[str, Any]:
+        check_deadline("getting questionnaire")
         try:
-            questionnaire = self.restapi_client.get_questionnaire_for_server_park(
-                server_park, questionnaire_name
-            )
+            cache_key = (self._config.blaise_api_url, server_park, questionnaire_name)
+
+            def read_questionnaire() -> Dict[str, Any]:
+                return self._read(
+                    self.restapi_client.get_questionnaire_for_server_park,
+                    server_park,
+                    questionnaire_name,
+                )
+
+            if fresh:
+                # A reinstalled questionnaire has a new GUID, so writes never use a cached one
+                questionnaire = read_questionnaire()
+                self._questionnaire_cache.set(cache_key, questionnaire)
+            else:
+                questionnaire = self._questionnaire_cache.get_or_load(
+                    cache_key, read_questionnaire
+                )
             logging.info(f"Got questionnaire '{questionnaire_name}'")
             return questionnaire
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             error_message = (
                 f"Exception caught in {function_name()}. "
@@ -37,9 +100,76 @@ class BlaiseService:
             logging.error(error_message)
             raise BlaiseError(error_message)
 
-    def get_users(self, server_park: str) -> list[dict[str, Any]]:
+    @traced("blaise.questionnaire_exists")
+    def questionnaire_exists(self, server_park: str, questionnaire_name: str) -> bool:
+        check_deadline("checking questionnaire exists")
+        try:
+            return self._read(
+                self.restapi_client.questionnaire_exists_on_server_park,
+                server_park,
+                questionnaire_name,
+            )
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            error_message = (
+                f"Exception caught in {function_name()}. "
+                f"Error checking questionnaire '{questionnaire_name}' exists "
+                f"on server park {server_park}: {e}"
+            )
+            logging.error(error_message)
+            raise BlaiseError(error_message)
+
+    @traced("blaise.get_all_questionnaires")
+    def get_all_questionnaires(self, server_park: str) -> list[dict[str, Any]]:
+        check_deadline("getting questionnaires")
         try:
-            return self.restapi_client.get_users()
+            return self._read(
+                self.restapi_client.get_all_questionnaires_for_server_park, server_park
+            )
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            error_message = (
+                f"Exception caught in {function_name()}. "
+                f"Error getting questionnaires from server park {server_park}: {e}"
+            )
+            logging.error(error_message)
+            raise BlaiseError(error_message)
+
+    def cache_questionnaires(
+        self, server_park: str, questionnaires: list[dict[str, Any]]
+    ) -> None:
+        for questionnaire in questionnaires:
+            self._questionnaire_cache.set(
+                (self._config.blaise_api_url, server_park, questionnaire["name"]),
+                questionnaire,
+            )
+
+    @traced("blaise.get_users")
+    def get_users(self, server_park: str, fresh: bool = False) -> list[dict[str, Any]]:
+        check_deadline("getting users")
+        try:
+            cache_key = self._config.blaise_api_url
+
+            # Concurrent requests on this instance share a single users download
+            def download_users() -> list[dict[str, Any]]:
+                return _read_flight.do(
+                    ("get_users", cache_key),
+                    self._read,
+                    self.restapi_client.get_users,
+                )
+
+            if fresh:
+                # Writes act on the current users, the download still refreshes the cache
+                users = download_users()
+                self._users_cache.set(cache_key, users)
+            else:
+                users = self._users_cache.get_or_load(cache_key, download_users)
+            set_span_attribute("blaise.user_count", len(users))
+            return users
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             error_message = (
                 f"Exception caught in {function_name()}. "
@@ -48,15 +178,24 @@ class BlaiseService:
             logging.error(error_message)
             raise BlaiseError(error_message)
 
+    @traced("blaise.get_questionnaire_cases")
     def get_questionnaire_cases(self, guid: str) -> dict[str, Any]:
+        check_deadline("getting questionnaire cases")
         try:
-            cases = self.restapi_client.get_questionnaire_data(
+            # Concurrent requests on this instance share a single case scan per GUID
+            cases = _read_flight.do(
+                ("get_questionnaire_cases", self._config.blaise_api_url, guid),
+                self._read,
+                self.restapi_client.get_questionnaire_data,
                 self.cma_serverpark_name,
                 self.cma_questionnaire,
                 ["MainSurveyID", "id", "CMA_IsDonorCase"],
                 f"MainSurveyID='{guid}'",
             )
+            set_span_attribute("blaise.case_count", len(cases["reportingData"]))
             return cases
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             error_message = (
                 f"Exception caught in {function_name()}. "
@@ -65,6 +204,7 @@ class BlaiseService:
             logging.error(error_message)
             raise BlaiseError(error_message)
 
+    @traced("blaise.get_all_existing_donor_cases")
     def get_all_existing_donor_cases(self, guid: str):
         try:
             cases = self.get_questionnaire_cases(guid)
@@ -76,6 +216,8 @@ class BlaiseService:
                     and (entry["cmA_IsDonorCase"] == "1")
                 ]
             )
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             error_message = (
                 f"Exception caught in {function_name()}. "
@@ -84,6 +226,66 @@ class BlaiseService:
             logging.error(error_message)
             raise BlaiseError(error_message)
 
+    @traced("blaise.get_cma_launcher_record_count")
+    def get_cma_launcher_record_count(self) -> int:
+        # Read fresh rather than from the questionnaire cache, it is used to detect new writes
+        check_deadline("getting the CMA_Launcher record count")
+        try:
+            questionnaire = self._read(
+                self.restapi_client.get_questionnaire_for_server_park,
+                self.cma_serverpark_name,
+                self.cma_questionnaire,
+            )
+            return int(questionnaire["dataRecordCount"])
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            error_message = (
+                f"Exception caught in {function_name()}. "
+                f"Error getting the {self.cma_questionnaire} record count: {e}"
+            )
+            logging.error(error_message)
+            raise BlaiseError(error_message)
+
+    @traced("blaise.get_existing_donor_cases_for_guids")
+    def get_existing_donor_cases_for_guids(
+        self, guids: list[str]
+    ) -> dict[str, list[str]]:
+        # One CMA_Launcher query per chunk of GUIDs, rather than one per questionnaire
+        guids = list(dict.fromkeys(guids))
+        chunk_size = max(1, self._config.case_scan_guid_chunk_size)
+        donor_cases_by_guid: dict[str, list[str]] = {guid: [] for guid in guids}
+        try:
+            for start in range(0, len(guids), chunk_size):
+                check_deadline("getting questionnaire cases")
+                chunk = guids[start : start + chunk_size]
+                cases = self._read(
+                    self.restapi_client.get_questionnaire_data,
+                    self.cma_serverpark_name,
+                    self.cma_questionnaire,
+                    ["MainSurveyID", "id", "CMA_IsDonorCase"],
+                    " OR ".join(f"MainSurveyID='{guid}'" for guid in chunk),
+                )
+                for entry in cases["reportingData"]:
+                    donor_cases = donor_cases_by_guid.get(entry["mainSurveyID"])
+                    if donor_cases is not None and entry["cmA_IsDonorCase"] == "1":
+                        donor_cases.append(entry["id"])
+            set_span_attribute("blaise.guid_count", len(guids))
+            return {
+                guid: sorted(donor_cases)
+                for guid, donor_cases in donor_cases_by_guid.items()
+            }
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            error_message = (
+                f"Exception caught in {function_name()}. "
+                f"Error getting existing donor cases for {len(guids)} questionnaires: {e}"
+            )
+            logging.error(error_message)
+            raise BlaiseError(error_message)
+
+    @traced("blaise.get_existing_donor_cases_for_user")
     def get_existing_donor_cases_for_user(
         self, guid: str, user: str
     ) -> list[dict[str, Any]]:
@@ -100,6 +302,8 @@ class BlaiseService:
                     donor_cases.append(entry)
 
             return donor_cases
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             error_message = (
                 f"Exception caught in {function_name()}. "
@@ -108,18 +312,47 @@ class BlaiseService:
             logging.error(error_message)
             raise BlaiseError(error_message)
 
-    def create_donor_case_for_user(self, donor_case_model: DonorCaseModel) -> None:
+    @traced("blaise.delete_donor_case")
+    def delete_donor_case(self, guid: str, case_id: str) -> None:
+        check_deadline("deleting donor case")
+        self._throttle(self._write_limiter)
         try:
-            self.restapi_client.create_multikey_case(
-                self.cma_serverpark_name,
-                self.cma_questionnaire,
-                donor_case_model.key_names,
-                donor_case_model.key_values,
-                donor_case_model.data_fields,
+            with self._write_concurrency_limiter.limit_concurrency():
+                self.restapi_client.delete_multikey_case(
+                    self.cma_serverpark_name,
+                    self.cma_questionnaire,
+                    DonorCaseModel.format_key_names(),
+                    [guid, case_id],
+                )
+            logging.info(f"Deleted donor case '{case_id}' for GUID {guid}")
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            error_message = (
+                f"Exception caught in {function_name()}. "
+                f"Error deleting donor case '{case_id}': {e}"
             )
+            logging.error(error_message)
+            raise BlaiseError(error_message)
+
+    @traced("blaise.create_donor_case_for_user")
+    def create_donor_case_for_user(self, donor_case_model: DonorCaseModel) -> None:
+        check_deadline("creating donor case")
+        self._throttle(self._write_limiter)
+        try:
+            with self._write_concurrency_limiter.limit_concurrency():
+                self.restapi_client.create_multikey_case(
+                    self.cma_serverpark_name,
+                    self.cma_questionnaire,
+                    donor_case_model.key_names,
+                    donor_case_model.key_values,
+                    donor_case_model.data_fields,
+                )
             logging.info(
                 f"Created donor case for user '{donor_case_model.user}' for questionnaire {donor_case_model.questionnaire_name}"
             )
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             error_message = (
                 f"Exception caught in {function_name()}. "
@@ -0,0 +1,171 @@
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional
+
+from models.bulk_operation_model import BulkOperationReport, UserResult
+from models.donor_case_model import DonorCaseModel
+from services.blaise_service import BlaiseService
+from services.donor_case_service import DonorCaseService
+from services.guid_service import GUIDService
+from services.user_service import UserService
+from utilities.custom_exceptions import UsersError
+from utilities.logging import function_name
+from utilities.regex import extract_username_from_case_id
+
+ProgressCallback = Callable[[int, int, UserResult], None]
+
+
+class BulkOperationService:
+    def __init__(
+        self,
+        blaise_service: BlaiseService,
+        donor_case_service: DonorCaseService,
+        user_service: UserService,
+        guid_service: GUIDService,
+        parallelism: int = 4,
+    ) -> None:
+        self._blaise_service = blaise_service
+        self._donor_case_service = donor_case_service
+        self._user_service = user_service
+        self._guid_service = guid_service
+        self.parallelism = max(1, parallelism)
+
+    def get_users(
+        self,
+        server_park: str,
+        role: Optional[str] = None,
+        users: Optional[list[str]] = None,
+        fresh: bool = False,
+    ) -> list[str]:
+        if users:
+            return list(dict.fromkeys(users))
+        if role is None:
+            error_message = (
+                f"Exception caught in {function_name()}. "
+                f"A role or a list of users is required"
+            )
+            logging.error(error_message)
+            raise UsersError(error_message)
+        return self._user_service.get_users_by_role(server_park, role, fresh)
+
+    def _existing_donor_cases_by_user(self, guid: str) -> dict[str, list[str]]:
+        donor_cases_by_user: dict[str, list[str]] = {}
+        for case_id in self._blaise_service.get_all_existing_donor_cases(guid):
+            donor_cases_by_user.setdefault(
+                extract_username_from_case_id(case_id), []
+            ).append(case_id)
+        return donor_cases_by_user
+
+    def _run(
+        self,
+        report: BulkOperationReport,
+        users: list[str],
+        operation: Callable[[str], UserResult],
+        progress: Optional[ProgressCallback],
+    ) -> BulkOperationReport:
+        def run_for_user(user: str) -> UserResult:
+            start_time = time.perf_counter()
+            try:
+                result = operation(user)
+            except Exception as e:
+                result = UserResult(user, "failed", error=str(e))
+            result.duration_ms = round((time.perf_counter() - start_time) * 1000, 3)
+            return result
+
+        start_time = time.perf_counter()
+        results: dict[str, UserResult] = {}
+        # Writes are still paced by the BlaiseService rate and write concurrency limiters
+        with ThreadPoolExecutor(
+            max_workers=self.parallelism, thread_name_prefix="bulk-operation"
+        ) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, run_for_user, user)
+                for user in users
+            ]
+            for completed, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                results[result.user] = result
+                if progress is not None:
+                    progress(completed, len(users), result)
+
+        report.results = [results[user] for user in users]
+        report.duration_seconds = time.perf_counter() - start_time
+        return report
+
+    def list_donor_cases(
+        self,
+        server_park: str,
+        questionnaire_name: str,
+        role: Optional[str] = None,
+        users: Optional[list[str]] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> BulkOperationReport:
+        guid = self._guid_service.get_guid(server_park, questionnaire_name)
+        users = self.get_users(server_park, role, users)
+        donor_cases_by_user = self._existing_donor_cases_by_user(guid)
+
+        def list_for_user(user: str) -> UserResult:
+            case_ids = donor_cases_by_user.get(user, [])
+            return UserResult(user, "exists" if case_ids else "missing", case_ids)
+
+        return self._run(
+            BulkOperationReport("list", server_park, questionnaire_name),
+            users,
+            list_for_user,
+            progress,
+        )
+
+    def create_donor_cases(
+        self,
+        server_park: str,
+        questionnaire_name: str,
+        role: Optional[str] = None,
+        users: Optional[list[str]] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> BulkOperationReport:
+        guid = self._guid_service.get_guid(server_park, questionnaire_name, fresh=True)
+        users = self.get_users(server_park, role, users, fresh=True)
+        existing_donor_cases = self._blaise_service.get_all_existing_donor_cases(guid)
+
+        def create_for_user(user: str) -> UserResult:
+            if not self._donor_case_service.donor_case_does_not_exist(
+                user, existing_donor_cases
+            ):
+                return UserResult(user, "skipped", [user])
+            donor_case_model = DonorCaseModel(user, questionnaire_name, guid)
+            self._blaise_service.create_donor_case_for_user(donor_case_model)
+            return UserResult(user, "created", [donor_case_model.data_fields["id"]])
+
+        return self._run(
+            BulkOperationReport("create", server_park, questionnaire_name),
+            users,
+            create_for_user,
+            progress,
+        )
+
+    def reissue_donor_cases(
+        self,
+        server_park: str,
+        questionnaire_name: str,
+        role: Optional[str] = None,
+        users: Optional[list[str]] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> BulkOperationReport:
+        guid = self._guid_service.get_guid(server_park, questionnaire_name, fresh=True)
+        users = self.get_users(server_park, role, users, fresh=True)
+        donor_cases_by_user = self._existing_donor_cases_by_user(guid)
+
+        def reissue_for_user(user: str) -> UserResult:
+            case_id = self._donor_case_service.reissue_new_donor_case_for_user(
+                questionnaire_name, guid, user, donor_cases_by_user.get(user, [])
+            )
+            return UserResult(user, "reissued", [case_id])
+
+        return self._run(
+            BulkOperationReport("reissue", server_park, questionnaire_name),
+            users,
+            reissue_for_user,
+            progress,
+        )
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from models.run_digest_model import RunDigest
+from services.blaise_service import BlaiseService
+from utilities.digest_store import DigestStore
+
+
+def _hash_names(names: Iterable[str]) -> str:
+    return hashlib.sha256(json.dumps(sorted(set(names))).encode()).hexdigest()
+
+
+@dataclass
+class Fingerprint:
+    guid: str
+    users_hash: str
+    cma_record_count: int
+
+
+class ChangeDetectionService:
+    def __init__(
+        self, blaise_service: BlaiseService, digest_store: Optional[DigestStore]
+    ) -> None:
+        self._blaise_service = blaise_service
+        self._digest_store = digest_store
+
+    @property
+    def enabled(self) -> bool:
+        return self._digest_store is not None
+
+    def fingerprint(self, guid: str, users_with_role: list[str]) -> Fingerprint:
+        return Fingerprint(
+            guid,
+            _hash_names(users_with_role),
+            self._blaise_service.get_cma_launcher_record_count(),
+        )
+
+    def is_unchanged(
+        self, questionnaire_name: str, role: str, fingerprint: Fingerprint
+    ) -> bool:
+        if self._digest_store is None:
+            return False
+        digest = self._digest_store.load(questionnaire_name, role)
+        # Any write to CMA_Launcher, by this function or anyone else, changes the record count
+        unchanged = (
+            digest is not None
+            and digest.guid == fingerprint.guid
+            and digest.users_hash == fingerprint.users_hash
+            and digest.cma_record_count == fingerprint.cma_record_count
+        )
+        if unchanged:
+            logging.info(
+                f"Role membership and CMA_Launcher are unchanged for questionnaire "
+                f"{questionnaire_name} and role {role} since the last run"
+            )
+        return unchanged
+
+    def record(
+        self, questionnaire_name: str, role: str, fingerprint: Fingerprint
+    ) -> None:
+        if self._digest_store is None:
+            return
+        # The count was read before the case scan, so any write made since then,
+        # including this run's own, makes the next run a full one
+        self._digest_store.save(
+            RunDigest(
+                questionnaire_name,
+                role,
+                fingerprint.guid,
+                fingerprint.users_hash,
+                fingerprint.cma_record_count,
+            )
+        )
@@ -1,16 +1,37 @@
+import contextvars
 import logging
 import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
 
+from models.checkpoint_model import Checkpoint
+from models.donor_case_creation_result import DonorCaseCreationResult
 from models.donor_case_model import DonorCaseModel
 from services.blaise_service import BlaiseService
-from utilities.custom_exceptions import BlaiseError, DonorCaseError
+from utilities.checkpoint_store import CheckpointStore
+from utilities.custom_exceptions import (
+    BlaiseError,
+    CheckpointError,
+    DeadlineExceeded,
+    DonorCaseError,
+)
+from utilities.deadline import Deadline, deadline_scope, get_current_deadline
 from utilities.logging import function_name
 from utilities.regex import extract_username_from_case_id
+from utilities.tracing import set_span_attribute
 
 
 class DonorCaseService:
-    def __init__(self, blaise_service: BlaiseService) -> None:
+    def __init__(
+        self,
+        blaise_service: BlaiseService,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        checkpoint_chunk_size: int = 50,
+    ) -> None:
         self._blaise_service = blaise_service
+        self._checkpoint_store = checkpoint_store
+        self._checkpoint_chunk_size = max(1, checkpoint_chunk_size)
 
     @staticmethod
     def assert_expected_number_of_donor_cases_created(
@@ -34,29 +55,56 @@ class DonorCaseService:
                 donor_cases_excluding_duplicates.append(username)
         return donor_cases_excluding_duplicates
 
+    @staticmethod
+    def _with_resume_token(message: str, result: DonorCaseCreationResult) -> str:
+        # The checkpoint is kept when a run fails, so the caller can retry the failed
+        # users without repeating the ones that were already created
+        if result.resume_token is None:
+            return message
+        return f"{message}. Resume token: {result.resume_token}"
+
     def check_and_create_donor_case_for_users(
-        self, questionnaire_name: str, guid: str, users_with_role: list
-    ) -> None:
-        total_donor_cases_created = 0
+        self,
+        questionnaire_name: str,
+        guid: str,
+        users_with_role: list,
+        deadline: Optional[Deadline] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        existing_donor_cases: Optional[list[str]] = None,
+    ) -> DonorCaseCreationResult:
+        result = DonorCaseCreationResult()
         try:
-            users_with_existing_donor_cases = (
-                self._blaise_service.get_all_existing_donor_cases(guid)
-            )
-            for user in users_with_role:
-                if self.donor_case_does_not_exist(
-                    user, users_with_existing_donor_cases
-                ):
-                    donor_case_model = DonorCaseModel(user, questionnaire_name, guid)
-                    self._blaise_service.create_donor_case_for_user(donor_case_model)
-                    total_donor_cases_created += 1
+            with deadline_scope(deadline):
+                users_with_existing_donor_cases = (
+                    existing_donor_cases
+                    if existing_donor_cases is not None
+                    else self._blaise_service.get_all_existing_donor_cases(guid)
+                )
+                users_to_create = []
+                for user in users_with_role:
+                    if self.donor_case_does_not_exist(
+                        user, users_with_existing_donor_cases
+                    ):
+                        users_to_create.append(user)
+                    else:
+                        result.skipped.append(user)
+
+                if checkpoint is not None:
+                    checkpoint.pending_users = users_to_create
+                self.create_donor_cases_for_users(
+                    questionnaire_name, guid, users_to_create, result, checkpoint
+                )
         except BlaiseError as e:
-            raise BlaiseError(e.message)
+            raise BlaiseError(self._with_resume_token(e.message, result))
         except DonorCaseError as e:
-            raise DonorCaseError(e.message)
+            raise DonorCaseError(self._with_resume_token(e.message, result))
+        except (DeadlineExceeded, CheckpointError):
+            raise
         except Exception as e:
-            error_message = (
+            error_message = self._with_resume_token(
                 f"Exception caught in {function_name()}. "
-                f"Error when checking and creating donor cases: {e}"
+                f"Error when checking and creating donor cases: {e}",
+                result,
             )
             logging.error(error_message)
             raise DonorCaseError(error_message)
@@ -64,21 +112,191 @@ class DonorCaseService:
         users_with_existing_donor_cases_excluding_duplicates = (
             self.filter_duplicate_donor_cases(users_with_existing_donor_cases)
         )
+        set_span_attribute(
+            "donor_cases.existing_count",
+            len(users_with_existing_donor_cases_excluding_duplicates),
+        )
+        set_span_attribute("donor_cases.created_count", len(result.created))
+        set_span_attribute("donor_cases.remaining_count", len(result.remaining))
 
-        self.assert_expected_number_of_donor_cases_created(
-            expected_number_of_cases_to_create=len(users_with_role)
-            - len(users_with_existing_donor_cases_excluding_duplicates),
-            total_donor_cases_created=total_donor_cases_created,
+        if result.deadline_exceeded:
+            logging.warning(
+                f"Stopped creating donor cases before the request deadline. {result.summary()}"
+            )
+        else:
+            self.assert_expected_number_of_donor_cases_created(
+                expected_number_of_cases_to_create=len(users_with_role)
+                - len(users_with_existing_donor_cases_excluding_duplicates),
+                total_donor_cases_created=len(result.created),
+            )
+        return result
+
+    def resume_donor_case_creation(
+        self,
+        resume_token: str,
+        questionnaire_name: str,
+        role: str,
+        deadline: Optional[Deadline] = None,
+    ) -> DonorCaseCreationResult:
+        if self._checkpoint_store is None:
+            error_message = (
+                "Cannot resume donor case creation, checkpoints are disabled"
+            )
+            logging.error(error_message)
+            raise CheckpointError(error_message)
+
+        checkpoint = self._checkpoint_store.load(resume_token)
+        if (
+            checkpoint is None
+            or checkpoint.questionnaire_name != questionnaire_name
+            or checkpoint.role != role
+        ):
+            error_message = (
+                f"No checkpoint found for resume token '{resume_token}' "
+                f"with questionnaire {questionnaire_name} and role {role}"
+            )
+            logging.error(error_message)
+            raise CheckpointError(error_message)
+
+        logging.info(
+            f"Resuming donor case creation for questionnaire {questionnaire_name} and role {role}. "
+            f"{len(checkpoint.users_done)} users already done, "
+            f"{len(checkpoint.users_failed)} failed users to retry, "
+            f"{len(checkpoint.remaining_users)} users remaining"
         )
+        checkpoint.prepare_for_resume()
+        result = DonorCaseCreationResult()
+        try:
+            with deadline_scope(deadline):
+                self.create_donor_cases_for_users(
+                    questionnaire_name,
+                    checkpoint.guid,
+                    checkpoint.pending_users,
+                    result,
+                    checkpoint,
+                )
+        except BlaiseError as e:
+            raise BlaiseError(self._with_resume_token(e.message, result))
+        except (DeadlineExceeded, CheckpointError):
+            raise
+        except Exception as e:
+            error_message = self._with_resume_token(
+                f"Exception caught in {function_name()}. "
+                f"Error when resuming donor case creation: {e}",
+                result,
+            )
+            logging.error(error_message)
+            raise DonorCaseError(error_message)
 
-    def reissue_new_donor_case_for_user(
-        self, questionnaire_name: str, guid: str, user: str
+        if result.deadline_exceeded:
+            logging.warning(
+                f"Stopped creating donor cases before the request deadline. {result.summary()}"
+            )
+        return result
+
+    def create_donor_cases_for_users(
+        self,
+        questionnaire_name: str,
+        guid: str,
+        users: list[str],
+        result: DonorCaseCreationResult,
+        checkpoint: Optional[Checkpoint] = None,
     ) -> None:
+        deadline = get_current_deadline()
+        if checkpoint is not None and self._checkpoint_store is not None:
+            result.resume_token = checkpoint.resume_token
+            self._save_checkpoint(checkpoint)
+
+        # Each chunk is created concurrently, the number of requests actually in flight
+        # is governed by the adaptive write concurrency limiter in the BlaiseService
+        with ThreadPoolExecutor(
+            max_workers=max(1, self._blaise_service.max_write_concurrency),
+            thread_name_prefix="donor-case",
+        ) as executor:
+            for chunk_start in range(0, len(users), self._checkpoint_chunk_size):
+                chunk = users[chunk_start : chunk_start + self._checkpoint_chunk_size]
+                futures: dict[str, Future] = {}
+                for user in chunk:
+                    if deadline is not None and deadline.expired():
+                        break
+                    donor_case_model = DonorCaseModel(user, questionnaire_name, guid)
+                    futures[user] = executor.submit(
+                        contextvars.copy_context().run,
+                        self._blaise_service.create_donor_case_for_user,
+                        donor_case_model,
+                    )
+
+                done, failed, not_done = [], [], []
+                first_error: Optional[Exception] = None
+                for user in chunk:
+                    future = futures.get(user)
+                    if future is None:
+                        not_done.append(user)
+                        continue
+                    try:
+                        future.result()
+                    except DeadlineExceeded:
+                        not_done.append(user)
+                    except Exception as e:
+                        failed.append(user)
+                        first_error = first_error or e
+                    else:
+                        done.append(user)
+                result.created.extend(done)
+
+                if checkpoint is not None:
+                    # Keep every processed user of the chunk ahead of the cursor
+                    checkpoint.pending_users[chunk_start : chunk_start + len(chunk)] = (
+                        done + failed + not_done
+                    )
+                    checkpoint.users_done.extend(done)
+                    checkpoint.users_failed.extend(failed)
+                    checkpoint.cursor = chunk_start + len(done) + len(failed)
+                    self._save_checkpoint(checkpoint)
+
+                if first_error is not None:
+                    raise first_error
+                if not_done:
+                    result.remaining = not_done + list(
+                        users[chunk_start + len(chunk) :]
+                    )
+                    result.deadline_exceeded = True
+                    break
+
+        if checkpoint is None or self._checkpoint_store is None:
+            return
+        if result.is_partial:
+            self._save_checkpoint(checkpoint)
+        else:
+            self._checkpoint_store.delete(checkpoint.resume_token)
+            result.resume_token = None
+
+    def _save_checkpoint(self, checkpoint: Checkpoint) -> None:
+        if self._checkpoint_store is None:
+            return
+        checkpoint.updated_at = time.time()
+        self._checkpoint_store.save(checkpoint)
+
+    def reissue_new_donor_case_for_user(
+        self,
+        questionnaire_name: str,
+        guid: str,
+        user: str,
+        existing_donor_case_ids: Optional[list[str]] = None,
+    ) -> str:
         try:
-            donor_cases = self._blaise_service.get_existing_donor_cases_for_user(
-                guid, user
-            )
-            if len(donor_cases) == 0:
+            # Bulk reissues pass the user's case IDs from one scan, rather than scanning per user
+            if existing_donor_case_ids is None:
+                donor_case_ids = [
+                    donor_case["id"]
+                    for donor_case in self._blaise_service.get_existing_donor_cases_for_user(
+                        guid, user
+                    )
+                ]
+            else:
+                donor_case_ids = existing_donor_case_ids
+
+            if len(donor_case_ids) == 0:
                 error_message = (
                     f"Exception caught in {function_name()}. "
                     f"Cannot reissue a new donor case. User has no existing donor cases."
@@ -86,11 +304,6 @@ class DonorCaseService:
                 logging.error(error_message)
                 raise DonorCaseError(error_message)
 
-            donor_case_ids = []
-
-            for donor_case in donor_cases:
-                donor_case_ids.append(donor_case["id"])
-
             numbers = [
                 int(match.group())
                 for id in donor_case_ids
@@ -110,6 +323,7 @@ class DonorCaseService:
                 f"New Donor case created for user {user} with ID of {donor_case_model.data_fields['id']}"
             )
             self._blaise_service.create_donor_case_for_user(donor_case_model)
+            return donor_case_model.data_fields["id"]
 
         except BlaiseError as e:
             raise BlaiseError(e.message)
@@ -0,0 +1,86 @@
+import concurrent.futures
+import logging
+from concurrent.futures import Future
+from typing import Optional
+
+from models.shard_model import OrchestrationReport, ShardResult, ShardTask
+from utilities.deadline import Deadline, deadline_scope
+from utilities.task_transport import TaskTransport
+from utilities.tracing import set_span_attribute
+
+
+class OrchestratorService:
+    def __init__(self, transport: TaskTransport, shard_size: int) -> None:
+        self._transport = transport
+        self._shard_size = max(1, shard_size)
+
+    def partition(
+        self, questionnaire_name: str, guid: str, role: str, users: list[str]
+    ) -> list[ShardTask]:
+        user_shards = [
+            users[start : start + self._shard_size]
+            for start in range(0, len(users), self._shard_size)
+        ]
+        return [
+            ShardTask(questionnaire_name, guid, role, index, len(user_shards), shard)
+            for index, shard in enumerate(user_shards)
+        ]
+
+    def orchestrate(
+        self,
+        questionnaire_name: str,
+        guid: str,
+        role: str,
+        users_with_role: list[str],
+        users_with_existing_donor_cases: list[str],
+        deadline: Optional[Deadline] = None,
+    ) -> OrchestrationReport:
+        existing = set(users_with_existing_donor_cases)
+        report = OrchestrationReport(
+            questionnaire_name,
+            role,
+            skipped=[user for user in users_with_role if user in existing],
+        )
+        users_to_create = [user for user in users_with_role if user not in existing]
+        tasks = self.partition(questionnaire_name, guid, role, users_to_create)
+        logging.info(
+            f"Dispatching {len(users_to_create)} users for questionnaire {questionnaire_name} "
+            f"as {len(tasks)} shards of up to {self._shard_size}"
+        )
+
+        with deadline_scope(deadline):
+            futures: dict[Future, ShardTask] = {
+                self._transport.dispatch(task): task for task in tasks
+            }
+            done, not_done = concurrent.futures.wait(
+                futures, deadline.remaining() if deadline is not None else None
+            )
+
+        for future in done:
+            task = futures[future]
+            try:
+                report.shards.append(future.result())
+            except Exception as e:
+                error_message = f"Shard {task.shard_index + 1}/{task.shard_count} could not be dispatched: {e}"
+                logging.error(error_message)
+                report.shards.append(
+                    ShardResult(
+                        task.shard_index, remaining=task.users, error=error_message
+                    )
+                )
+        for future in not_done:
+            task = futures[future]
+            report.shards.append(
+                ShardResult(
+                    task.shard_index,
+                    remaining=task.users,
+                    deadline_exceeded=True,
+                    error=f"Shard {task.shard_index + 1}/{task.shard_count} did not report back before the request deadline",
+                )
+            )
+        report.shards.sort(key=lambda shard: shard.shard_index)
+
+        set_span_attribute("orchestrator.shard_count", len(tasks))
+        set_span_attribute("orchestrator.failed_shard_count", len(report.failed_shards))
+        set_span_attribute("donor_cases.created_count", len(report.created))
+        return report
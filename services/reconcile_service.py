@@ -0,0 +1,127 @@
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from models.donor_case_model import DonorCaseModel
+from models.reconcile_model import (
+    CREATE_ACTION,
+    RETIRE_ACTION,
+    ReconcileAction,
+    ReconcileResult,
+)
+from services.blaise_service import BlaiseService
+from utilities.custom_exceptions import DeadlineExceeded
+from utilities.deadline import Deadline, deadline_scope
+from utilities.regex import extract_username_from_case_id
+from utilities.tracing import set_span_attribute
+
+
+class ReconcileService:
+    def __init__(self, blaise_service: BlaiseService, batch_size: int) -> None:
+        self._blaise_service = blaise_service
+        self._batch_size = max(1, batch_size)
+
+    @staticmethod
+    def plan(
+        questionnaire_name: str,
+        role: str,
+        users_with_role: list[str],
+        ips_users: list[str],
+        existing_donor_cases: list[str],
+        dry_run: bool,
+    ) -> ReconcileResult:
+        result = ReconcileResult(questionnaire_name, role, dry_run)
+        # Donor cases are not tied to a role, so only users with no IPS role lose theirs
+        users_to_keep = set(users_with_role) | set(ips_users)
+        existing = set(existing_donor_cases)
+        for user in users_with_role:
+            if user in existing:
+                result.kept.append(user)
+            else:
+                result.actions.append(ReconcileAction(CREATE_ACTION, user, user))
+        # Reissued cases such as "2-jim" belong to jim, so they stay while jim has a role
+        for case_id in existing_donor_cases:
+            user = extract_username_from_case_id(case_id)
+            if user not in users_to_keep:
+                result.actions.append(ReconcileAction(RETIRE_ACTION, user, case_id))
+        return result
+
+    def _run_action(
+        self, questionnaire_name: str, guid: str, action: ReconcileAction
+    ) -> None:
+        if action.action == CREATE_ACTION:
+            self._blaise_service.create_donor_case_for_user(
+                DonorCaseModel(action.user, questionnaire_name, guid)
+            )
+        else:
+            self._blaise_service.delete_donor_case(guid, action.case_id)
+
+    def reconcile(
+        self,
+        questionnaire_name: str,
+        guid: str,
+        role: str,
+        users_with_role: list[str],
+        ips_users: list[str],
+        existing_donor_cases: list[str],
+        deadline: Optional[Deadline] = None,
+        dry_run: bool = False,
+    ) -> ReconcileResult:
+        result = self.plan(
+            questionnaire_name,
+            role,
+            users_with_role,
+            ips_users,
+            existing_donor_cases,
+            dry_run,
+        )
+        set_span_attribute("reconcile.planned_count", len(result.actions))
+        if dry_run:
+            logging.info(
+                f"Dry run of reconciling donor cases for questionnaire {questionnaire_name} "
+                f"and role {role}. {result.summary()}"
+            )
+            return result
+
+        with deadline_scope(deadline), ThreadPoolExecutor(
+            max_workers=max(1, self._blaise_service.max_write_concurrency),
+            thread_name_prefix="reconcile",
+        ) as executor:
+            for batch_start in range(0, len(result.actions), self._batch_size):
+                batch = result.actions[batch_start : batch_start + self._batch_size]
+                if deadline is not None and deadline.expired():
+                    for action in result.actions[batch_start:]:
+                        action.status = "not_run"
+                    result.deadline_exceeded = True
+                    break
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        self._run_action,
+                        questionnaire_name,
+                        guid,
+                        action,
+                    )
+                    for action in batch
+                ]
+                # One failed action does not stop the rest, each is reported on its own
+                for action, future in zip(batch, futures):
+                    try:
+                        future.result()
+                    except DeadlineExceeded:
+                        action.status = "not_run"
+                        result.deadline_exceeded = True
+                    except Exception as e:
+                        action.status = "failed"
+                        action.error = str(e)
+                    else:
+                        action.status = "done"
+
+        set_span_attribute("donor_cases.created_count", result.created)
+        set_span_attribute("donor_cases.retired_count", result.retired)
+        logging.info(
+            f"Reconciled donor cases for questionnaire {questionnaire_name} "
+            f"and role {role}. {result.summary()}"
+        )
+        return result
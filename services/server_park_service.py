@@ -0,0 +1,97 @@
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from services.blaise_service import BlaiseService
+from utilities.custom_exceptions import BlaiseError
+from utilities.ttl_cache import get_ttl_cache
+
+
+class ServerParkService:
+    def __init__(
+        self,
+        blaise_service: BlaiseService,
+        server_parks: list[str],
+        cache_ttl_seconds: float,
+    ) -> None:
+        self._blaise_service = blaise_service
+        self.server_parks = server_parks
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if len(server_parks) > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=len(server_parks), thread_name_prefix="server-park"
+            )
+        self._server_park_cache = get_ttl_cache(
+            "questionnaire_server_parks", cache_ttl_seconds
+        )
+
+    def _questionnaire_is_on_server_park(
+        self, server_park: str, questionnaire_name: str
+    ) -> bool:
+        try:
+            # Cached per server park, so read-only GUID lookups that follow are cache hits
+            self._blaise_service.get_questionnaire(server_park, questionnaire_name)
+            return True
+        except BlaiseError:
+            # Only a definite answer rules the park out, timeouts and server errors propagate
+            if self._blaise_service.questionnaire_exists(
+                server_park, questionnaire_name
+            ):
+                raise
+            return False
+
+    def _find_server_park(
+        self, executor: ThreadPoolExecutor, questionnaire_name: str
+    ) -> str:
+        futures = [
+            executor.submit(
+                contextvars.copy_context().run,
+                self._questionnaire_is_on_server_park,
+                server_park,
+                questionnaire_name,
+            )
+            for server_park in self.server_parks
+        ]
+        # Parks are checked concurrently, the first configured park that has the questionnaire wins
+        found_on = [
+            server_park
+            for server_park, future in zip(self.server_parks, futures)
+            if future.result()
+        ]
+        if not found_on:
+            error_message = (
+                f"Questionnaire {questionnaire_name} was not found on server parks "
+                f"{self.server_parks}"
+            )
+            logging.error(error_message)
+            raise BlaiseError(error_message)
+        if len(found_on) > 1:
+            logging.warning(
+                f"Questionnaire {questionnaire_name} is installed on server parks {found_on}, "
+                f"using {found_on[0]}"
+            )
+        logging.info(
+            f"Resolved questionnaire {questionnaire_name} to server park {found_on[0]}"
+        )
+        return found_on[0]
+
+    def resolve_server_park(self, questionnaire_name: str) -> str:
+        executor = self._executor
+        if executor is None:
+            return self.server_parks[0]
+        return self._server_park_cache.get_or_load(
+            questionnaire_name,
+            lambda: self._find_server_park(executor, questionnaire_name),
+        )
+
+    def map_server_parks(self, func, *args) -> list[Any]:
+        if self._executor is None:
+            return [func(self.server_parks[0], *args)]
+        futures = [
+            self._executor.submit(
+                contextvars.copy_context().run, func, server_park, *args
+            )
+            for server_park in self.server_parks
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,86 @@
+import threading
+from typing import Optional
+
+from appconfig.config import Config
+from services.blaise_service import BlaiseService
+from services.change_detection_service import ChangeDetectionService
+from services.donor_case_service import DonorCaseService
+from services.guid_service import GUIDService
+from services.orchestrator_service import OrchestratorService
+from services.prefetch_service import PrefetchService
+from services.reconcile_service import ReconcileService
+from services.server_park_service import ServerParkService
+from services.shard_worker_service import ShardWorkerService
+from services.sweep_service import SweepService
+from services.user_service import UserService
+from services.validation_service import ValidationService
+from services.warmup_service import WarmupService
+from utilities.checkpoint_store import get_checkpoint_store
+from utilities.digest_store import get_digest_store
+from utilities.task_transport import get_task_transport
+
+
+class ServiceContainer:
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self.blaise_service = BlaiseService(config)
+        self.guid_service = GUIDService(self.blaise_service)
+        self.user_service = UserService(self.blaise_service)
+        self.server_park_service = ServerParkService(
+            self.blaise_service,
+            config.get_server_parks(),
+            config.questionnaire_cache_ttl_seconds,
+        )
+        self.donor_case_service = DonorCaseService(
+            self.blaise_service,
+            get_checkpoint_store(config),
+            config.checkpoint_chunk_size,
+        )
+        self.prefetch_service = PrefetchService(
+            self.blaise_service,
+            self.guid_service,
+            self.user_service,
+            self.server_park_service,
+        )
+        self.warmup_service = WarmupService(self.blaise_service)
+        self.change_detection_service = ChangeDetectionService(
+            self.blaise_service, get_digest_store(config)
+        )
+        self.reconcile_service = ReconcileService(
+            self.blaise_service, config.reconcile_batch_size
+        )
+        self.sweep_service = SweepService(
+            self.blaise_service,
+            self.donor_case_service,
+            self.server_park_service,
+            self.warmup_service,
+        )
+        self.shard_worker_service = ShardWorkerService(self.donor_case_service)
+        self.orchestrator_service = OrchestratorService(
+            get_task_transport(config, self.shard_worker_service.run_shard),
+            config.orchestrator_shard_size,
+        )
+
+
+_service_container: Optional[ServiceContainer] = None
+_service_container_lock = threading.Lock()
+
+
+def get_service_container() -> ServiceContainer:
+    global _service_container
+    container = _service_container
+    if container is not None:
+        return container
+    with _service_container_lock:
+        if _service_container is None:
+            # Only a valid config is kept, so a misconfigured instance keeps failing with a ConfigError
+            config = Config.from_env()
+            ValidationService.validate_config(config)
+            _service_container = ServiceContainer(config)
+        return _service_container
+
+
+def reset_service_container() -> None:
+    global _service_container
+    with _service_container_lock:
+        _service_container = None
@@ -0,0 +1,48 @@
+import logging
+from typing import Optional
+
+from models.donor_case_creation_result import DonorCaseCreationResult
+from models.shard_model import ShardResult, ShardTask
+from services.donor_case_service import DonorCaseService
+from utilities.deadline import Deadline, deadline_scope, get_current_deadline
+
+
+class ShardWorkerService:
+    def __init__(self, donor_case_service: DonorCaseService) -> None:
+        self._donor_case_service = donor_case_service
+
+    def run_shard(
+        self, task: ShardTask, deadline: Optional[Deadline] = None
+    ) -> ShardResult:
+        result = DonorCaseCreationResult()
+        try:
+            with deadline_scope(deadline or get_current_deadline()):
+                self._donor_case_service.create_donor_cases_for_users(
+                    task.questionnaire_name, task.guid, task.users, result
+                )
+        except Exception as e:
+            # A failed shard is reported back to the orchestrator rather than raised
+            error_message = (
+                f"Shard {task.shard_index + 1}/{task.shard_count} for questionnaire "
+                f"{task.questionnaire_name} failed: {e}"
+            )
+            logging.error(error_message)
+            done = set(result.created)
+            return ShardResult(
+                task.shard_index,
+                created=result.created,
+                remaining=[user for user in task.users if user not in done],
+                error=error_message,
+            )
+
+        logging.info(
+            f"Shard {task.shard_index + 1}/{task.shard_count} for questionnaire "
+            f"{task.questionnaire_name} created {len(result.created)} donor cases, "
+            f"{len(result.remaining)} remaining"
+        )
+        return ShardResult(
+            task.shard_index,
+            created=result.created,
+            remaining=result.remaining,
+            deadline_exceeded=result.deadline_exceeded,
+        )
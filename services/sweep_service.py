@@ -0,0 +1,133 @@
+import logging
+from typing import Any, Optional
+
+from models.sweep_model import SweepEntry, SweepReport
+from services.blaise_service import BlaiseService
+from services.donor_case_service import DonorCaseService
+from services.server_park_service import ServerParkService
+from services.warmup_service import WarmupService
+from utilities.custom_exceptions import DeadlineExceeded
+from utilities.deadline import Deadline, deadline_scope
+from utilities.tracing import set_span_attribute, tracer
+
+
+class SweepService:
+    def __init__(
+        self,
+        blaise_service: BlaiseService,
+        donor_case_service: DonorCaseService,
+        server_park_service: ServerParkService,
+        warmup_service: WarmupService,
+    ) -> None:
+        self._blaise_service = blaise_service
+        self._donor_case_service = donor_case_service
+        self._server_park_service = server_park_service
+        self._warmup_service = warmup_service
+
+    def _get_active_questionnaires(
+        self, server_park: str
+    ) -> list[tuple[str, dict[str, Any]]]:
+        questionnaires = self._warmup_service.select_active_questionnaires(
+            self._blaise_service.get_all_questionnaires(server_park)
+        )
+        self._blaise_service.cache_questionnaires(server_park, questionnaires)
+        return [(server_park, questionnaire) for questionnaire in questionnaires]
+
+    def get_active_questionnaires(self) -> list[tuple[str, dict[str, Any]]]:
+        active_questionnaires: dict[str, tuple[str, dict[str, Any]]] = {}
+        for park_questionnaires in self._server_park_service.map_server_parks(
+            self._get_active_questionnaires
+        ):
+            for server_park, questionnaire in park_questionnaires:
+                # The first configured park wins, as it does when resolving a single questionnaire
+                active_questionnaires.setdefault(
+                    questionnaire["name"], (server_park, questionnaire)
+                )
+        return [active_questionnaires[name] for name in sorted(active_questionnaires)]
+
+    def sweep(
+        self, roles: list[str], deadline: Optional[Deadline] = None
+    ) -> SweepReport:
+        report = SweepReport(roles)
+        with deadline_scope(deadline):
+            # Questionnaire Handler - each server park is listed concurrently
+            with tracer.start_as_current_span("questionnaire_handler"):
+                questionnaires = self.get_active_questionnaires()
+                set_span_attribute("sweep.questionnaire_count", len(questionnaires))
+
+            # User Handler - one users download serves every questionnaire and role
+            with tracer.start_as_current_span("user_handler"):
+                users = self._blaise_service.get_users(
+                    self._server_park_service.server_parks[0], fresh=True
+                )
+                users_by_role = {
+                    role: [user["name"] for user in users if user["role"] == role]
+                    for role in roles
+                }
+
+            # Existing Donor Case Handler - one scan covers every questionnaire
+            with tracer.start_as_current_span("existing_donor_case_handler"):
+                guids = {
+                    questionnaire["name"]: questionnaire["id"]
+                    for _, questionnaire in questionnaires
+                }
+                existing_donor_cases = (
+                    self._blaise_service.get_existing_donor_cases_for_guids(
+                        list(guids.values())
+                    )
+                )
+
+            report.entries = [
+                SweepEntry(server_park, questionnaire["name"], role)
+                for server_park, questionnaire in questionnaires
+                for role in roles
+            ]
+
+            # Donor Case Handler - writes go through the process-wide rate and concurrency limits
+            with tracer.start_as_current_span("donor_case_handler"):
+                for entry in report.entries:
+                    if deadline is not None and deadline.expired():
+                        report.deadline_exceeded = True
+                        break
+                    guid = guids[entry.questionnaire_name]
+                    self._sweep_entry(
+                        entry,
+                        guid,
+                        users_by_role[entry.role],
+                        existing_donor_cases[guid],
+                        deadline,
+                    )
+                    if entry.status in ("partial", "not_run"):
+                        report.deadline_exceeded = True
+                        break
+
+        logging.info(f"Swept donor cases. {report.summary()}")
+        return report
+
+    def _sweep_entry(
+        self,
+        entry: SweepEntry,
+        guid: str,
+        users_with_role: list[str],
+        existing_donor_cases: list[str],
+        deadline: Optional[Deadline],
+    ) -> None:
+        if not users_with_role:
+            entry.status = "no_users"
+            return
+        try:
+            entry.apply_result(
+                self._donor_case_service.check_and_create_donor_case_for_users(
+                    entry.questionnaire_name,
+                    guid,
+                    users_with_role,
+                    deadline,
+                    existing_donor_cases=existing_donor_cases,
+                )
+            )
+        except DeadlineExceeded:
+            entry.status = "not_run"
+        except Exception as e:
+            # One questionnaire failing does not stop the rest of the sweep
+            entry.status = "failed"
+            entry.error = str(e)
@@ -1,8 +1,13 @@
 import logging
-from typing import Any
+from typing import Any, Sequence
 
 from services.blaise_service import BlaiseService
-from utilities.custom_exceptions import BlaiseError, UsersError, UsersWithRoleNotFound
+from utilities.custom_exceptions import (
+    BlaiseError,
+    DeadlineExceeded,
+    UsersError,
+    UsersWithRoleNotFound,
+)
 from utilities.logging import function_name
 
 
@@ -10,10 +15,12 @@ class UserService:
     def __init__(self, blaise_service: BlaiseService):
         self._blaise_service = blaise_service
 
-    def get_users_by_role(self, blaise_server_park: str, role: str) -> list[str]:
+    def get_users_by_role(
+        self, blaise_server_park: str, role: str, fresh: bool = False
+    ) -> list[str]:
         try:
             blaise_users: list[dict[str, Any]] = self._blaise_service.get_users(
-                blaise_server_park
+                blaise_server_park, fresh=fresh
             )
             ips_users = [user["name"] for user in blaise_users if user["role"] == role]
             logging.info(
@@ -22,6 +29,8 @@ class UserService:
             return ips_users
         except BlaiseError as e:
             raise BlaiseError(e.message) from e
+        except DeadlineExceeded:
+            raise
         except UsersWithRoleNotFound as e:
             raise UsersWithRoleNotFound(e.message) from e
         except Exception as e:
@@ -32,12 +41,34 @@ class UserService:
             logging.error(error_message)
             raise UsersError(error_message)
 
+    def get_users_with_any_role(
+        self, blaise_server_park: str, roles: Sequence[str]
+    ) -> list[str]:
+        try:
+            blaise_users: list[dict[str, Any]] = self._blaise_service.get_users(
+                blaise_server_park
+            )
+            return [user["name"] for user in blaise_users if user["role"] in roles]
+        except BlaiseError as e:
+            raise BlaiseError(e.message) from e
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            error_message = (
+                f"Exception caught in {function_name()}. "
+                f"Error getting users with roles {list(roles)} "
+                f"for server park {blaise_server_park}: {e}"
+            )
+            logging.error(error_message)
+            raise UsersError(error_message)
+
     def get_user_by_name(
         self, blaise_server_park: str, username: str
     ) -> dict[str, Any]:
         try:
+            # Only used to reissue a donor case, so never served from the users cache
             blaise_users: list[dict[str, Any]] = self._blaise_service.get_users(
-                blaise_server_park
+                blaise_server_park, fresh=True
             )
 
             user = next(
@@ -56,6 +87,8 @@ class UserService:
                 raise UsersError(error_message)
         except BlaiseError as e:
             raise BlaiseError(e.message) from e
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             error_message = (
                 f"Exception caught in {function_name()}. "
@@ -1,11 +1,13 @@
 import logging
-import re
-from typing import Any
+from typing import Any, Optional, cast
 
-import blaise_restapi
 from flask import Request
 
 from appconfig.config import Config
+from models.shard_model import ShardTask
+from utilities.blaise_call_counter import CountingClient
+from utilities.blaise_cassette import get_blaise_client
+from utilities.checkpoint_store import VALID_RESUME_TOKEN
 from utilities.custom_exceptions import (
     BlaiseError,
     ConfigError,
@@ -13,111 +15,177 @@ from utilities.custom_exceptions import (
     UsersWithRoleNotFound,
 )
 from utilities.logging import function_name
+from utilities.request_schema import FieldSpec, RequestSchema
+
+VALID_ROLES = ("IPS Manager", "IPS Field Interviewer", "IPS Pilot Interviewer")
+CREATE_DONOR_CASES_MODES = ("direct", "orchestrate", "reconcile")
+POSITIVE_CONFIG_VALUES = (
+    "checkpoint_chunk_size",
+    "checkpoint_ttl_seconds",
+    "admission_queue_timeout_seconds",
+    "profiling_top_n",
+    "profiling_sample_interval_ms",
+)
+NON_NEGATIVE_CONFIG_VALUES = (
+    "admission_donor_cases_max_concurrent",
+    "admission_donor_cases_max_queue",
+    "admission_get_users_by_role_max_concurrent",
+    "admission_get_users_by_role_max_queue",
+)
+
+QUESTIONNAIRE_NAME_FIELD = FieldSpec(
+    "questionnaire_name",
+    pattern=r"^[A-Za-z]{3}\d{4}.*$",
+    invalid_message=(
+        "{value} is not a valid questionnaire name format. "
+        "Questionnaire name must start with 3 letters, followed by 4 numbers"
+    ),
+)
+ROLE_FIELD = FieldSpec(
+    "role",
+    allowed=VALID_ROLES,
+    invalid_message=(
+        "{value} is not a valid role. "
+        f"Please choose one of the following roles: {list(VALID_ROLES)}"
+    ),
+)
+
+CREATE_DONOR_CASES_SCHEMA = RequestSchema(
+    [
+        QUESTIONNAIRE_NAME_FIELD,
+        ROLE_FIELD,
+        FieldSpec(
+            "resume_token",
+            required=False,
+            pattern=VALID_RESUME_TOKEN.pattern,
+            invalid_message="{value} is not a valid resume token",
+        ),
+        FieldSpec(
+            "mode",
+            required=False,
+            allowed=CREATE_DONOR_CASES_MODES,
+            invalid_message=(
+                "{value} is not a valid mode. "
+                f"Please choose one of the following modes: {list(CREATE_DONOR_CASES_MODES)}"
+            ),
+        ),
+        FieldSpec(
+            "dry_run",
+            required=False,
+            kind="boolean",
+            invalid_message="{value} is not a valid dry_run value, it must be true or false",
+        ),
+    ]
+)
+CREATE_DONOR_CASES_SHARD_SCHEMA = RequestSchema(
+    [
+        QUESTIONNAIRE_NAME_FIELD,
+        FieldSpec("guid"),
+        ROLE_FIELD,
+        FieldSpec("shard_index", kind="integer"),
+        FieldSpec("shard_count", kind="integer"),
+        FieldSpec(
+            "users",
+            kind="string_list",
+            invalid_message="users must be a list of usernames",
+        ),
+    ]
+)
+REISSUE_NEW_DONOR_CASE_SCHEMA = RequestSchema(
+    [QUESTIONNAIRE_NAME_FIELD, FieldSpec("user")]
+)
+GET_USERS_BY_ROLE_SCHEMA = RequestSchema(
+    [
+        FieldSpec(
+            "role",
+            blank_is_missing=True,
+            allowed=VALID_ROLES,
+            invalid_message=ROLE_FIELD.invalid_message,
+        )
+    ],
+    missing_message="Missing required value from request",
+)
 
 
 class ValidationService:
-    def __init__(self) -> None:
-        self.request_json: dict[str, Any] = {}
+    # Stateless so a single instance can be shared by concurrent requests
+
+    def get_valid_request_for_create_donor_cases(
+        self, request: Request
+    ) -> dict[str, Optional[str]]:
+        values = self.validate_request(request, CREATE_DONOR_CASES_SCHEMA)
+        error_message = None
+        if values["resume_token"] and values["mode"] in ("orchestrate", "reconcile"):
+            error_message = f"A resume token cannot be used in {values['mode']} mode"
+        elif values["dry_run"] and values["mode"] != "reconcile":
+            error_message = "A dry run can only be used in reconcile mode"
+        if error_message:
+            logging.error(error_message)
+            raise RequestError(error_message)
+        return values
 
     def get_valid_request_values_for_create_donor_cases(
         self, request: Request
     ) -> tuple[str, str]:
-        self.validate_request_is_json(request)
-        self.validate_request_values_are_not_empty()
-        self.validate_questionnaire_name()
-        self.validate_role()
-
-        return self.request_json["questionnaire_name"], self.request_json["role"]
+        values = self.get_valid_request_for_create_donor_cases(request)
+        # Required fields are never None once the schema has validated them
+        return cast(str, values["questionnaire_name"]), cast(str, values["role"])
 
     def get_valid_request_values_for_reissue_new_donor_case(
         self, request: Request
     ) -> tuple[str, str]:
-        self.validate_request_is_json(request)
-        self.validate_request_values_are_not_empty_for_reissue_new_donor_case()
-        self.validate_questionnaire_name()
-
-        return self.request_json["questionnaire_name"], self.request_json["user"]
-
-    def get_valid_request_value_for_get_users(self, request: Request) -> str:
-        self.validate_request_is_json(request)
-        self.validate_request_value_is_not_empty_for_get_users()
-        self.validate_role()
-
-        return self.request_json["role"]
-
-    def validate_request_is_json(self, request):
-        try:
-            self.request_json = request.get_json()
-        except Exception as e:
-            error_message = (
-                f"Exception raised in {function_name()}. "
-                f"Error getting json from request '{request}': {e}"
-            )
-            logging.error(error_message)
-            raise RequestError(error_message)
-
-    def validate_request_values_are_not_empty(self):
-        missing_values = []
-        questionnaire_name = self.request_json["questionnaire_name"]
-        role = self.request_json["role"]
+        values = self.validate_request(request, REISSUE_NEW_DONOR_CASE_SCHEMA)
+        return cast(str, values["questionnaire_name"]), cast(str, values["user"])
 
-        if questionnaire_name is None or questionnaire_name == "":
-            missing_values.append("questionnaire_name")
-
-        if role is None or role == "":
-            missing_values.append("role")
-
-        if missing_values:
-            error_message = f"Missing required values from request: {missing_values}"
-            logging.error(error_message)
-            raise RequestError(error_message)
-
-    def validate_request_values_are_not_empty_for_reissue_new_donor_case(self):
-        missing_values = []
-        questionnaire_name = self.request_json["questionnaire_name"]
-        user = self.request_json["user"]
-
-        if questionnaire_name is None or questionnaire_name == "":
-            missing_values.append("questionnaire_name")
-
-        if user is None or user == "":
-            missing_values.append("user")
+    def get_valid_shard_task(self, request: Request) -> ShardTask:
+        return ShardTask.from_dict(
+            self.validate_request(request, CREATE_DONOR_CASES_SHARD_SCHEMA)
+        )
 
-        if missing_values:
-            error_message = f"Missing required values from request: {missing_values}"
+    def get_valid_roles_for_sweep(
+        self, request: Request, default_roles: list[str]
+    ) -> list[str]:
+        # Cloud Scheduler may send no body at all, in which case the configured roles are swept
+        request_json = request.get_json(silent=True) or {}
+        roles = (
+            request_json.get("roles") if isinstance(request_json, dict) else None
+        ) or (default_roles or list(VALID_ROLES))
+        if not isinstance(roles, list):
+            error_message = f"roles must be a list of roles, not {roles!r}"
             logging.error(error_message)
             raise RequestError(error_message)
-
-    def validate_request_value_is_not_empty_for_get_users(self):
-        missing_values = []
-        role = self.request_json["role"]
-
-        if role is None or role.strip() == "":
-            missing_values.append("role")
-
-        if missing_values:
-            error_message = f"Missing required value from request: {missing_values}"
+        invalid_roles = [role for role in roles if role not in VALID_ROLES]
+        if invalid_roles:
+            error_message = (
+                f"{invalid_roles} are not valid roles. "
+                f"Please choose from the following roles: {list(VALID_ROLES)}"
+            )
             logging.error(error_message)
             raise RequestError(error_message)
+        return list(dict.fromkeys(roles))
 
-    def validate_questionnaire_name(self):
-        result = re.match(
-            r"^[A-Za-z]{3}\d{4}.*$", self.request_json["questionnaire_name"]
+    def get_valid_request_value_for_get_users(self, request: Request) -> str:
+        return cast(
+            str, self.validate_request(request, GET_USERS_BY_ROLE_SCHEMA)["role"]
         )
-        if not result:
-            error_message = (
-                f"{self.request_json['questionnaire_name']} is not a valid questionnaire name format. "
-                "Questionnaire name must start with 3 letters, followed by 4 numbers"
-            )
+
+    def validate_request(
+        self, request: Request, schema: RequestSchema
+    ) -> dict[str, Optional[str]]:
+        values, violations = schema.validate(self.validate_request_is_json(request))
+        if violations:
+            error_message = "; ".join(violations)
             logging.error(error_message)
             raise RequestError(error_message)
+        return values
 
-    def validate_role(self):
-        valid_roles = ["IPS Manager", "IPS Field Interviewer", "IPS Pilot Interviewer"]
-        if self.request_json["role"] not in valid_roles:
+    def validate_request_is_json(self, request) -> Any:
+        try:
+            return request.get_json()
+        except Exception as e:
             error_message = (
-                f"{self.request_json['role']} is not a valid role. "
-                f"Please choose one of the following roles: {valid_roles}"
+                f"Exception raised in {function_name()}. "
+                f"Error getting json from request '{request}': {e}"
             )
             logging.error(error_message)
             raise RequestError(error_message)
@@ -135,10 +203,30 @@ class ValidationService:
             logging.error(error_message)
             raise ConfigError(error_message)
 
+        invalid_configs = [
+            name for name in POSITIVE_CONFIG_VALUES if getattr(config, name) <= 0
+        ]
+        if invalid_configs:
+            error_message = (
+                f"Config values must be greater than zero: {invalid_configs}"
+            )
+            logging.error(error_message)
+            raise ConfigError(error_message)
+
+        negative_configs = [
+            name for name in NON_NEGATIVE_CONFIG_VALUES if getattr(config, name) < 0
+        ]
+        if negative_configs:
+            error_message = f"Config values must not be negative: {negative_configs}"
+            logging.error(error_message)
+            raise ConfigError(error_message)
+
     @staticmethod
-    def validate_questionnaire_exists(questionnaire_name: str, config: Config):
-        server_park = config.blaise_server_park
-        restapi_client = blaise_restapi.Client(f"http://{config.blaise_api_url}")
+    def validate_questionnaire_exists(
+        questionnaire_name: str, config: Config, server_park: Optional[str] = None
+    ):
+        server_park = server_park or config.blaise_server_park
+        restapi_client = CountingClient(get_blaise_client(config))
 
         try:
             restapi_client.questionnaire_exists_on_server_park(
@@ -0,0 +1,47 @@
+import logging
+import time
+from typing import Any
+
+from services.blaise_service import BlaiseService
+from utilities.custom_exceptions import BlaiseError
+
+
+class WarmupService:
+    def __init__(self, blaise_service: BlaiseService) -> None:
+        self._blaise_service = blaise_service
+        self.questionnaire_prefix = "IPS"
+
+    def select_active_questionnaires(
+        self, questionnaires: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        return [
+            questionnaire
+            for questionnaire in questionnaires
+            if questionnaire.get("status") == "Active"
+            and questionnaire.get("name", "").startswith(self.questionnaire_prefix)
+        ]
+
+    def warm_up(self, server_park: str) -> dict[str, Any]:
+        start_time = time.perf_counter()
+        try:
+            users = self._blaise_service.get_users(server_park)
+            questionnaires = self._blaise_service.get_all_questionnaires(server_park)
+        except BlaiseError as e:
+            raise BlaiseError(e.message) from e
+
+        active_questionnaires = self.select_active_questionnaires(questionnaires)
+        self._blaise_service.cache_questionnaires(server_park, active_questionnaires)
+
+        summary = {
+            "server_park": server_park,
+            "users": len(users),
+            "active_questionnaires": sorted(
+                questionnaire["name"] for questionnaire in active_questionnaires
+            ),
+            "duration_ms": round((time.perf_counter() - start_time) * 1000, 3),
+        }
+        logging.info(
+            f"Warmed up {summary['users']} users and {len(active_questionnaires)} active "
+            f"questionnaires from server park {server_park} in {summary['duration_ms']}ms"
+        )
+        return summary
@@ -2,6 +2,18 @@ from typing import Any
 
 import pytest
 
+from services.service_container import reset_service_container
+from utilities.admission_control import reset_admission_controllers
+from utilities.blaise_call_counter import reset_blaise_call_stats
+from utilities.blaise_cassette import reset_blaise_cassettes
+from utilities.checkpoint_store import reset_checkpoint_stores
+from utilities.concurrency_limiter import reset_concurrency_limiters
+from utilities.digest_store import reset_digest_stores
+from utilities.idempotency_store import reset_idempotency_stores
+from utilities.rate_limiter import reset_rate_limiters
+from utilities.tracing import tracer
+from utilities.ttl_cache import reset_ttl_caches
+
 
 class DonorCaseModelInputs:
     def __init__(self) -> None:
@@ -50,3 +62,19 @@ def mock_get_questionnaire() -> dict[str, Any]:
             {"nodeName": "blaise-gusty-data-entry-2", "nodeStatus": "Active"},
         ],
     }
+
+
+@pytest.fixture(autouse=True)
+def reset_process_wide_state():
+    yield
+    reset_service_container()
+    reset_admission_controllers()
+    reset_rate_limiters()
+    reset_concurrency_limiters()
+    reset_ttl_caches()
+    reset_blaise_cassettes()
+    reset_blaise_call_stats()
+    reset_checkpoint_stores()
+    reset_digest_stores()
+    reset_idempotency_stores()
+    tracer.latency_stats_exporter.clear()
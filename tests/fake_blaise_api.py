@@ -0,0 +1,157 @@
+import threading
+import time
+from typing import Any, Optional
+
+import requests
+
+
+class FakeHttpError(requests.exceptions.HTTPError):
+    def __init__(self, status_code: int) -> None:
+        response = requests.Response()
+        response.status_code = status_code
+        super().__init__(f"{status_code} Error from fake Blaise API", response=response)
+
+
+class FakeBlaiseRestApiClient:
+    """In-memory stand-in for blaise_restapi.Client with scripted latency and failures."""
+
+    def __init__(
+        self,
+        users: Optional[list[dict[str, Any]]] = None,
+        questionnaires: Optional[list[dict[str, Any]]] = None,
+        write_latency_seconds: float = 0.0,
+    ) -> None:
+        self.users = users or []
+        self.questionnaires = questionnaires or []
+        self.cases: list[dict[str, Any]] = []
+        self.write_latency_seconds = write_latency_seconds
+        self.write_script: list[tuple[float, Optional[int]]] = []
+        self.calls: list[str] = []
+        self.max_concurrent_writes = 0
+        self._concurrent_writes = 0
+        self._lock = threading.Lock()
+
+    def script_writes(self, *steps: tuple[float, Optional[int]]) -> None:
+        # Each step is (latency_seconds, status_code), a status code of None succeeds
+        with self._lock:
+            self.write_script.extend(steps)
+
+    def _record(self, method: str) -> None:
+        with self._lock:
+            self.calls.append(method)
+
+    def get_users(self) -> list[dict[str, Any]]:
+        self._record("get_users")
+        return list(self.users)
+
+    def get_questionnaire_for_server_park(
+        self, server_park: str, questionnaire_name: str
+    ) -> dict[str, Any]:
+        self._record("get_questionnaire_for_server_park")
+        if server_park == "cma" and questionnaire_name == "CMA_Launcher":
+            with self._lock:
+                return {"name": questionnaire_name, "dataRecordCount": len(self.cases)}
+        for questionnaire in self.questionnaires:
+            if (
+                questionnaire["name"] == questionnaire_name
+                and questionnaire["serverParkName"] == server_park
+            ):
+                return questionnaire
+        raise FakeHttpError(404)
+
+    def get_all_questionnaires_for_server_park(
+        self, server_park: str
+    ) -> list[dict[str, Any]]:
+        self._record("get_all_questionnaires_for_server_park")
+        return [q for q in self.questionnaires if q["serverParkName"] == server_park]
+
+    def questionnaire_exists_on_server_park(
+        self, server_park: str, questionnaire_name: str
+    ) -> bool:
+        self._record("questionnaire_exists_on_server_park")
+        return any(
+            q["name"] == questionnaire_name and q["serverParkName"] == server_park
+            for q in self.questionnaires
+        )
+
+    def get_questionnaire_data(
+        self,
+        server_park: str,
+        questionnaire_name: str,
+        field_ids: list[str],
+        filter_expression: str,
+    ) -> dict[str, Any]:
+        self._record("get_questionnaire_data")
+        guids = {
+            condition.split("=")[1].strip("'")
+            for condition in filter_expression.split(" OR ")
+        }
+        return {
+            "questionnaireName": questionnaire_name,
+            "questionnaireId": "00000000-0000-0000-0000-000000000000",
+            "reportingData": [
+                dict(case) for case in self.cases if case["mainSurveyID"] in guids
+            ],
+        }
+
+    def create_multikey_case(
+        self,
+        server_park: str,
+        questionnaire_name: str,
+        key_names: list[str],
+        key_values: list[str],
+        data_fields: dict[str, Any],
+    ) -> None:
+        self._record("create_multikey_case")
+        with self._lock:
+            latency_seconds, status_code = (
+                self.write_script.pop(0)
+                if self.write_script
+                else (self.write_latency_seconds, None)
+            )
+            self._concurrent_writes += 1
+            self.max_concurrent_writes = max(
+                self.max_concurrent_writes, self._concurrent_writes
+            )
+        try:
+            time.sleep(latency_seconds)
+            if status_code is not None:
+                raise FakeHttpError(status_code)
+            with self._lock:
+                self.cases.append(
+                    {
+                        "mainSurveyID": data_fields["mainSurveyID"],
+                        "id": data_fields["id"],
+                        "cmA_IsDonorCase": data_fields["cmA_IsDonorCase"],
+                    }
+                )
+        finally:
+            with self._lock:
+                self._concurrent_writes -= 1
+
+    def delete_multikey_case(
+        self,
+        server_park: str,
+        questionnaire_name: str,
+        key_names: list[str],
+        key_values: list[str],
+    ) -> None:
+        self._record("delete_multikey_case")
+        main_survey_id, case_id = key_values
+        with self._lock:
+            latency_seconds, status_code = (
+                self.write_script.pop(0)
+                if self.write_script
+                else (self.write_latency_seconds, None)
+            )
+        time.sleep(latency_seconds)
+        if status_code is not None:
+            raise FakeHttpError(status_code)
+        with self._lock:
+            self.cases = [
+                case
+                for case in self.cases
+                if not (
+                    case["mainSurveyID"] == main_survey_id and case["id"] == case_id
+                )
+            ]
@@ -1,5 +1,22 @@
+from contextlib import contextmanager
+from typing import Iterator
+
 from appconfig.config import Config
+from utilities.blaise_call_counter import BlaiseCallCounter, counting_blaise_calls
 
 
 def get_default_config() -> Config:
     return Config(blaise_api_url="blaise_api_url", blaise_server_park="gusty")
+
+
+@contextmanager
+def assert_blaise_call_budget(
+    max_reads: int, max_writes: int = 0
+) -> Iterator[BlaiseCallCounter]:
+    with counting_blaise_calls("test") as blaise_calls:
+        yield blaise_calls
+    assert blaise_calls.reads <= max_reads and blaise_calls.writes <= max_writes, (
+        f"Blaise call budget exceeded: {blaise_calls.reads} reads (budget {max_reads}) "
+        f"and {blaise_calls.writes} writes (budget {max_writes}), "
+        f"calls made: {dict(blaise_calls.calls)}"
+    )
@@ -7,8 +7,10 @@ import pytest
 from appconfig.config import Config
 from models.donor_case_model import DonorCaseModel
 from services.blaise_service import BlaiseService
+from tests.fake_blaise_api import FakeBlaiseRestApiClient
 from tests.helpers import get_default_config
 from utilities.custom_exceptions import BlaiseError
+from utilities.rate_limiter import get_rate_limiter_stats
 from utilities.regex import extract_username_from_case_id
 
 
@@ -37,6 +39,26 @@ class TestGetQuestionnaire:
         # assert
         _mock_rest_api_client.assert_called_with(blaise_server_park, questionnaire_name)
 
+    @mock.patch.object(blaise_restapi.Client, "get_questionnaire_for_server_park")
+    def test_get_questionnaire_reads_a_reinstalled_questionnaire_when_fresh(
+        self, mock_get_questionnaire_for_server_park, blaise_service
+    ):
+        # arrange
+        mock_get_questionnaire_for_server_park.side_effect = [
+            {"name": "IPS2306a", "id": "old-guid"},
+            {"name": "IPS2306a", "id": "new-guid"},
+        ]
+        blaise_service.get_questionnaire("gusty", "IPS2306a")
+
+        # act
+        fresh = blaise_service.get_questionnaire("gusty", "IPS2306a", fresh=True)
+        cached = blaise_service.get_questionnaire("gusty", "IPS2306a")
+
+        # assert
+        assert fresh["id"] == "new-guid"
+        assert cached["id"] == "new-guid"
+        assert mock_get_questionnaire_for_server_park.call_count == 2
+
     @mock.patch.object(blaise_restapi.Client, "get_questionnaire_for_server_park")
     def test_get_questionnaire_returns_a_dictionary_containing_questionnaire_info(
         self, _mock_rest_api_client_get_questionnaire_for_server_park, blaise_service
@@ -210,6 +232,54 @@ class TestGetUsers:
             error_message,
         ) in caplog.record_tuples
 
+    @mock.patch.object(blaise_restapi.Client, "get_users")
+    def test_get_users_serves_repeat_calls_from_the_users_cache(
+        self, mock_rest_api_client_get_users, config, mock_get_users
+    ):
+        # Arrange
+        mock_rest_api_client_get_users.return_value = mock_get_users
+
+        # Act
+        BlaiseService(config).get_users("gusty")
+        result = BlaiseService(config).get_users("gusty")
+
+        # Assert
+        assert result == mock_get_users
+        mock_rest_api_client_get_users.assert_called_once()
+
+    @mock.patch.object(blaise_restapi.Client, "get_users")
+    def test_get_users_downloads_fresh_users_and_refreshes_the_users_cache(
+        self, mock_rest_api_client_get_users, config, mock_get_users
+    ):
+        # Arrange
+        stale_users = [{"name": "rich", "role": "IPS Field Interviewer"}]
+        mock_rest_api_client_get_users.side_effect = [stale_users, mock_get_users]
+        BlaiseService(config).get_users("gusty")
+
+        # Act
+        fresh_result = BlaiseService(config).get_users("gusty", fresh=True)
+        cached_result = BlaiseService(config).get_users("gusty")
+
+        # Assert
+        assert fresh_result == mock_get_users
+        assert cached_result == mock_get_users
+        assert mock_rest_api_client_get_users.call_count == 2
+
+    @mock.patch.object(blaise_restapi.Client, "get_users")
+    def test_get_users_does_not_cache_when_the_users_cache_ttl_is_zero(
+        self, mock_rest_api_client_get_users, config, mock_get_users
+    ):
+        # Arrange
+        config.users_cache_ttl_seconds = 0
+        mock_rest_api_client_get_users.return_value = mock_get_users
+
+        # Act
+        BlaiseService(config).get_users("gusty")
+        BlaiseService(config).get_users("gusty")
+
+        # Assert
+        assert mock_rest_api_client_get_users.call_count == 2
+
 
 class TestGetExistingDonorCases:
     @mock.patch.object(blaise_restapi.Client, "get_questionnaire_data")
@@ -389,6 +459,42 @@ class TestCreateDonorCaseForUser:
         ) in caplog.record_tuples
 
 
+class TestDeleteDonorCase:
+    @mock.patch.object(blaise_restapi.Client, "delete_multikey_case")
+    def test_delete_donor_case_deletes_the_case_by_its_keys(
+        self, mock_delete_multikey_case, blaise_service
+    ):
+        # act
+        blaise_service.delete_donor_case("some-guid", "2-toby")
+
+        # assert
+        mock_delete_multikey_case.assert_called_once_with(
+            "cma", "CMA_Launcher", ["MainSurveyID", "ID"], ["some-guid", "2-toby"]
+        )
+
+    @mock.patch.object(blaise_restapi.Client, "delete_multikey_case")
+    def test_delete_donor_case_logs_error_and_raises_exception(
+        self, mock_delete_multikey_case, blaise_service, caplog
+    ):
+        # arrange
+        mock_delete_multikey_case.side_effect = Exception(
+            "I am running away from my responsibilities"
+        )
+
+        # act
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(BlaiseError) as err:
+                blaise_service.delete_donor_case("some-guid", "toby")
+
+        # assert
+        error_message = (
+            "Exception caught in delete_donor_case(). "
+            "Error deleting donor case 'toby': I am running away from my responsibilities"
+        )
+        assert err.value.args[0] == error_message
+        assert ("root", logging.ERROR, error_message) in caplog.record_tuples
+
+
 class TestGetDonorCasesForUser:
     @mock.patch.object(blaise_restapi.Client, "get_questionnaire_data")
     def test_get_existing_donor_cases_for_user_calls_rest_api_and_returns_correct_cases(
@@ -638,3 +744,118 @@ class TestGetDonorCasesForUser:
             logging.ERROR,
             error_message,
         ) in caplog.record_tuples
+
+
+class TestRateLimiting:
+    @mock.patch.object(blaise_restapi.Client, "get_users")
+    @mock.patch.object(blaise_restapi.Client, "create_multikey_case")
+    def test_reads_and_writes_acquire_separate_process_wide_budgets(
+        self, _mock_create_multikey_case, _mock_get_users, config
+    ):
+        # arrange
+        config.users_cache_ttl_seconds = 0
+        first_blaise_service = BlaiseService(config)
+        second_blaise_service = BlaiseService(config)
+        donor_case_model = DonorCaseModel("rich", "IPS2306a", "guid")
+
+        # act
+        first_blaise_service.get_users("gusty")
+        second_blaise_service.get_users("gusty")
+        second_blaise_service.create_donor_case_for_user(donor_case_model)
+
+        # assert
+        stats = {limiter["name"]: limiter for limiter in get_rate_limiter_stats()}
+        assert stats["blaise_read"]["acquisitions"] == 2
+        assert stats["blaise_write"]["acquisitions"] == 1
+        assert (
+            stats["blaise_write"]["rate_per_second"] == config.blaise_write_rate_limit
+        )
+
+
+class TestGetExistingDonorCasesForGuids:
+    @pytest.fixture()
+    def fake_client(self, blaise_service) -> FakeBlaiseRestApiClient:
+        fake_client = FakeBlaiseRestApiClient()
+        fake_client.cases = [
+            {"mainSurveyID": "guid-1", "id": "jim", "cmA_IsDonorCase": "1"},
+            {"mainSurveyID": "guid-1", "id": "2-jim", "cmA_IsDonorCase": "1"},
+            {"mainSurveyID": "guid-1", "id": "pam", "cmA_IsDonorCase": "0"},
+            {"mainSurveyID": "guid-2", "id": "dwight", "cmA_IsDonorCase": "1"},
+            {"mainSurveyID": "guid-3", "id": "andy", "cmA_IsDonorCase": "1"},
+            {"mainSurveyID": "guid-4", "id": "toby", "cmA_IsDonorCase": "1"},
+        ]
+        blaise_service.restapi_client = fake_client
+        return fake_client
+
+    def test_get_existing_donor_cases_for_guids_partitions_donor_cases_by_guid(
+        self, fake_client, blaise_service
+    ):
+        # act
+        result = blaise_service.get_existing_donor_cases_for_guids(
+            ["guid-1", "guid-2", "guid-5"]
+        )
+
+        # assert
+        assert result == {
+            "guid-1": ["2-jim", "jim"],
+            "guid-2": ["dwight"],
+            "guid-5": [],
+        }
+        assert fake_client.calls == ["get_questionnaire_data"]
+
+    def test_get_existing_donor_cases_for_guids_queries_in_chunks(
+        self, fake_client, blaise_service, config
+    ):
+        # arrange
+        config.case_scan_guid_chunk_size = 2
+
+        # act
+        result = blaise_service.get_existing_donor_cases_for_guids(
+            ["guid-1", "guid-2", "guid-3", "guid-4", "guid-1"]
+        )
+
+        # assert
+        assert list(result) == ["guid-1", "guid-2", "guid-3", "guid-4"]
+        assert result["guid-4"] == ["toby"]
+        assert fake_client.calls == ["get_questionnaire_data"] * 2
+
+    @mock.patch.object(blaise_restapi.Client, "get_questionnaire_data")
+    def test_get_existing_donor_cases_for_guids_uses_an_or_filter(
+        self, mock_get_questionnaire_data, blaise_service
+    ):
+        # arrange
+        mock_get_questionnaire_data.return_value = {"reportingData": []}
+
+        # act
+        blaise_service.get_existing_donor_cases_for_guids(["guid-1", "guid-2"])
+
+        # assert
+        mock_get_questionnaire_data.assert_called_once_with(
+            "cma",
+            "CMA_Launcher",
+            ["MainSurveyID", "id", "CMA_IsDonorCase"],
+            "MainSurveyID='guid-1' OR MainSurveyID='guid-2'",
+        )
+
+    @mock.patch.object(blaise_restapi.Client, "get_questionnaire_data")
+    def test_get_existing_donor_cases_for_guids_logs_error_and_raises_exception(
+        self, mock_get_questionnaire_data, blaise_service, caplog
+    ):
+        # arrange
+        mock_get_questionnaire_data.side_effect = Exception(
+            "Identity theft is not a joke"
+        )
+
+        # act
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(BlaiseError) as err:
+                blaise_service.get_existing_donor_cases_for_guids(["guid-1"])
+
+        # assert
+        error_message = (
+            "Exception caught in get_existing_donor_cases_for_guids(). "
+            "Error getting existing donor cases for 1 questionnaires: "
+            "Identity theft is not a joke"
+        )
+        assert err.value.args[0] == error_message
+        assert ("root", logging.ERROR, error_message) in caplog.record_tuples
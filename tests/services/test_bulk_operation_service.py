@@ -0,0 +1,142 @@
+import pytest
+
+from services.blaise_service import BlaiseService
+from services.bulk_operation_service import BulkOperationService
+from services.donor_case_service import DonorCaseService
+from services.guid_service import GUIDService
+from services.user_service import UserService
+from tests.fake_blaise_api import FakeBlaiseRestApiClient
+from tests.helpers import get_default_config
+from utilities.custom_exceptions import UsersError
+
+
+@pytest.fixture()
+def fake_client() -> FakeBlaiseRestApiClient:
+    fake_client = FakeBlaiseRestApiClient(
+        users=[
+            {"name": "jim", "role": "IPS Field Interviewer"},
+            {"name": "pam", "role": "IPS Field Interviewer"},
+            {"name": "dwight", "role": "IPS Field Interviewer"},
+            {"name": "michael", "role": "IPS Manager"},
+        ],
+        questionnaires=[
+            {"name": "IPS2403a", "id": "some-guid", "serverParkName": "gusty"}
+        ],
+    )
+    fake_client.cases = [
+        {"mainSurveyID": "some-guid", "id": "jim", "cmA_IsDonorCase": "1"},
+        {"mainSurveyID": "some-guid", "id": "2-jim", "cmA_IsDonorCase": "1"},
+    ]
+    return fake_client
+
+
+@pytest.fixture()
+def bulk_operation_service(fake_client) -> BulkOperationService:
+    blaise_service = BlaiseService(get_default_config())
+    blaise_service.restapi_client = fake_client
+    return BulkOperationService(
+        blaise_service,
+        DonorCaseService(blaise_service),
+        UserService(blaise_service),
+        GUIDService(blaise_service),
+        parallelism=2,
+    )
+
+
+class TestBulkOperationService:
+    def test_list_donor_cases_reports_each_users_donor_cases(
+        self, bulk_operation_service
+    ):
+        # act
+        report = bulk_operation_service.list_donor_cases(
+            "gusty", "IPS2403a", role="IPS Field Interviewer"
+        )
+
+        # assert
+        assert [
+            (result.user, result.status, result.case_ids) for result in report.results
+        ] == [
+            ("jim", "exists", ["2-jim", "jim"]),
+            ("pam", "missing", []),
+            ("dwight", "missing", []),
+        ]
+
+    def test_create_donor_cases_creates_missing_cases_and_reports_progress(
+        self, bulk_operation_service, fake_client
+    ):
+        # arrange
+        progress = []
+
+        # act
+        report = bulk_operation_service.create_donor_cases(
+            "gusty",
+            "IPS2403a",
+            role="IPS Field Interviewer",
+            progress=lambda completed, total, result: progress.append(
+                (completed, total)
+            ),
+        )
+
+        # assert
+        assert report.status_counts == {"created": 2, "skipped": 1}
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+        assert sorted(case["id"] for case in fake_client.cases) == [
+            "2-jim",
+            "dwight",
+            "jim",
+            "pam",
+        ]
+
+    def test_create_donor_cases_records_failed_users_and_carries_on(
+        self, bulk_operation_service, fake_client
+    ):
+        # arrange
+        fake_client.script_writes((0, 500))
+
+        # act
+        report = bulk_operation_service.create_donor_cases(
+            "gusty", "IPS2403a", users=["pam", "dwight"]
+        )
+
+        # assert
+        assert report.status_counts == {"created": 1, "failed": 1}
+        assert "500 Error from fake Blaise API" in report.failed[0].error
+
+    def test_reissue_donor_cases_returns_the_new_case_ids(self, bulk_operation_service):
+        # act
+        report = bulk_operation_service.reissue_donor_cases(
+            "gusty", "IPS2403a", users=["jim", "pam"]
+        )
+
+        # assert
+        assert [(result.status, result.case_ids) for result in report.results] == [
+            ("reissued", ["3-jim"]),
+            ("failed", []),
+        ]
+        assert report.summary().startswith("Reissue processed 2 users in ")
+
+    def test_reissue_donor_cases_scans_the_existing_cases_once(
+        self, bulk_operation_service, fake_client
+    ):
+        # arrange
+        fake_client.cases.append(
+            {"mainSurveyID": "some-guid", "id": "pam", "cmA_IsDonorCase": "1"}
+        )
+
+        # act
+        report = bulk_operation_service.reissue_donor_cases(
+            "gusty", "IPS2403a", users=["jim", "pam", "dwight"]
+        )
+
+        # assert
+        assert [(result.status, result.case_ids) for result in report.results] == [
+            ("reissued", ["3-jim"]),
+            ("reissued", ["1-pam"]),
+            ("failed", []),
+        ]
+        assert fake_client.calls.count("get_questionnaire_data") == 1
+
+    def test_get_users_needs_a_role_or_a_list_of_users(self, bulk_operation_service):
+        # act & assert
+        with pytest.raises(UsersError, match="A role or a list of users is required"):
+            bulk_operation_service.get_users("gusty")
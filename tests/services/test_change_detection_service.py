@@ -0,0 +1,111 @@
+import pytest
+
+from services.blaise_service import BlaiseService
+from services.change_detection_service import ChangeDetectionService
+from tests.fake_blaise_api import FakeBlaiseRestApiClient
+from tests.helpers import get_default_config
+from utilities.digest_store import InMemoryDigestStore
+
+
+@pytest.fixture()
+def fake_client() -> FakeBlaiseRestApiClient:
+    fake_client = FakeBlaiseRestApiClient()
+    fake_client.cases = [
+        {"mainSurveyID": "some-guid", "id": "jim", "cmA_IsDonorCase": "1"}
+    ]
+    return fake_client
+
+
+@pytest.fixture()
+def blaise_service(fake_client) -> BlaiseService:
+    blaise_service = BlaiseService(get_default_config())
+    blaise_service.restapi_client = fake_client
+    return blaise_service
+
+
+@pytest.fixture()
+def change_detection_service(blaise_service) -> ChangeDetectionService:
+    return ChangeDetectionService(blaise_service, InMemoryDigestStore())
+
+
+def record_run(change_detection_service, users=("jim",)) -> None:
+    change_detection_service.record(
+        "IPS2403a",
+        "IPS Field Interviewer",
+        change_detection_service.fingerprint("some-guid", list(users)),
+    )
+
+
+def is_unchanged(change_detection_service, users=("jim",), guid="some-guid") -> bool:
+    return change_detection_service.is_unchanged(
+        "IPS2403a",
+        "IPS Field Interviewer",
+        change_detection_service.fingerprint(guid, list(users)),
+    )
+
+
+class TestChangeDetection:
+    def test_is_unchanged_is_false_without_a_previous_run(
+        self, change_detection_service
+    ):
+        # act & assert
+        assert not is_unchanged(change_detection_service)
+
+    def test_is_unchanged_is_true_when_nothing_changed_since_the_last_run(
+        self, change_detection_service
+    ):
+        # arrange
+        record_run(change_detection_service)
+
+        # act & assert
+        assert is_unchanged(change_detection_service, users=["jim", "jim"])
+
+    @pytest.mark.parametrize(
+        "users, guid", [(["jim", "pam"], "some-guid"), (["jim"], "other-guid")]
+    )
+    def test_is_unchanged_is_false_when_the_role_or_questionnaire_changed(
+        self, change_detection_service, users, guid
+    ):
+        # arrange
+        record_run(change_detection_service)
+
+        # act & assert
+        assert not is_unchanged(change_detection_service, users=users, guid=guid)
+
+    def test_is_unchanged_is_false_when_cma_launcher_was_written_to(
+        self, change_detection_service, fake_client
+    ):
+        # arrange
+        record_run(change_detection_service)
+        fake_client.cases.append(
+            {"mainSurveyID": "other-guid", "id": "kelly", "cmA_IsDonorCase": "1"}
+        )
+
+        # act & assert
+        assert not is_unchanged(change_detection_service)
+
+    def test_record_keeps_the_record_count_read_before_the_run_wrote_anything(
+        self, change_detection_service, fake_client
+    ):
+        # arrange
+        fingerprint = change_detection_service.fingerprint("some-guid", ["jim"])
+        fake_client.cases.append(
+            {"mainSurveyID": "some-guid", "id": "pam", "cmA_IsDonorCase": "1"}
+        )
+
+        # act
+        change_detection_service.record(
+            "IPS2403a", "IPS Field Interviewer", fingerprint
+        )
+
+        # assert
+        assert not is_unchanged(change_detection_service)
+
+    def test_change_detection_is_disabled_without_a_digest_store(self, blaise_service):
+        # arrange
+        change_detection_service = ChangeDetectionService(blaise_service, None)
+        record_run(change_detection_service)
+
+        # act & assert
+        assert not change_detection_service.enabled
+        assert not is_unchanged(change_detection_service)
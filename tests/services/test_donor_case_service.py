@@ -1,13 +1,18 @@
 import logging
+import threading
 from unittest import mock
 
+import blaise_restapi
 import pytest
 
 from appconfig.config import Config
+from models.checkpoint_model import Checkpoint
 from services.blaise_service import BlaiseService
 from services.donor_case_service import DonorCaseService
 from tests.helpers import get_default_config
-from utilities.custom_exceptions import BlaiseError, DonorCaseError
+from utilities.checkpoint_store import InMemoryCheckpointStore
+from utilities.custom_exceptions import BlaiseError, CheckpointError, DonorCaseError
+from utilities.deadline import Deadline
 
 
 @pytest.fixture()
@@ -339,6 +344,347 @@ class TestCheckAndCreateDonorCaseForUsers:
         # Assert
         assert result == ["rich", "sarah", "james"]
 
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    @mock.patch("services.blaise_service.BlaiseService.get_all_existing_donor_cases")
+    def test_check_and_create_donor_case_for_users_uses_prefetched_existing_donor_cases(
+        self,
+        mock_get_all_existing_donor_cases,
+        mock_create_donor_case_for_user,
+        donor_case_service,
+    ):
+        # act
+        result = donor_case_service.check_and_create_donor_case_for_users(
+            "IPS2402a",
+            "some-guid",
+            ["rich", "sarah"],
+            existing_donor_cases=["rich"],
+        )
+
+        # assert
+        mock_get_all_existing_donor_cases.assert_not_called()
+        assert result.created == ["sarah"]
+        assert result.skipped == ["rich"]
+
+
+class TestCheckAndCreateDonorCaseForUsersWithDeadline:
+    @mock.patch("services.blaise_service.BlaiseService.get_all_existing_donor_cases")
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    def test_check_and_create_donor_case_for_users_returns_created_and_skipped_users(
+        self,
+        mock_create_donor_case_for_user,
+        mock_get_all_existing_donor_cases,
+        donor_case_service,
+    ):
+        # arrange
+        mock_get_all_existing_donor_cases.return_value = ["sarah"]
+
+        # act
+        result = donor_case_service.check_and_create_donor_case_for_users(
+            "IPS2406a",
+            "7bded891-3aa6-41b2-824b-0be514018806",
+            ["james", "sarah", "rich"],
+            Deadline(60),
+        )
+
+        # assert
+        assert result.created == ["james", "rich"]
+        assert result.skipped == ["sarah"]
+        assert result.remaining == []
+        assert result.is_partial is False
+        assert mock_create_donor_case_for_user.call_count == 2
+
+    @mock.patch("services.blaise_service.BlaiseService.get_all_existing_donor_cases")
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    def test_check_and_create_donor_case_for_users_stops_scheduling_creations_once_the_deadline_expires(
+        self,
+        mock_create_donor_case_for_user,
+        mock_get_all_existing_donor_cases,
+        donor_case_service,
+        caplog,
+    ):
+        # arrange
+        mock_get_all_existing_donor_cases.return_value = []
+        deadline = mock.Mock(spec=Deadline)
+        deadline.expired.side_effect = [False, False, True]
+
+        # act
+        with caplog.at_level(logging.WARNING):
+            result = donor_case_service.check_and_create_donor_case_for_users(
+                "IPS2406a",
+                "7bded891-3aa6-41b2-824b-0be514018806",
+                ["james", "rich", "sarah", "kris"],
+                deadline,
+            )
+
+        # assert
+        assert result.created == ["james", "rich"]
+        assert result.remaining == ["sarah", "kris"]
+        assert result.deadline_exceeded is True
+        assert result.is_partial is True
+        assert mock_create_donor_case_for_user.call_count == 2
+        assert (
+            "root",
+            logging.WARNING,
+            "Stopped creating donor cases before the request deadline. Created: 2, skipped: 0, remaining: 2",
+        ) in caplog.record_tuples
+
+    @mock.patch("services.blaise_service.BlaiseService.get_all_existing_donor_cases")
+    @mock.patch.object(blaise_restapi.Client, "create_multikey_case")
+    def test_check_and_create_donor_case_for_users_propagates_the_deadline_to_the_blaise_service(
+        self,
+        mock_create_multikey_case,
+        mock_get_all_existing_donor_cases,
+        donor_case_service,
+    ):
+        # arrange
+        mock_get_all_existing_donor_cases.return_value = []
+        deadline = mock.Mock(spec=Deadline)
+        deadline.budget_seconds = 10
+        # the service checks pass, the blaise service checks in the worker threads then find the deadline has passed
+        deadline.expired.side_effect = lambda: (
+            threading.current_thread() is not threading.main_thread()
+        )
+
+        # act
+        result = donor_case_service.check_and_create_donor_case_for_users(
+            "IPS2406a",
+            "7bded891-3aa6-41b2-824b-0be514018806",
+            ["james", "rich"],
+            deadline,
+        )
+
+        # assert
+        mock_create_multikey_case.assert_not_called()
+        assert result.created == []
+        assert result.remaining == ["james", "rich"]
+        assert result.deadline_exceeded is True
+
+
+class TestCheckpointedDonorCaseCreation:
+    @pytest.fixture()
+    def checkpoint_store(self) -> InMemoryCheckpointStore:
+        return InMemoryCheckpointStore()
+
+    @pytest.fixture()
+    def checkpointed_donor_case_service(
+        self, blaise_service, checkpoint_store
+    ) -> DonorCaseService:
+        return DonorCaseService(
+            blaise_service, checkpoint_store=checkpoint_store, checkpoint_chunk_size=2
+        )
+
+    @mock.patch("services.blaise_service.BlaiseService.get_all_existing_donor_cases")
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    def test_check_and_create_donor_case_for_users_saves_a_checkpoint_after_every_chunk(
+        self,
+        mock_create_donor_case_for_user,
+        mock_get_all_existing_donor_cases,
+        checkpointed_donor_case_service,
+        checkpoint_store,
+    ):
+        # arrange
+        mock_get_all_existing_donor_cases.return_value = ["sarah"]
+        checkpoint = Checkpoint("IPS2406a", "IPS Manager", "guid")
+        saved_cursors = []
+
+        def record_cursor(saved_checkpoint):
+            saved_cursors.append(saved_checkpoint.cursor)
+
+        checkpoint_store.save = mock.Mock(side_effect=record_cursor)
+
+        # act
+        result = checkpointed_donor_case_service.check_and_create_donor_case_for_users(
+            "IPS2406a",
+            "guid",
+            ["james", "rich", "sarah", "kris", "dan"],
+            checkpoint=checkpoint,
+        )
+
+        # assert
+        assert result.created == ["james", "rich", "kris", "dan"]
+        assert saved_cursors == [0, 2, 4]
+        assert result.resume_token is None
+
+    @mock.patch("services.blaise_service.BlaiseService.get_all_existing_donor_cases")
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    def test_check_and_create_donor_case_for_users_treats_a_zero_chunk_size_as_one(
+        self,
+        _mock_create_donor_case_for_user,
+        mock_get_all_existing_donor_cases,
+        blaise_service,
+        checkpoint_store,
+    ):
+        # arrange
+        mock_get_all_existing_donor_cases.return_value = []
+        donor_case_service = DonorCaseService(
+            blaise_service, checkpoint_store=checkpoint_store, checkpoint_chunk_size=0
+        )
+        checkpoint = Checkpoint("IPS2406a", "IPS Manager", "guid")
+
+        # act
+        result = donor_case_service.check_and_create_donor_case_for_users(
+            "IPS2406a", "guid", ["james", "rich"], checkpoint=checkpoint
+        )
+
+        # assert
+        assert result.created == ["james", "rich"]
+
+    @mock.patch("services.blaise_service.BlaiseService.get_all_existing_donor_cases")
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    def test_check_and_create_donor_case_for_users_keeps_the_checkpoint_when_the_deadline_is_reached(
+        self,
+        _mock_create_donor_case_for_user,
+        mock_get_all_existing_donor_cases,
+        checkpointed_donor_case_service,
+        checkpoint_store,
+    ):
+        # arrange
+        mock_get_all_existing_donor_cases.return_value = []
+        deadline = mock.Mock(spec=Deadline)
+        deadline.expired.side_effect = [False, True]
+        checkpoint = Checkpoint("IPS2406a", "IPS Manager", "guid")
+
+        # act
+        result = checkpointed_donor_case_service.check_and_create_donor_case_for_users(
+            "IPS2406a", "guid", ["james", "rich", "sarah"], deadline, checkpoint
+        )
+
+        # assert
+        assert result.resume_token == checkpoint.resume_token
+        saved = checkpoint_store.load(checkpoint.resume_token)
+        assert saved.users_done == ["james"]
+        assert saved.remaining_users == ["rich", "sarah"]
+
+    @mock.patch("services.blaise_service.BlaiseService.get_all_existing_donor_cases")
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    def test_check_and_create_donor_case_for_users_records_the_failed_user_before_raising(
+        self,
+        mock_create_donor_case_for_user,
+        mock_get_all_existing_donor_cases,
+        checkpointed_donor_case_service,
+        checkpoint_store,
+    ):
+        # arrange
+        mock_get_all_existing_donor_cases.return_value = []
+
+        def fail_for_rich(donor_case_model):
+            if donor_case_model.user == "rich":
+                raise BlaiseError("Nope")
+
+        mock_create_donor_case_for_user.side_effect = fail_for_rich
+        checkpoint = Checkpoint("IPS2406a", "IPS Manager", "guid")
+
+        # act
+        with pytest.raises(BlaiseError):
+            checkpointed_donor_case_service.check_and_create_donor_case_for_users(
+                "IPS2406a",
+                "guid",
+                ["james", "rich", "sarah"],
+                checkpoint=checkpoint,
+            )
+
+        # assert
+        saved = checkpoint_store.load(checkpoint.resume_token)
+        assert saved.users_done == ["james"]
+        assert saved.users_failed == ["rich"]
+        assert saved.remaining_users == ["sarah"]
+
+    @mock.patch("services.blaise_service.BlaiseService.get_all_existing_donor_cases")
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    def test_check_and_create_donor_case_for_users_includes_the_resume_token_in_the_error(
+        self,
+        mock_create_donor_case_for_user,
+        mock_get_all_existing_donor_cases,
+        checkpointed_donor_case_service,
+    ):
+        # arrange
+        mock_get_all_existing_donor_cases.return_value = []
+        mock_create_donor_case_for_user.side_effect = BlaiseError("Nope")
+        checkpoint = Checkpoint("IPS2406a", "IPS Manager", "guid")
+
+        # act
+        with pytest.raises(BlaiseError) as err:
+            checkpointed_donor_case_service.check_and_create_donor_case_for_users(
+                "IPS2406a", "guid", ["james"], checkpoint=checkpoint
+            )
+
+        # assert
+        assert str(err.value) == f"Nope. Resume token: {checkpoint.resume_token}"
+
+    @mock.patch("services.blaise_service.BlaiseService.get_all_existing_donor_cases")
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    def test_resume_donor_case_creation_continues_without_rescanning_or_recreating_done_users(
+        self,
+        mock_create_donor_case_for_user,
+        mock_get_all_existing_donor_cases,
+        checkpointed_donor_case_service,
+        checkpoint_store,
+    ):
+        # arrange
+        checkpoint = Checkpoint(
+            "IPS2406a",
+            "IPS Manager",
+            "guid",
+            pending_users=["james", "rich", "sarah"],
+            cursor=2,
+            users_done=["james"],
+            users_failed=["rich"],
+        )
+        checkpoint_store.save(checkpoint)
+
+        # act
+        result = checkpointed_donor_case_service.resume_donor_case_creation(
+            checkpoint.resume_token, "IPS2406a", "IPS Manager"
+        )
+
+        # assert
+        mock_get_all_existing_donor_cases.assert_not_called()
+        created_users = [
+            call[0][0].user for call in mock_create_donor_case_for_user.call_args_list
+        ]
+        assert created_users == ["rich", "sarah"]
+        assert result.created == ["rich", "sarah"]
+        assert checkpoint_store.load(checkpoint.resume_token) is None
+
+    @pytest.mark.parametrize(
+        "resume_token, questionnaire_name, role",
+        [
+            ("unknown", "IPS2406a", "IPS Manager"),
+            (None, "IPS2407a", "IPS Manager"),
+            (None, "IPS2406a", "IPS Field Interviewer"),
+        ],
+    )
+    def test_resume_donor_case_creation_raises_a_checkpoint_error_when_no_matching_checkpoint_exists(
+        self,
+        checkpointed_donor_case_service,
+        checkpoint_store,
+        resume_token,
+        questionnaire_name,
+        role,
+    ):
+        # arrange
+        checkpoint = Checkpoint("IPS2406a", "IPS Manager", "guid")
+        checkpoint_store.save(checkpoint)
+
+        # act & assert
+        with pytest.raises(CheckpointError):
+            checkpointed_donor_case_service.resume_donor_case_creation(
+                resume_token or checkpoint.resume_token, questionnaire_name, role
+            )
+
+    def test_resume_donor_case_creation_raises_a_checkpoint_error_when_checkpoints_are_disabled(
+        self, donor_case_service
+    ):
+        # act & assert
+        with pytest.raises(CheckpointError) as err:
+            donor_case_service.resume_donor_case_creation(
+                "abc", "IPS2406a", "IPS Manager"
+            )
+        assert (
+            err.value.message
+            == "Cannot resume donor case creation, checkpoints are disabled"
+        )
+
 
 class TestReissueNewDonorCaseForUser:
     @mock.patch(
@@ -379,6 +725,30 @@ class TestReissueNewDonorCaseForUser:
             f"New Donor case created for user {user} with ID of 2-test-user",
         ) in caplog.record_tuples
 
+    @mock.patch(
+        "services.blaise_service.BlaiseService.get_existing_donor_cases_for_user"
+    )
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    def test_reissue_new_donor_case_for_user_uses_the_case_ids_it_is_given(
+        self,
+        mock_create_donor_case_for_user,
+        mock_get_existing_donor_cases_for_user,
+        donor_case_service,
+    ):
+        # Arrange
+        questionnaire_name = "IPS2406a"
+        guid = "7bded891-3aa6-41b2-824b-0be514018806"
+        user = "test-user"
+
+        # Act
+        result = donor_case_service.reissue_new_donor_case_for_user(
+            questionnaire_name, guid, user, ["test-user", "3-test-user"]
+        )
+
+        # Assert
+        assert result == "4-test-user"
+        mock_get_existing_donor_cases_for_user.assert_not_called()
+
     @mock.patch(
         "services.blaise_service.BlaiseService.get_existing_donor_cases_for_user"
     )
@@ -0,0 +1,140 @@
+import threading
+from concurrent.futures import Future
+
+from models.shard_model import ShardResult, ShardTask
+from services.orchestrator_service import OrchestratorService
+from utilities.deadline import Deadline
+from utilities.task_transport import LocalQueueTransport
+
+
+def create_all(task: ShardTask) -> ShardResult:
+    return ShardResult(task.shard_index, created=list(task.users))
+
+
+class FailingTransport(LocalQueueTransport):
+    def dispatch(self, task: ShardTask) -> "Future[ShardResult]":
+        if task.shard_index == 1:
+            future: Future = Future()
+            future.set_exception(Exception("The queue is in the annex"))
+            return future
+        return super().dispatch(task)
+
+
+class TestPartition:
+    def test_partition_splits_users_into_shards_of_the_configured_size(self):
+        # arrange
+        orchestrator_service = OrchestratorService(
+            LocalQueueTransport(create_all, 2), shard_size=2
+        )
+
+        # act
+        tasks = orchestrator_service.partition(
+            "IPS2402a",
+            "some-guid",
+            "IPS Manager",
+            ["jim", "pam", "dwight", "angela", "kevin"],
+        )
+
+        # assert
+        assert [task.users for task in tasks] == [
+            ["jim", "pam"],
+            ["dwight", "angela"],
+            ["kevin"],
+        ]
+        assert [task.shard_index for task in tasks] == [0, 1, 2]
+        assert all(task.shard_count == 3 for task in tasks)
+
+
+class TestOrchestrate:
+    def test_orchestrate_dispatches_users_without_donor_cases_and_aggregates_the_results(
+        self,
+    ):
+        # arrange
+        dispatched = []
+
+        def worker(task: ShardTask) -> ShardResult:
+            dispatched.append(task.users)
+            return create_all(task)
+
+        orchestrator_service = OrchestratorService(
+            LocalQueueTransport(worker, 2), shard_size=2
+        )
+
+        # act
+        report = orchestrator_service.orchestrate(
+            "IPS2402a",
+            "some-guid",
+            "IPS Manager",
+            ["jim", "pam", "dwight", "angela", "kevin"],
+            ["pam"],
+        )
+
+        # assert
+        assert sorted(dispatched) == [["angela", "kevin"], ["jim", "dwight"]]
+        assert report.skipped == ["pam"]
+        assert report.created == ["jim", "dwight", "angela", "kevin"]
+        assert report.is_complete
+        assert report.summary() == (
+            "Shards: 2, failed shards: 0, created: 4, skipped: 1, remaining: 0"
+        )
+
+    def test_orchestrate_reports_failed_shards_and_their_users_as_remaining(self):
+        # arrange
+        def worker(task: ShardTask) -> ShardResult:
+            if task.shard_index == 0:
+                return ShardResult(
+                    0, created=["jim"], remaining=["pam"], error="Blaise is down"
+                )
+            return create_all(task)
+
+        orchestrator_service = OrchestratorService(
+            FailingTransport(worker, 2), shard_size=2
+        )
+
+        # act
+        report = orchestrator_service.orchestrate(
+            "IPS2402a",
+            "some-guid",
+            "IPS Manager",
+            ["jim", "pam", "dwight", "angela", "kevin"],
+            [],
+        )
+
+        # assert
+        assert report.failed_shards == [0, 1]
+        assert report.created == ["jim", "kevin"]
+        assert report.remaining == ["pam", "dwight", "angela"]
+        assert not report.is_complete
+        assert "could not be dispatched: The queue is in the annex" in (
+            report.shards[1].error
+        )
+
+    def test_orchestrate_marks_shards_that_miss_the_deadline_as_remaining(self):
+        # arrange
+        release_worker = threading.Event()
+
+        def worker(task: ShardTask) -> ShardResult:
+            if task.shard_index == 1:
+                release_worker.wait()
+            return create_all(task)
+
+        orchestrator_service = OrchestratorService(
+            LocalQueueTransport(worker, 2), shard_size=1
+        )
+
+        # act
+        report = orchestrator_service.orchestrate(
+            "IPS2402a",
+            "some-guid",
+            "IPS Manager",
+            ["jim", "pam"],
+            [],
+            Deadline(0.1),
+        )
+        release_worker.set()
+
+        # assert
+        assert report.created == ["jim"]
+        assert report.remaining == ["pam"]
+        assert report.shards[1].deadline_exceeded
+        assert report.failed_shards == [1]
@@ -0,0 +1,122 @@
+import time
+from unittest import mock
+
+import blaise_restapi
+import pytest
+
+from appconfig.config import Config
+from services.blaise_service import BlaiseService
+from services.guid_service import GUIDService
+from services.prefetch_service import PrefetchResult, PrefetchService
+from services.server_park_service import ServerParkService
+from services.user_service import UserService
+from tests.helpers import get_default_config
+from utilities.custom_exceptions import BlaiseError, UsersError
+
+
+@pytest.fixture()
+def config() -> Config:
+    return get_default_config()
+
+
+@pytest.fixture()
+def prefetch_service(config) -> PrefetchService:
+    blaise_service = BlaiseService(config)
+    return PrefetchService(
+        blaise_service,
+        GUIDService(blaise_service),
+        UserService(blaise_service),
+        ServerParkService(
+            blaise_service,
+            config.get_server_parks(),
+            config.questionnaire_cache_ttl_seconds,
+        ),
+    )
+
+
+def slow(return_value, seconds=0.2):
+    def call(*_args, **_kwargs):
+        time.sleep(seconds)
+        return return_value
+
+    return call
+
+
+@mock.patch.object(blaise_restapi.Client, "questionnaire_exists_on_server_park")
+class TestPrefetchForDonorCaseCreation:
+    @mock.patch("services.blaise_service.BlaiseService.get_all_existing_donor_cases")
+    @mock.patch("services.user_service.UserService.get_users_by_role")
+    @mock.patch("services.guid_service.GUIDService.get_guid")
+    def test_prefetch_returns_the_guid_users_and_existing_donor_cases(
+        self,
+        mock_get_guid,
+        mock_get_users_by_role,
+        mock_get_all_existing_donor_cases,
+        _mock_questionnaire_exists,
+        prefetch_service,
+        config,
+    ):
+        # arrange
+        mock_get_guid.return_value = "some-guid"
+        mock_get_users_by_role.return_value = ["rich", "sarah"]
+        mock_get_all_existing_donor_cases.return_value = ["rich"]
+
+        # act
+        result = prefetch_service.prefetch_for_donor_case_creation(
+            config, "IPS2402a", "IPS Manager"
+        )
+
+        # assert
+        assert result == PrefetchResult("some-guid", ["rich", "sarah"], ["rich"])
+        mock_get_guid.assert_called_once_with("gusty", "IPS2402a", fresh=True)
+        mock_get_users_by_role.assert_called_once_with(
+            "gusty", "IPS Manager", fresh=True
+        )
+        mock_get_all_existing_donor_cases.assert_called_once_with("some-guid")
+
+    @mock.patch("services.blaise_service.BlaiseService.get_all_existing_donor_cases")
+    @mock.patch("services.user_service.UserService.get_users_by_role")
+    @mock.patch("services.guid_service.GUIDService.get_guid")
+    def test_prefetch_takes_as_long_as_the_slowest_read_chain_not_the_sum(
+        self,
+        mock_get_guid,
+        mock_get_users_by_role,
+        mock_get_all_existing_donor_cases,
+        _mock_questionnaire_exists,
+        prefetch_service,
+        config,
+    ):
+        # arrange
+        mock_get_guid.side_effect = slow("some-guid", 0.1)
+        mock_get_all_existing_donor_cases.side_effect = slow(["rich"], 0.1)
+        mock_get_users_by_role.side_effect = slow(["rich", "sarah"], 0.2)
+
+        # act
+        start_time = time.perf_counter()
+        prefetch_service.prefetch_for_donor_case_creation(
+            config, "IPS2402a", "IPS Manager"
+        )
+        elapsed = time.perf_counter() - start_time
+
+        # assert
+        assert 0.2 <= elapsed < 0.35
+
+    @mock.patch("services.user_service.UserService.get_users_by_role")
+    @mock.patch("services.guid_service.GUIDService.get_guid")
+    def test_prefetch_raises_the_questionnaire_error_when_both_chains_fail(
+        self,
+        mock_get_guid,
+        mock_get_users_by_role,
+        _mock_questionnaire_exists,
+        prefetch_service,
+        config,
+    ):
+        # arrange
+        mock_get_guid.side_effect = BlaiseError("Questionnaire has gone to Nashua")
+        mock_get_users_by_role.side_effect = UsersError("Users are in the annex")
+
+        # act & assert
+        with pytest.raises(BlaiseError, match="Questionnaire has gone to Nashua"):
+            prefetch_service.prefetch_for_donor_case_creation(
+                config, "IPS2402a", "IPS Manager"
+            )
@@ -0,0 +1,139 @@
+import pytest
+
+from services.blaise_service import BlaiseService
+from services.reconcile_service import ReconcileService
+from tests.fake_blaise_api import FakeBlaiseRestApiClient
+from tests.helpers import get_default_config
+from utilities.deadline import Deadline
+
+
+@pytest.fixture()
+def fake_client() -> FakeBlaiseRestApiClient:
+    fake_client = FakeBlaiseRestApiClient()
+    fake_client.cases = [
+        {"mainSurveyID": "some-guid", "id": "jim", "cmA_IsDonorCase": "1"},
+        {"mainSurveyID": "some-guid", "id": "2-jim", "cmA_IsDonorCase": "1"},
+        {"mainSurveyID": "some-guid", "id": "ryan", "cmA_IsDonorCase": "1"},
+        {"mainSurveyID": "some-guid", "id": "3-ryan", "cmA_IsDonorCase": "1"},
+    ]
+    return fake_client
+
+
+@pytest.fixture()
+def reconcile_service(fake_client) -> ReconcileService:
+    blaise_service = BlaiseService(get_default_config())
+    blaise_service.restapi_client = fake_client
+    return ReconcileService(blaise_service, batch_size=2)
+
+
+def reconcile(reconcile_service, dry_run=False, deadline=None):
+    return reconcile_service.reconcile(
+        "IPS2403a",
+        "some-guid",
+        "IPS Field Interviewer",
+        ["jim", "pam", "dwight"],
+        ["jim", "pam", "dwight"],
+        ["2-jim", "3-ryan", "jim", "ryan"],
+        deadline,
+        dry_run,
+    )
+
+
+class TestPlan:
+    def test_plan_creates_missing_cases_and_retires_cases_of_users_without_the_role(
+        self,
+    ):
+        # act
+        result = ReconcileService.plan(
+            "IPS2403a",
+            "IPS Field Interviewer",
+            ["jim", "pam"],
+            ["jim", "pam"],
+            ["2-jim", "3-ryan", "jim", "ryan"],
+            dry_run=True,
+        )
+
+        # assert
+        assert result.kept == ["jim"]
+        assert [
+            (action.action, action.user, action.case_id) for action in result.actions
+        ] == [
+            ("create", "pam", "pam"),
+            ("retire", "ryan", "3-ryan"),
+            ("retire", "ryan", "ryan"),
+        ]
+
+    def test_plan_keeps_the_cases_of_users_with_another_ips_role(self):
+        # act
+        result = ReconcileService.plan(
+            "IPS2403a",
+            "IPS Field Interviewer",
+            ["jim", "pam"],
+            ["jim", "pam", "michael"],
+            ["jim", "pam", "michael", "2-michael"],
+            dry_run=True,
+        )
+
+        # assert
+        assert result.kept == ["jim", "pam"]
+        assert result.actions == []
+
+
+class TestReconcile:
+    def test_reconcile_dry_run_reports_planned_actions_without_writing(
+        self, reconcile_service, fake_client
+    ):
+        # act
+        result = reconcile(reconcile_service, dry_run=True)
+
+        # assert
+        assert {action.status for action in result.actions} == {"planned"}
+        assert result.summary() == "Would create: 2, would retire: 2, kept: 1"
+        assert fake_client.calls == []
+
+    def test_reconcile_creates_and_retires_donor_cases(
+        self, reconcile_service, fake_client
+    ):
+        # act
+        result = reconcile(reconcile_service)
+
+        # assert
+        assert result.is_complete
+        assert result.summary() == (
+            "Created: 2, retired: 2, kept: 1, failed: 0, not run: 0"
+        )
+        assert sorted(case["id"] for case in fake_client.cases) == [
+            "2-jim",
+            "dwight",
+            "jim",
+            "pam",
+        ]
+
+    def test_reconcile_reports_failed_actions_and_carries_on(
+        self, reconcile_service, fake_client
+    ):
+        # arrange
+        fake_client.script_writes((0, 500))
+
+        # act
+        result = reconcile(reconcile_service)
+
+        # assert
+        assert not result.is_complete
+        assert result.failed == 1
+        failed_action = next(
+            action for action in result.actions if action.status == "failed"
+        )
+        assert "500 Error from fake Blaise API" in failed_action.error
+        assert result.created + result.retired == 3
+
+    def test_reconcile_stops_starting_batches_once_the_deadline_has_passed(
+        self, reconcile_service, fake_client
+    ):
+        # act
+        result = reconcile(reconcile_service, deadline=Deadline(0))
+
+        # assert
+        assert result.deadline_exceeded
+        assert result.not_run == 4
+        assert fake_client.calls == []
@@ -0,0 +1,167 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from appconfig.config import Config
+from services.blaise_service import BlaiseService
+from services.server_park_service import ServerParkService
+from tests.fake_blaise_api import FakeBlaiseRestApiClient, FakeHttpError
+from utilities.custom_exceptions import BlaiseError
+
+
+@pytest.fixture()
+def fake_client() -> FakeBlaiseRestApiClient:
+    return FakeBlaiseRestApiClient(
+        questionnaires=[
+            {"name": "IPS2402a", "id": "guid-1", "serverParkName": "gusty"},
+            {"name": "IPS2403a", "id": "guid-2", "serverParkName": "windy"},
+            {"name": "IPS2403a", "id": "guid-3", "serverParkName": "stormy"},
+        ]
+    )
+
+
+@pytest.fixture()
+def blaise_service(fake_client) -> BlaiseService:
+    blaise_service = BlaiseService(
+        Config(blaise_api_url="blaise_api_url", blaise_server_park="gusty")
+    )
+    blaise_service.restapi_client = fake_client
+    return blaise_service
+
+
+def server_park_service(blaise_service, server_parks) -> ServerParkService:
+    return ServerParkService(blaise_service, server_parks, cache_ttl_seconds=60)
+
+
+class TestResolveServerPark:
+    def test_resolve_server_park_makes_no_calls_with_a_single_server_park(
+        self, blaise_service, fake_client
+    ):
+        # act
+        server_park = server_park_service(
+            blaise_service, ["gusty"]
+        ).resolve_server_park("IPS2403a")
+
+        # assert
+        assert server_park == "gusty"
+        assert fake_client.calls == []
+
+    def test_resolve_server_park_finds_the_park_the_questionnaire_is_on(
+        self, blaise_service
+    ):
+        # act
+        server_park = server_park_service(
+            blaise_service, ["gusty", "windy"]
+        ).resolve_server_park("IPS2403a")
+
+        # assert
+        assert server_park == "windy"
+
+    def test_resolve_server_park_prefers_the_first_configured_park(
+        self, blaise_service, caplog
+    ):
+        # act
+        server_park = server_park_service(
+            blaise_service, ["gusty", "stormy", "windy"]
+        ).resolve_server_park("IPS2403a")
+
+        # assert
+        assert server_park == "stormy"
+        assert (
+            "root",
+            30,
+            "Questionnaire IPS2403a is installed on server parks ['stormy', 'windy'], "
+            "using stormy",
+        ) in caplog.record_tuples
+
+    def test_resolve_server_park_caches_the_resolved_park(
+        self, blaise_service, fake_client
+    ):
+        # arrange
+        service = server_park_service(blaise_service, ["gusty", "windy"])
+        service.resolve_server_park("IPS2403a")
+        calls_after_first_lookup = len(fake_client.calls)
+
+        # act
+        server_park = service.resolve_server_park("IPS2403a")
+
+        # assert
+        assert server_park == "windy"
+        assert len(fake_client.calls) == calls_after_first_lookup
+
+    def test_resolve_server_park_looks_up_parks_concurrently(self, blaise_service):
+        # arrange
+        both_parks_called = threading.Barrier(2, timeout=2)
+
+        def get_questionnaire(server_park, questionnaire_name):
+            both_parks_called.wait()
+            if server_park == "windy":
+                return {"name": questionnaire_name, "id": "guid-2"}
+            raise BlaiseError("Questionnaire not found")
+
+        # act
+        with mock.patch.object(
+            blaise_service, "get_questionnaire", side_effect=get_questionnaire
+        ):
+            server_park = server_park_service(
+                blaise_service, ["gusty", "windy"]
+            ).resolve_server_park("IPS2403a")
+
+        # assert
+        assert server_park == "windy"
+
+    def test_resolve_server_park_raises_a_blaise_error_when_no_park_has_it(
+        self, blaise_service
+    ):
+        # act
+        with pytest.raises(BlaiseError) as err:
+            server_park_service(blaise_service, ["gusty", "windy"]).resolve_server_park(
+                "OPN2101A"
+            )
+
+        # assert
+        assert (
+            str(err.value)
+            == "Questionnaire OPN2101A was not found on server parks ['gusty', 'windy']"
+        )
+
+    def test_resolve_server_park_raises_when_a_park_fails_rather_than_skipping_it(
+        self, blaise_service, fake_client
+    ):
+        # arrange
+        def get_questionnaire_for_server_park(server_park, questionnaire_name):
+            raise FakeHttpError(502)
+
+        def questionnaire_exists_on_server_park(server_park, questionnaire_name):
+            if server_park == "gusty":
+                raise FakeHttpError(502)
+            return False
+
+        fake_client.get_questionnaire_for_server_park = (
+            get_questionnaire_for_server_park
+        )
+        fake_client.questionnaire_exists_on_server_park = (
+            questionnaire_exists_on_server_park
+        )
+
+        # act
+        with pytest.raises(BlaiseError) as err:
+            server_park_service(blaise_service, ["gusty", "windy"]).resolve_server_park(
+                "IPS2402a"
+            )
+
+        # assert
+        assert "502 Error from fake Blaise API" in str(err.value)
+        assert "was not found on server parks" not in str(err.value)
+
+
+class TestMapServerParks:
+    def test_map_server_parks_returns_a_result_per_park_in_order(self, blaise_service):
+        # act
+        results = server_park_service(
+            blaise_service, ["gusty", "windy"]
+        ).map_server_parks(lambda server_park, suffix: server_park + suffix, "-park")
+
+        # assert
+        assert results == ["gusty-park", "windy-park"]
@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from appconfig.config import Config
+from services.service_container import get_service_container
+from tests.helpers import get_default_config
+from utilities.custom_exceptions import ConfigError
+
+
+class TestGetServiceContainer:
+    @mock.patch("appconfig.config.Config.from_env")
+    def test_get_service_container_builds_the_services_once_per_process(
+        self, mock_config
+    ):
+        # arrange
+        mock_config.return_value = get_default_config()
+
+        # act
+        first = get_service_container()
+        second = get_service_container()
+
+        # assert
+        assert first is second
+        mock_config.assert_called_once()
+        assert first.guid_service._blaise_service is first.blaise_service
+        assert first.user_service._blaise_service is first.blaise_service
+
+    @mock.patch("appconfig.config.Config.from_env")
+    def test_get_service_container_builds_once_under_concurrent_first_use(
+        self, mock_config
+    ):
+        # arrange
+        mock_config.return_value = get_default_config()
+        started = threading.Barrier(8)
+
+        def get_container():
+            started.wait()
+            return get_service_container()
+
+        # act
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            containers = list(executor.map(lambda _: get_container(), range(8)))
+
+        # assert
+        assert all(container is containers[0] for container in containers)
+        mock_config.assert_called_once()
+
+    @mock.patch("appconfig.config.Config.from_env")
+    def test_get_service_container_does_not_keep_an_invalid_config(self, mock_config):
+        # arrange
+        mock_config.side_effect = [
+            Config(blaise_api_url="", blaise_server_park="gusty"),
+            get_default_config(),
+        ]
+
+        # act
+        with pytest.raises(ConfigError):
+            get_service_container()
+        container = get_service_container()
+
+        # assert
+        assert container.config == get_default_config()
@@ -0,0 +1,56 @@
+from unittest import mock
+
+import pytest
+
+from models.shard_model import ShardTask
+from services.blaise_service import BlaiseService
+from services.donor_case_service import DonorCaseService
+from services.shard_worker_service import ShardWorkerService
+from tests.helpers import get_default_config
+from utilities.custom_exceptions import BlaiseError
+
+
+@pytest.fixture()
+def shard_worker_service() -> ShardWorkerService:
+    return ShardWorkerService(DonorCaseService(BlaiseService(get_default_config())))
+
+
+@pytest.fixture()
+def task() -> ShardTask:
+    return ShardTask("IPS2402a", "some-guid", "IPS Manager", 0, 2, ["jim", "pam"])
+
+
+class TestRunShard:
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    def test_run_shard_creates_a_donor_case_for_every_user_in_the_shard(
+        self, mock_create_donor_case_for_user, shard_worker_service, task
+    ):
+        # act
+        result = shard_worker_service.run_shard(task)
+
+        # assert
+        assert sorted(result.created) == ["jim", "pam"]
+        assert result.status == "complete"
+        assert mock_create_donor_case_for_user.call_count == 2
+
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    def test_run_shard_reports_an_error_instead_of_raising(
+        self, mock_create_donor_case_for_user, shard_worker_service, task, caplog
+    ):
+        # arrange
+        def fail_for_pam(donor_case_model):
+            if donor_case_model.user == "pam":
+                raise BlaiseError("Pam is at the Nashua branch")
+
+        mock_create_donor_case_for_user.side_effect = fail_for_pam
+
+        # act
+        result = shard_worker_service.run_shard(task)
+
+        # assert
+        assert result.created == ["jim"]
+        assert result.remaining == ["pam"]
+        assert result.status == "failed"
+        assert result.error == (
+            "Shard 1/2 for questionnaire IPS2402a failed: Pam is at the Nashua branch"
+        )
@@ -0,0 +1,144 @@
+import pytest
+
+from services.blaise_service import BlaiseService
+from services.donor_case_service import DonorCaseService
+from services.server_park_service import ServerParkService
+from services.sweep_service import SweepService
+from services.warmup_service import WarmupService
+from tests.fake_blaise_api import FakeBlaiseRestApiClient
+from tests.helpers import get_default_config
+from utilities.deadline import Deadline
+
+
+@pytest.fixture()
+def fake_client() -> FakeBlaiseRestApiClient:
+    fake_client = FakeBlaiseRestApiClient(
+        users=[
+            {"name": "jim", "role": "IPS Field Interviewer"},
+            {"name": "pam", "role": "IPS Field Interviewer"},
+            {"name": "michael", "role": "IPS Manager"},
+            {"name": "toby", "role": "HR"},
+        ],
+        questionnaires=[
+            {
+                "name": "IPS2403a",
+                "id": "guid-a",
+                "serverParkName": "gusty",
+                "status": "Active",
+            },
+            {
+                "name": "IPS2404a",
+                "id": "guid-b",
+                "serverParkName": "gusty",
+                "status": "Active",
+            },
+            {
+                "name": "IPS2402a",
+                "id": "guid-c",
+                "serverParkName": "gusty",
+                "status": "Inactive",
+            },
+            {
+                "name": "LMS2403a",
+                "id": "guid-d",
+                "serverParkName": "gusty",
+                "status": "Active",
+            },
+        ],
+    )
+    fake_client.cases = [
+        {"mainSurveyID": "guid-a", "id": "jim", "cmA_IsDonorCase": "1"},
+    ]
+    return fake_client
+
+
+@pytest.fixture()
+def sweep_service(fake_client) -> SweepService:
+    config = get_default_config()
+    blaise_service = BlaiseService(config)
+    blaise_service.restapi_client = fake_client
+    return SweepService(
+        blaise_service,
+        DonorCaseService(blaise_service),
+        ServerParkService(blaise_service, ["gusty"], 300),
+        WarmupService(blaise_service),
+    )
+
+
+class TestSweep:
+    def test_sweep_creates_missing_donor_cases_for_every_active_questionnaire_and_role(
+        self, sweep_service, fake_client
+    ):
+        # act
+        report = sweep_service.sweep(["IPS Field Interviewer", "IPS Manager"])
+
+        # assert
+        assert report.is_complete
+        assert report.questionnaires == ["IPS2403a", "IPS2404a"]
+        assert sorted(
+            (case["mainSurveyID"], case["id"]) for case in fake_client.cases
+        ) == [
+            ("guid-a", "jim"),
+            ("guid-a", "michael"),
+            ("guid-a", "pam"),
+            ("guid-b", "jim"),
+            ("guid-b", "michael"),
+            ("guid-b", "pam"),
+        ]
+        assert report.summary() == (
+            "Questionnaires: 2, roles: 2, created: 5, complete: 4, "
+            "no users: 0, partial: 0, failed: 0, not run: 0"
+        )
+
+    def test_sweep_reads_users_questionnaires_and_cases_once(
+        self, sweep_service, fake_client
+    ):
+        # act
+        sweep_service.sweep(["IPS Field Interviewer", "IPS Manager"])
+
+        # assert
+        reads = [call for call in fake_client.calls if call != "create_multikey_case"]
+        assert sorted(reads) == [
+            "get_all_questionnaires_for_server_park",
+            "get_questionnaire_data",
+            "get_users",
+        ]
+
+    def test_sweep_reports_roles_without_users(self, sweep_service):
+        # act
+        report = sweep_service.sweep(["IPS Pilot Interviewer"])
+
+        # assert
+        assert report.is_complete
+        assert {entry.status for entry in report.entries} == {"no_users"}
+
+    def test_sweep_continues_after_a_questionnaire_fails(
+        self, sweep_service, fake_client
+    ):
+        # arrange
+        fake_client.script_writes((0, 500))
+
+        # act
+        report = sweep_service.sweep(["IPS Manager"])
+
+        # assert
+        assert not report.is_complete
+        assert [entry.status for entry in report.entries] == ["failed", "complete"]
+        assert "500 Error from fake Blaise API" in report.entries[0].error
+        assert [case["mainSurveyID"] for case in fake_client.cases] == [
+            "guid-a",
+            "guid-b",
+        ]
+
+    def test_sweep_marks_entries_not_run_once_the_deadline_has_passed(
+        self, sweep_service, fake_client
+    ):
+        # arrange
+        fake_client.script_writes((0.1, None))
+
+        # act
+        report = sweep_service.sweep(["IPS Manager"], Deadline(0.05))
+
+        # assert
+        assert report.deadline_exceeded
+        assert [entry.status for entry in report.entries] == ["complete", "not_run"]
@@ -131,3 +131,16 @@ def test_get_users_by_role_logs_the_number_of_ips_users_found(
         logging.INFO,
         "Got 2 users from server park gusty for role IPS Field Interviewer",
     ) in caplog.record_tuples
+
+
+@mock.patch.object(BlaiseService, "get_users")
+def test_get_user_by_name_does_not_use_the_users_cache(get_users, user_service):
+    # Arrange
+    get_users.return_value = [{"name": "rich", "role": "IPS Field Interviewer"}]
+
+    # Act
+    result = user_service.get_user_by_name("gusty", "rich")
+
+    # Assert
+    assert result == {"name": "rich", "role": "IPS Field Interviewer"}
+    get_users.assert_called_once_with("gusty", fresh=True)
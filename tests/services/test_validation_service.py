@@ -305,6 +305,239 @@ class TestGetValidRequestValues:
             )
 
 
+class TestSchemaValidation:
+    def test_get_valid_request_values_reports_every_violation_at_once(self, caplog):
+        # arrange
+        mock_request = flask.Request.from_values(
+            json={"questionnaire_name": "IP2402a", "role": "Regional Manager"}
+        )
+        validation_service = ValidationService()
+
+        # act
+        with pytest.raises(RequestError) as err:
+            validation_service.get_valid_request_values_for_create_donor_cases(
+                mock_request
+            )
+
+        # assert
+        error_message = (
+            "IP2402a is not a valid questionnaire name format. "
+            "Questionnaire name must start with 3 letters, followed by 4 numbers; "
+            "Regional Manager is not a valid role. "
+            "Please choose one of the following roles: ['IPS Manager', 'IPS Field Interviewer', 'IPS Pilot Interviewer']"
+        )
+        assert err.value.args[0] == error_message
+        assert ("root", 40, error_message) in caplog.record_tuples
+
+    def test_get_valid_request_values_raises_a_request_error_when_keys_are_absent(
+        self,
+    ):
+        # arrange
+        mock_request = flask.Request.from_values(json={})
+        validation_service = ValidationService()
+
+        # act
+        with pytest.raises(RequestError) as err:
+            validation_service.get_valid_request_values_for_reissue_new_donor_case(
+                mock_request
+            )
+
+        # assert
+        assert (
+            err.value.args[0]
+            == "Missing required values from request: ['questionnaire_name', 'user']"
+        )
+
+    @pytest.mark.parametrize("request_json", [["IPS Manager"], "IPS Manager", 42])
+    def test_get_valid_request_value_raises_a_request_error_when_the_body_is_not_an_object(
+        self, request_json
+    ):
+        # arrange
+        validation_service = ValidationService()
+
+        # act
+        with pytest.raises(RequestError) as err:
+            validation_service.get_valid_request_value_for_get_users(
+                MockRequest(request_json)
+            )
+
+        # assert
+        assert err.value.args[0] == (
+            f"Request body must be a JSON object, not {request_json!r}"
+        )
+
+    def test_get_valid_request_value_treats_a_blank_role_as_missing(self):
+        # arrange
+        mock_request = flask.Request.from_values(json={"role": "   "})
+        validation_service = ValidationService()
+
+        # act
+        with pytest.raises(RequestError) as err:
+            validation_service.get_valid_request_value_for_get_users(mock_request)
+
+        # assert
+        assert err.value.args[0] == "Missing required value from request: ['role']"
+
+    def test_get_valid_request_values_rejects_values_that_are_not_strings(self):
+        # arrange
+        mock_request = flask.Request.from_values(
+            json={"questionnaire_name": 2402, "role": "IPS Manager"}
+        )
+        validation_service = ValidationService()
+
+        # act
+        with pytest.raises(RequestError) as err:
+            validation_service.get_valid_request_values_for_create_donor_cases(
+                mock_request
+            )
+
+        # assert
+        assert err.value.args[0].startswith(
+            "2402 is not a valid questionnaire name format."
+        )
+
+    @pytest.mark.parametrize(
+        "resume_token, expected_resume_token",
+        [(None, None), ("", None), ("abc_123-XYZ", "abc_123-XYZ")],
+    )
+    def test_get_valid_request_returns_an_optional_resume_token(
+        self, resume_token, expected_resume_token
+    ):
+        # arrange
+        mock_request = flask.Request.from_values(
+            json={
+                "questionnaire_name": "IPS2402a",
+                "role": "IPS Manager",
+                "resume_token": resume_token,
+            }
+        )
+        validation_service = ValidationService()
+
+        # act
+        result = validation_service.get_valid_request_for_create_donor_cases(
+            mock_request
+        )
+
+        # assert
+        assert result == {
+            "questionnaire_name": "IPS2402a",
+            "role": "IPS Manager",
+            "resume_token": expected_resume_token,
+            "mode": None,
+            "dry_run": None,
+        }
+
+    def test_get_valid_request_rejects_an_invalid_resume_token(self):
+        # arrange
+        mock_request = flask.Request.from_values(
+            json={
+                "questionnaire_name": "IPS2402a",
+                "role": "IPS Manager",
+                "resume_token": "../../etc/passwd",
+            }
+        )
+        validation_service = ValidationService()
+
+        # act
+        with pytest.raises(RequestError) as err:
+            validation_service.get_valid_request_for_create_donor_cases(mock_request)
+
+        # assert
+        assert err.value.args[0] == "../../etc/passwd is not a valid resume token"
+
+    @pytest.mark.parametrize(
+        "extra_values, error_message",
+        [
+            ({"dry_run": True}, "A dry run can only be used in reconcile mode"),
+            (
+                {"mode": "reconcile", "dry_run": "yes"},
+                "yes is not a valid dry_run value, it must be true or false",
+            ),
+            (
+                {"mode": "reconcile", "resume_token": "abc_123"},
+                "A resume token cannot be used in reconcile mode",
+            ),
+        ],
+    )
+    def test_get_valid_request_rejects_invalid_reconcile_options(
+        self, extra_values, error_message
+    ):
+        # arrange
+        mock_request = flask.Request.from_values(
+            json={
+                "questionnaire_name": "IPS2402a",
+                "role": "IPS Manager",
+                **extra_values,
+            }
+        )
+        validation_service = ValidationService()
+
+        # act
+        with pytest.raises(RequestError) as err:
+            validation_service.get_valid_request_for_create_donor_cases(mock_request)
+
+        # assert
+        assert err.value.args[0] == error_message
+
+
+class TestGetValidRolesForSweep:
+    def test_get_valid_roles_for_sweep_defaults_to_every_role_without_a_body(self):
+        # arrange
+        mock_request = flask.Request.from_values(method="GET")
+        validation_service = ValidationService()
+
+        # act
+        result = validation_service.get_valid_roles_for_sweep(mock_request, [])
+
+        # assert
+        assert result == [
+            "IPS Manager",
+            "IPS Field Interviewer",
+            "IPS Pilot Interviewer",
+        ]
+
+    def test_get_valid_roles_for_sweep_prefers_requested_roles_over_configured_roles(
+        self,
+    ):
+        # arrange
+        mock_request = flask.Request.from_values(json={"roles": ["IPS Manager"]})
+        validation_service = ValidationService()
+
+        # act
+        result = validation_service.get_valid_roles_for_sweep(
+            mock_request, ["IPS Field Interviewer"]
+        )
+
+        # assert
+        assert result == ["IPS Manager"]
+
+    @pytest.mark.parametrize(
+        "roles, error_message",
+        [
+            (
+                ["IPS Manager", "Regional Manager"],
+                "['Regional Manager'] are not valid roles. Please choose from the "
+                "following roles: ['IPS Manager', 'IPS Field Interviewer', "
+                "'IPS Pilot Interviewer']",
+            ),
+            ("IPS Manager", "roles must be a list of roles, not 'IPS Manager'"),
+        ],
+    )
+    def test_get_valid_roles_for_sweep_rejects_invalid_roles(
+        self, roles, error_message
+    ):
+        # arrange
+        mock_request = flask.Request.from_values(json={"roles": roles})
+        validation_service = ValidationService()
+
+        # act
+        with pytest.raises(RequestError) as err:
+            validation_service.get_valid_roles_for_sweep(mock_request, [])
+
+        # assert
+        assert err.value.args[0] == error_message
+
+
 class TestValidateConfig:
     def test_validate_config_does_not_raise_an_exception_when_given_valid_config(self):
         # arrange
@@ -396,6 +629,61 @@ class TestValidateConfig:
             error_message,
         ) in caplog.record_tuples
 
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "checkpoint_chunk_size",
+            "checkpoint_ttl_seconds",
+            "admission_queue_timeout_seconds",
+            "profiling_top_n",
+            "profiling_sample_interval_ms",
+        ],
+    )
+    def test_validate_config_raises_a_config_error_when_a_tuning_value_is_not_positive(
+        self, name
+    ):
+        # arrange
+        mock_config = Config(blaise_api_url="foo", blaise_server_park="bar")
+        setattr(mock_config, name, 0)
+
+        # act
+        with pytest.raises(ConfigError) as err:
+            ValidationService.validate_config(mock_config)
+
+        # assert
+        assert err.value.args[0] == (
+            f"Config values must be greater than zero: ['{name}']"
+        )
+
+    def test_validate_config_raises_a_config_error_when_an_admission_limit_is_negative(
+        self,
+    ):
+        # arrange
+        mock_config = Config(blaise_api_url="foo", blaise_server_park="bar")
+        mock_config.admission_donor_cases_max_queue = -1
+
+        # act
+        with pytest.raises(ConfigError) as err:
+            ValidationService.validate_config(mock_config)
+
+        # assert
+        assert err.value.args[0] == (
+            "Config values must not be negative: ['admission_donor_cases_max_queue']"
+        )
+
+    def test_config_from_env_names_a_variable_that_is_not_a_number(self, monkeypatch):
+        # arrange
+        monkeypatch.setenv("PROFILING_TOP_N", "fifteen")
+
+        # act
+        with pytest.raises(ConfigError) as err:
+            Config.from_env()
+
+        # assert
+        assert err.value.args[0] == (
+            "PROFILING_TOP_N must be a whole number, not 'fifteen'"
+        )
+
 
 class TestValidateQuestionnaireExists:
     @mock.patch.object(blaise_restapi.Client, "questionnaire_exists_on_server_park")
@@ -0,0 +1,72 @@
+from unittest import mock
+
+import blaise_restapi
+import pytest
+
+from appconfig.config import Config
+from services.blaise_service import BlaiseService
+from services.warmup_service import WarmupService
+from tests.helpers import get_default_config
+from utilities.custom_exceptions import BlaiseError
+
+
+@pytest.fixture()
+def config() -> Config:
+    return get_default_config()
+
+
+@pytest.fixture()
+def blaise_service(config) -> BlaiseService:
+    return BlaiseService(config=config)
+
+
+@pytest.fixture()
+def questionnaires() -> list[dict]:
+    return [
+        {"name": "IPS2402a", "id": "guid-1", "status": "Active"},
+        {"name": "IPS2401a", "id": "guid-2", "status": "Inactive"},
+        {"name": "LMS2309_GO1", "id": "guid-3", "status": "Active"},
+    ]
+
+
+class TestWarmUp:
+    @mock.patch.object(blaise_restapi.Client, "get_questionnaire_for_server_park")
+    @mock.patch.object(blaise_restapi.Client, "get_all_questionnaires_for_server_park")
+    @mock.patch.object(blaise_restapi.Client, "get_users")
+    def test_warm_up_preloads_users_and_active_questionnaires(
+        self,
+        mock_rest_api_get_users,
+        mock_get_all_questionnaires,
+        mock_get_questionnaire,
+        blaise_service,
+        mock_get_users,
+        questionnaires,
+    ):
+        # arrange
+        mock_rest_api_get_users.return_value = mock_get_users
+        mock_get_all_questionnaires.return_value = questionnaires
+
+        # act
+        summary = WarmupService(blaise_service).warm_up("gusty")
+        users = blaise_service.get_users("gusty")
+        questionnaire = blaise_service.get_questionnaire("gusty", "IPS2402a")
+
+        # assert
+        assert summary["users"] == 2
+        assert summary["active_questionnaires"] == ["IPS2402a"]
+        assert users == mock_get_users
+        assert questionnaire["id"] == "guid-1"
+        mock_rest_api_get_users.assert_called_once()
+        mock_get_all_questionnaires.assert_called_once_with("gusty")
+        mock_get_questionnaire.assert_not_called()
+
+    @mock.patch.object(blaise_restapi.Client, "get_users")
+    def test_warm_up_raises_a_blaise_error_when_the_users_cannot_be_fetched(
+        self, mock_rest_api_get_users, blaise_service
+    ):
+        # arrange
+        mock_rest_api_get_users.side_effect = Exception("Dunder Mifflin is unavailable")
+
+        # act & assert
+        with pytest.raises(BlaiseError, match="Dunder Mifflin is unavailable"):
+            WarmupService(blaise_service).warm_up("gusty")
@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+from unittest import mock
+
+import pytest
+
+from appconfig.config import Config
+from cli import run
+from tests.fake_blaise_api import FakeBlaiseRestApiClient
+
+
+@pytest.fixture(autouse=True)
+def fake_blaise_api():
+    fake_client = FakeBlaiseRestApiClient(
+        users=[
+            {"name": "jim", "role": "IPS Field Interviewer"},
+            {"name": "pam", "role": "IPS Field Interviewer"},
+        ],
+        questionnaires=[
+            {"name": "IPS2403a", "id": "some-guid", "serverParkName": "gusty"}
+        ],
+    )
+    fake_client.cases = [
+        {"mainSurveyID": "some-guid", "id": "jim", "cmA_IsDonorCase": "1"},
+    ]
+    with mock.patch(
+        "appconfig.config.Config.from_env",
+        return_value=Config(
+            blaise_api_url="foo", blaise_server_park="gusty", checkpoint_store="none"
+        ),
+    ), mock.patch(
+        "utilities.blaise_cassette.blaise_restapi.Client",
+        return_value=fake_client,
+    ):
+        yield fake_client
+
+
+class TestCli:
+    def test_create_writes_json_results_and_a_throughput_summary(self, fake_blaise_api):
+        # Arrange
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        # Act
+        exit_code = run(
+            ["--progress", "create", "IPS2403a", "--role", "IPS Field Interviewer"],
+            stdout,
+            stderr,
+        )
+
+        # Assert
+        assert exit_code == 0
+        report = json.loads(stdout.getvalue())
+        assert report["status_counts"] == {"created": 1, "skipped": 1}
+        assert [result["user"] for result in report["results"]] == ["jim", "pam"]
+        assert "[2/2] 100.0%" in stderr.getvalue()
+        assert "Create processed 2 users in " in stderr.getvalue()
+
+    def test_list_writes_csv_results_to_the_output_file(self, tmp_path):
+        # Arrange
+        output_file = tmp_path / "results.csv"
+        users_file = tmp_path / "users.txt"
+        users_file.write_text("jim\npam\n\n")
+
+        # Act
+        exit_code = run(
+            [
+                "--output",
+                "csv",
+                "--output-file",
+                str(output_file),
+                "list",
+                "IPS2403a",
+                "--users-file",
+                str(users_file),
+            ],
+            io.StringIO(),
+            io.StringIO(),
+        )
+
+        # Assert
+        assert exit_code == 0
+        rows = list(csv.DictReader(output_file.open()))
+        assert [(row["user"], row["status"], row["case_ids"]) for row in rows] == [
+            ("jim", "exists", "jim"),
+            ("pam", "missing", ""),
+        ]
+
+    def test_reissue_exits_with_1_when_a_user_fails(self):
+        # Arrange
+        stdout = io.StringIO()
+
+        # Act
+        exit_code = run(
+            ["reissue", "IPS2403a", "--users", "pam"], stdout, io.StringIO()
+        )
+
+        # Assert
+        assert exit_code == 1
+        assert json.loads(stdout.getvalue())["status_counts"] == {"failed": 1}
+
+    def test_run_reports_errors_reading_the_questionnaire(self):
+        # Arrange
+        stderr = io.StringIO()
+
+        # Act
+        exit_code = run(["create", "IPS2499a", "--users", "jim"], io.StringIO(), stderr)
+
+        # Assert
+        assert exit_code == 1
+        assert stderr.getvalue().startswith("Error running create: ")
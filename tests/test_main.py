@@ -1,5 +1,9 @@
 import logging
-from typing import Any
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, cast
 from unittest import mock
 
 import blaise_restapi
@@ -7,8 +11,25 @@ import flask
 import pytest
 
 from appconfig.config import Config
-from main import create_donor_cases, get_users_by_role, reissue_new_donor_case
+from main import (
+    create_donor_cases,
+    create_donor_cases_shard,
+    diagnostics,
+    get_users_by_role,
+    reissue_new_donor_case,
+    sweep_donor_cases,
+    warm_up,
+    warm_up_on_instance_start,
+)
+from models.checkpoint_model import Checkpoint
+from models.donor_case_creation_result import DonorCaseCreationResult
 from models.donor_case_model import DonorCaseModel
+from tests.fake_blaise_api import FakeBlaiseRestApiClient
+from tests.helpers import assert_blaise_call_budget
+from utilities.admission_control import get_admission_controller
+from utilities.blaise_call_counter import get_blaise_call_stats
+from utilities.blaise_cassette import get_blaise_client, load_interactions
+from utilities.checkpoint_store import LocalFileCheckpointStore
 from utilities.custom_exceptions import (
     BlaiseError,
     DonorCaseError,
@@ -16,6 +37,7 @@ from utilities.custom_exceptions import (
     UsersError,
     UsersWithRoleNotFound,
 )
+from utilities.tracing import tracer
 
 
 class MockRequest:
@@ -571,8 +593,13 @@ class TestMainCreateDonorCasesHandleUsersStep:
     @mock.patch.object(blaise_restapi.Client, "questionnaire_exists_on_server_park")
     @mock.patch("services.guid_service.GUIDService.get_guid")
     @mock.patch("services.user_service.UserService.get_users_by_role")
+    @mock.patch(
+        "services.blaise_service.BlaiseService.get_all_existing_donor_cases",
+        return_value=[],
+    )
     def test_create_donor_case_returns_message_and_404_status_code_when_the_get_users_service_raises_a_blaise_error_exception(
         self,
+        _mock_get_all_existing_donor_cases,
         mock_get_users,
         mock_get_guid,
         mock_questionnaire_exists_on_server_park,
@@ -607,8 +634,13 @@ class TestMainCreateDonorCasesHandleUsersStep:
     @mock.patch.object(blaise_restapi.Client, "questionnaire_exists_on_server_park")
     @mock.patch("services.guid_service.GUIDService.get_guid")
     @mock.patch("services.user_service.UserService.get_users_by_role")
+    @mock.patch(
+        "services.blaise_service.BlaiseService.get_all_existing_donor_cases",
+        return_value=[],
+    )
     def test_create_donor_case_returns_message_and_500_status_code_when_the_get_users_service_raises_a_users_error_exception(
         self,
+        _mock_get_all_existing_donor_cases,
         mock_get_users,
         mock_get_guid,
         mock_questionnaire_exists_on_server_park,
@@ -643,8 +675,13 @@ class TestMainCreateDonorCasesHandleUsersStep:
     @mock.patch.object(blaise_restapi.Client, "questionnaire_exists_on_server_park")
     @mock.patch("services.guid_service.GUIDService.get_guid")
     @mock.patch("services.user_service.UserService.get_users_by_role")
+    @mock.patch(
+        "services.blaise_service.BlaiseService.get_all_existing_donor_cases",
+        return_value=[],
+    )
     def test_create_donor_case_returns_message_and_422_status_code_when_the_get_users_service_raises_a_no_users_found_with_role_exception(
         self,
+        _mock_get_all_existing_donor_cases,
         mock_get_users,
         mock_get_guid,
         mock_questionnaire_exists_on_server_park,
@@ -688,8 +725,13 @@ class TestMainCreateDonorCasesHandleDonorCasesStep:
     @mock.patch(
         "services.donor_case_service.DonorCaseService.check_and_create_donor_case_for_users"
     )
+    @mock.patch(
+        "services.blaise_service.BlaiseService.get_all_existing_donor_cases",
+        return_value=[],
+    )
     def test_create_donor_case_returns_message_and_500_status_code_when_the_check_and_create_donor_case_for_users_service_raises_an_exception(
         self,
+        _mock_get_all_existing_donor_cases,
         mock_create_donor_case_for_users,
         mock_get_users,
         mock_get_guid,
@@ -1481,7 +1523,9 @@ class TestMainGetUsersByRoleHandleRequestStep:
         result = get_users_by_role(mock_request)
 
         # Assert
-        mock_get_users.assert_called_with(mock_config.return_value.blaise_server_park)
+        mock_get_users.assert_called_with(
+            mock_config.return_value.blaise_server_park, fresh=False
+        )
         assert len(result) == 2
         assert len(result[0]) == 1
         assert result[0][0] == "billy"
@@ -1532,7 +1576,9 @@ class TestMainGetUsersByRoleHandleRequestStep:
         result = get_users_by_role(mock_request)
 
         # Assert
-        mock_get_users.assert_called_with(mock_config.return_value.blaise_server_park)
+        mock_get_users.assert_called_with(
+            mock_config.return_value.blaise_server_park, fresh=False
+        )
         assert len(result) == 2
         assert len(result[0]) == 1
         assert result[0][0] == "rich"
@@ -1589,7 +1635,9 @@ class TestMainGetUsersByRoleHandleRequestStep:
         result = get_users_by_role(mock_request)
 
         # Assert
-        mock_get_users.assert_called_with(mock_config.return_value.blaise_server_park)
+        mock_get_users.assert_called_with(
+            mock_config.return_value.blaise_server_park, fresh=False
+        )
         assert len(result) == 2
         assert len(result[0]) == 1
         assert result[0][0] == "jean"
@@ -1699,7 +1747,1279 @@ class TestMainGetUsersByRoleHandleRequestStep:
         result = get_users_by_role(mock_request)
 
         # Assert
-        mock_get_users.assert_called_with(mock_config.return_value.blaise_server_park)
+        mock_get_users.assert_called_with(
+            mock_config.return_value.blaise_server_park, fresh=False
+        )
         assert len(result) == 2
         assert len(result[0]) == 0
         assert result[1] == 200
+
+
+class TestMainTracing:
+    @mock.patch("appconfig.config.Config.from_env")
+    @mock.patch("services.blaise_service.BlaiseService.get_users")
+    def test_get_users_by_role_records_a_span_for_each_handler_phase(
+        self,
+        mock_get_users,
+        mock_config,
+    ):
+        # Arrange
+        mock_request = flask.Request.from_values(json={"role": "IPS Manager"})
+        mock_config.return_value = Config(
+            blaise_api_url="foo", blaise_server_park="bar"
+        )
+        mock_get_users.return_value = [
+            {"name": "rich", "role": "IPS Manager"},
+            {"name": "sarah", "role": "DST"},
+        ]
+        tracer.in_memory_exporter.clear()
+
+        # Act
+        get_users_by_role(mock_request)
+
+        # Assert
+        spans = {
+            span.name: span for span in tracer.in_memory_exporter.get_finished_spans()
+        }
+        assert set(spans) == {
+            "get_users_by_role",
+            "request_handler",
+            "config_handler",
+            "user_handler",
+        }
+        root_span = spans["get_users_by_role"]
+        assert root_span.attributes["http.status_code"] == 200
+        assert spans["user_handler"].parent_span_id == root_span.span_id
+        assert spans["user_handler"].attributes["users.with_role_count"] == 1
+
+
+class TestMainCreateDonorCasesDeadline:
+    @mock.patch("appconfig.config.Config.from_env")
+    @mock.patch.object(blaise_restapi.Client, "questionnaire_exists_on_server_park")
+    @mock.patch("services.blaise_service.BlaiseService.get_questionnaire")
+    @mock.patch("services.blaise_service.BlaiseService.get_users")
+    @mock.patch(
+        "services.donor_case_service.DonorCaseService.check_and_create_donor_case_for_users"
+    )
+    @mock.patch(
+        "services.blaise_service.BlaiseService.get_all_existing_donor_cases",
+        return_value=[],
+    )
+    def test_create_donor_case_returns_partial_result_and_202_status_code_when_the_deadline_is_reached(
+        self,
+        _mock_get_all_existing_donor_cases,
+        mock_check_and_create_donor_case_for_users,
+        mock_get_users,
+        mock_get_questionnaire,
+        _mock_questionnaire_exists_on_server_park,
+        mock_config,
+    ):
+        # Arrange
+        mock_request = flask.Request.from_values(
+            json={"questionnaire_name": "IPS2402a", "role": "IPS Manager"}
+        )
+        mock_config.return_value = Config(
+            blaise_api_url="foo",
+            blaise_server_park="bar",
+            request_deadline_seconds=60,
+            deadline_margin_seconds=5,
+        )
+        mock_get_questionnaire.return_value = {"id": "some-guid"}
+        mock_get_users.return_value = [
+            {"name": "rich", "role": "IPS Manager"},
+            {"name": "sarah", "role": "IPS Manager"},
+            {"name": "james", "role": "IPS Manager"},
+        ]
+        mock_check_and_create_donor_case_for_users.return_value = (
+            DonorCaseCreationResult(
+                created=["rich"],
+                skipped=["sarah"],
+                remaining=["james"],
+                deadline_exceeded=True,
+                resume_token="abc123",
+            )
+        )
+
+        # Act
+        result = create_donor_cases(mock_request)
+
+        # Assert
+        assert result == (
+            "Partially created donor cases for user role: IPS Manager before the request deadline. "
+            "Created: 1, skipped: 1, remaining: 1. Resume token: abc123. "
+            "The checkpoint is held in memory, so only this instance can resume it",
+            202,
+        )
+        deadline = mock_check_and_create_donor_case_for_users.call_args[0][3]
+        assert deadline.budget_seconds == 55
+
+    def test_create_donor_case_stops_before_the_prefetch_reads_once_the_deadline_has_passed(
+        self,
+    ):
+        # Arrange
+        fake_client = FakeBlaiseRestApiClient(
+            users=[{"name": "rich", "role": "IPS Manager"}],
+            questionnaires=[
+                {"name": "IPS2402a", "id": "some-guid", "serverParkName": "bar"}
+            ],
+        )
+        mock_request = flask.Request.from_values(
+            json={"questionnaire_name": "IPS2402a", "role": "IPS Manager"}
+        )
+
+        # Act
+        with mock.patch(
+            "appconfig.config.Config.from_env",
+            return_value=Config(
+                blaise_api_url="foo",
+                blaise_server_park="bar",
+                request_deadline_seconds=5,
+                deadline_margin_seconds=5,
+            ),
+        ), mock.patch(
+            "utilities.blaise_cassette.blaise_restapi.Client",
+            return_value=fake_client,
+        ):
+            _, status_code = create_donor_cases(mock_request)
+
+        # Assert
+        assert status_code == 504
+        assert "get_questionnaire_for_server_park" not in fake_client.calls
+        assert "get_users" not in fake_client.calls
+
+
+class TestMainCreateDonorCasesResume:
+    @mock.patch("appconfig.config.Config.from_env")
+    @mock.patch.object(blaise_restapi.Client, "questionnaire_exists_on_server_park")
+    @mock.patch("services.blaise_service.BlaiseService.get_questionnaire")
+    @mock.patch("services.blaise_service.BlaiseService.get_users")
+    @mock.patch("services.blaise_service.BlaiseService.get_all_existing_donor_cases")
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    def test_create_donor_case_resumes_from_a_checkpoint_without_fetching_users_or_cases(
+        self,
+        mock_create_donor_case_for_user,
+        mock_get_all_existing_donor_cases,
+        mock_get_users,
+        mock_get_questionnaire,
+        _mock_questionnaire_exists_on_server_park,
+        mock_config,
+        tmp_path,
+    ):
+        # Arrange
+        mock_config.return_value = Config(
+            blaise_api_url="foo",
+            blaise_server_park="bar",
+            checkpoint_store="file",
+            checkpoint_dir=str(tmp_path),
+        )
+        checkpoint = Checkpoint(
+            "IPS2402a",
+            "IPS Manager",
+            "some-guid",
+            pending_users=["rich", "sarah"],
+            cursor=1,
+            users_done=["rich"],
+        )
+        LocalFileCheckpointStore(str(tmp_path)).save(checkpoint)
+        mock_request = flask.Request.from_values(
+            json={
+                "questionnaire_name": "IPS2402a",
+                "role": "IPS Manager",
+                "resume_token": checkpoint.resume_token,
+            }
+        )
+
+        # Act
+        result = create_donor_cases(mock_request)
+
+        # Assert
+        assert result == (
+            "Successfully created donor cases for user role: IPS Manager",
+            200,
+        )
+        mock_get_questionnaire.assert_not_called()
+        mock_get_users.assert_not_called()
+        mock_get_all_existing_donor_cases.assert_not_called()
+        mock_create_donor_case_for_user.assert_called_once()
+        assert mock_create_donor_case_for_user.call_args[0][0].user == "sarah"
+
+    @mock.patch("appconfig.config.Config.from_env")
+    @mock.patch.object(blaise_restapi.Client, "questionnaire_exists_on_server_park")
+    def test_create_donor_case_returns_422_status_code_for_an_unknown_resume_token(
+        self,
+        _mock_questionnaire_exists_on_server_park,
+        mock_config,
+        tmp_path,
+    ):
+        # Arrange
+        mock_config.return_value = Config(
+            blaise_api_url="foo",
+            blaise_server_park="bar",
+            checkpoint_dir=str(tmp_path),
+        )
+        mock_request = flask.Request.from_values(
+            json={
+                "questionnaire_name": "IPS2402a",
+                "role": "IPS Manager",
+                "resume_token": "unknown",
+            }
+        )
+
+        # Act
+        result = create_donor_cases(mock_request)
+
+        # Assert
+        assert result == (
+            "Error creating IPS donor cases: No checkpoint found for resume token 'unknown' "
+            "with questionnaire IPS2402a and role IPS Manager",
+            422,
+        )
+
+
+class TestMainCreateDonorCasesCoalescing:
+    @mock.patch("appconfig.config.Config.from_env")
+    @mock.patch.object(blaise_restapi.Client, "questionnaire_exists_on_server_park")
+    @mock.patch("services.blaise_service.BlaiseService.get_questionnaire")
+    @mock.patch("services.blaise_service.BlaiseService.get_users")
+    @mock.patch(
+        "services.donor_case_service.DonorCaseService.check_and_create_donor_case_for_users"
+    )
+    @mock.patch(
+        "services.blaise_service.BlaiseService.get_all_existing_donor_cases",
+        return_value=[],
+    )
+    def test_create_donor_case_runs_once_for_identical_concurrent_requests(
+        self,
+        _mock_get_all_existing_donor_cases,
+        mock_check_and_create_donor_case_for_users,
+        mock_get_users,
+        mock_get_questionnaire,
+        _mock_questionnaire_exists_on_server_park,
+        mock_config,
+    ):
+        # Arrange
+        mock_config.return_value = Config(
+            blaise_api_url="foo", blaise_server_park="bar"
+        )
+        mock_get_questionnaire.return_value = {"id": "some-guid"}
+        mock_get_users.return_value = [{"name": "rich", "role": "IPS Manager"}]
+
+        def slow_check_and_create(*_args, **_kwargs):
+            time.sleep(0.2)
+            return DonorCaseCreationResult(created=["rich"])
+
+        mock_check_and_create_donor_case_for_users.side_effect = slow_check_and_create
+        started = threading.Barrier(4)
+
+        def send_request():
+            started.wait()
+            return create_donor_cases(
+                flask.Request.from_values(
+                    json={"questionnaire_name": "IPS2402a", "role": "IPS Manager"}
+                )
+            )
+
+        # Act
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: send_request(), range(4)))
+
+        # Assert
+        assert (
+            results
+            == [("Successfully created donor cases for user role: IPS Manager", 200)]
+            * 4
+        )
+        mock_get_users.assert_called_once()
+        mock_check_and_create_donor_case_for_users.assert_called_once()
+
+    @mock.patch("appconfig.config.Config.from_env")
+    @mock.patch.object(blaise_restapi.Client, "questionnaire_exists_on_server_park")
+    @mock.patch("services.blaise_service.BlaiseService.get_questionnaire")
+    @mock.patch("services.blaise_service.BlaiseService.get_users")
+    @mock.patch(
+        "services.donor_case_service.DonorCaseService.check_and_create_donor_case_for_users"
+    )
+    @mock.patch(
+        "services.blaise_service.BlaiseService.get_all_existing_donor_cases",
+        return_value=[],
+    )
+    def test_create_donor_case_requests_joining_a_running_one_do_not_use_an_admission_slot(
+        self,
+        _mock_get_all_existing_donor_cases,
+        mock_check_and_create_donor_case_for_users,
+        mock_get_users,
+        mock_get_questionnaire,
+        _mock_questionnaire_exists_on_server_park,
+        mock_config,
+    ):
+        # Arrange
+        mock_config.return_value = Config(
+            blaise_api_url="foo",
+            blaise_server_park="bar",
+            admission_donor_cases_max_concurrent=1,
+            admission_donor_cases_max_queue=0,
+        )
+        mock_get_questionnaire.return_value = {"id": "some-guid"}
+        mock_get_users.return_value = [{"name": "rich", "role": "IPS Manager"}]
+        running = threading.Event()
+
+        def slow_check_and_create(*_args, **_kwargs):
+            running.set()
+            time.sleep(0.2)
+            return DonorCaseCreationResult(created=["rich"])
+
+        mock_check_and_create_donor_case_for_users.side_effect = slow_check_and_create
+
+        def send_request():
+            return create_donor_cases(
+                flask.Request.from_values(
+                    json={"questionnaire_name": "IPS2402a", "role": "IPS Manager"}
+                )
+            )
+
+        # Act
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            first = executor.submit(send_request)
+            running.wait()
+            second = send_request()
+
+        # Assert
+        assert first.result() == second
+        assert second == (
+            "Successfully created donor cases for user role: IPS Manager",
+            200,
+        )
+        mock_check_and_create_donor_case_for_users.assert_called_once()
+
+
+class TestMainWarmUp:
+    @mock.patch("appconfig.config.Config.from_env")
+    @mock.patch.object(blaise_restapi.Client, "get_all_questionnaires_for_server_park")
+    @mock.patch.object(blaise_restapi.Client, "get_users")
+    def test_warm_up_returns_a_summary_and_200_status_code(
+        self, mock_get_users, mock_get_all_questionnaires, mock_config
+    ):
+        # Arrange
+        mock_config.return_value = Config(
+            blaise_api_url="foo", blaise_server_park="bar"
+        )
+        mock_get_users.return_value = [{"name": "rich", "role": "IPS Manager"}]
+        mock_get_all_questionnaires.return_value = [
+            {"name": "IPS2402a", "id": "some-guid", "status": "Active"}
+        ]
+
+        # Act
+        summary, status_code = warm_up(flask.Request.from_values())
+
+        # Assert
+        assert status_code == 200
+        assert summary["users"] == 1
+        assert summary["active_questionnaires"] == ["IPS2402a"]
+
+    @mock.patch("appconfig.config.Config.from_env")
+    def test_warm_up_returns_message_and_400_status_code_when_config_is_missing(
+        self, mock_config
+    ):
+        # Arrange
+        mock_config.return_value = Config(blaise_api_url="", blaise_server_park="bar")
+
+        # Act
+        result = warm_up(flask.Request.from_values())
+
+        # Assert
+        assert result == (
+            "Error warming up instance: Missing required values from config: ['blaise_api_url']",
+            400,
+        )
+
+    @mock.patch("main._warm_up_instance")
+    def test_warm_up_on_instance_start_only_runs_when_enabled(
+        self, mock_warm_up_instance, monkeypatch
+    ):
+        # Act
+        monkeypatch.delenv("WARMUP_ON_START", raising=False)
+        warm_up_on_instance_start()
+        monkeypatch.setenv("WARMUP_ON_START", "true")
+        warm_up_on_instance_start()
+
+        # Assert
+        mock_warm_up_instance.assert_called_once()
+
+
+class TestMainCreateDonorCasesOrchestrate:
+    @mock.patch("appconfig.config.Config.from_env")
+    @mock.patch.object(blaise_restapi.Client, "questionnaire_exists_on_server_park")
+    @mock.patch("services.blaise_service.BlaiseService.get_questionnaire")
+    @mock.patch("services.blaise_service.BlaiseService.get_users")
+    @mock.patch("services.blaise_service.BlaiseService.get_all_existing_donor_cases")
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    def test_create_donor_case_shards_users_across_workers_in_orchestrate_mode(
+        self,
+        mock_create_donor_case_for_user,
+        mock_get_all_existing_donor_cases,
+        mock_get_users,
+        mock_get_questionnaire,
+        _mock_questionnaire_exists_on_server_park,
+        mock_config,
+    ):
+        # Arrange
+        mock_config.return_value = Config(
+            blaise_api_url="foo", blaise_server_park="bar", orchestrator_shard_size=2
+        )
+        mock_get_questionnaire.return_value = {"id": "some-guid"}
+        mock_get_users.return_value = [
+            {"name": name, "role": "IPS Manager"}
+            for name in ["rich", "sarah", "james", "billy", "john"]
+        ]
+        mock_get_all_existing_donor_cases.return_value = ["rich"]
+        mock_request = flask.Request.from_values(
+            json={
+                "questionnaire_name": "IPS2402a",
+                "role": "IPS Manager",
+                "mode": "orchestrate",
+            }
+        )
+
+        # Act
+        result = create_donor_cases(mock_request)
+
+        # Assert
+        assert result == (
+            "Successfully created donor cases for user role: IPS Manager. "
+            "Shards: 2, failed shards: 0, created: 4, skipped: 1, remaining: 0",
+            200,
+        )
+        assert sorted(
+            call[0][0].user for call in mock_create_donor_case_for_user.call_args_list
+        ) == ["billy", "james", "john", "sarah"]
+
+    def test_create_donor_case_rejects_a_resume_token_in_orchestrate_mode(self):
+        # Arrange
+        mock_request = flask.Request.from_values(
+            json={
+                "questionnaire_name": "IPS2402a",
+                "role": "IPS Manager",
+                "mode": "orchestrate",
+                "resume_token": "abc123",
+            }
+        )
+
+        # Act
+        result = create_donor_cases(mock_request)
+
+        # Assert
+        assert result == (
+            "Error creating IPS donor cases: A resume token cannot be used in orchestrate mode",
+            400,
+        )
+
+
+class TestMainCreateDonorCasesShard:
+    @mock.patch("appconfig.config.Config.from_env")
+    @mock.patch("services.blaise_service.BlaiseService.create_donor_case_for_user")
+    def test_create_donor_cases_shard_returns_the_shard_result(
+        self, mock_create_donor_case_for_user, mock_config
+    ):
+        # Arrange
+        mock_config.return_value = Config(
+            blaise_api_url="foo", blaise_server_park="bar"
+        )
+        mock_request = flask.Request.from_values(
+            json={
+                "questionnaire_name": "IPS2402a",
+                "guid": "some-guid",
+                "role": "IPS Manager",
+                "shard_index": 0,
+                "shard_count": 1,
+                "users": ["rich", "sarah"],
+            }
+        )
+
+        # Act
+        body, status_code = create_donor_cases_shard(mock_request)
+
+        # Assert
+        assert status_code == 200
+        assert sorted(body["created"]) == ["rich", "sarah"]
+        assert body["status"] == "complete"
+
+    def test_create_donor_cases_shard_returns_400_status_code_for_an_invalid_shard(
+        self,
+    ):
+        # Arrange
+        mock_request = flask.Request.from_values(
+            json={
+                "questionnaire_name": "IPS2402a",
+                "guid": "some-guid",
+                "role": "IPS Manager",
+                "shard_index": -1,
+                "shard_count": 1,
+                "users": "rich",
+            }
+        )
+
+        # Act
+        result = create_donor_cases_shard(mock_request)
+
+        # Assert
+        assert result == (
+            "Error creating IPS donor cases shard: -1 is not a valid shard_index; "
+            "users must be a list of usernames",
+            400,
+        )
+
+
+class TestMainAdmissionControl:
+    @mock.patch("appconfig.config.Config.from_env")
+    @mock.patch("services.blaise_service.BlaiseService.get_users")
+    def test_create_donor_cases_returns_429_with_retry_after_while_get_users_by_role_is_still_admitted(
+        self, mock_get_users, mock_config
+    ):
+        # Arrange
+        mock_config.return_value = Config(
+            blaise_api_url="foo",
+            blaise_server_park="bar",
+            admission_donor_cases_max_concurrent=1,
+            admission_donor_cases_max_queue=0,
+        )
+        mock_get_users.return_value = [{"name": "rich", "role": "IPS Manager"}]
+        donor_cases_controller = get_admission_controller("donor_cases", 1, 0, 10.0)
+
+        # Act
+        with donor_cases_controller.admit():
+            create_result = create_donor_cases(
+                flask.Request.from_values(
+                    json={"questionnaire_name": "IPS2402a", "role": "IPS Manager"}
+                )
+            )
+            users_result = get_users_by_role(
+                flask.Request.from_values(json={"role": "IPS Manager"})
+            )
+
+        # Assert
+        body, status_code, headers = create_result
+        assert status_code == 429
+        assert body == (
+            "Error creating IPS donor cases: Too many concurrent donor_cases requests "
+            "on this instance, the wait queue is full"
+        )
+        assert headers["Retry-After"] == "1"
+        assert users_result == (["rich"], 200)
+
+
+class TestMainDiagnostics:
+    @mock.patch("appconfig.config.Config.from_env")
+    @mock.patch.object(blaise_restapi.Client, "get_users")
+    def test_diagnostics_reports_cache_latency_and_in_flight_state(
+        self, mock_get_users, mock_config
+    ):
+        # Arrange
+        mock_config.return_value = Config(
+            blaise_api_url="foo", blaise_server_park="bar"
+        )
+        mock_get_users.return_value = [{"name": "rich", "role": "IPS Manager"}]
+        get_users_by_role(MockRequest({"role": "IPS Manager"}))
+        get_users_by_role(MockRequest({"role": "IPS Manager"}))
+
+        # Act
+        report, status_code = diagnostics(flask.Request.from_values())
+
+        # Assert
+        assert status_code == 200
+        assert report["ready"] is True
+        assert report["blaise_client"]["connection_pool"] is None
+        users_cache = next(
+            cache for cache in report["caches"] if cache["name"] == "blaise_users"
+        )
+        assert users_cache["size"] == 1
+        assert users_cache["hit_rate"] == 0.5
+        assert report["blaise_latency"]["blaise.get_users"]["samples"] == 2
+        assert report["handler_latency"]["get_users_by_role"]["samples"] == 2
+        assert report["in_flight_requests"]["get_users_by_role"] == {
+            "in_flight": 0,
+            "queued": 0,
+        }
+        assert report["instance"]["uptime_seconds"] >= 0
+
+    @mock.patch("appconfig.config.Config.from_env")
+    def test_diagnostics_returns_503_status_code_when_config_is_missing(
+        self, mock_config
+    ):
+        # Arrange
+        mock_config.return_value = Config(blaise_api_url="", blaise_server_park="bar")
+
+        # Act
+        report, status_code = diagnostics(flask.Request.from_values())
+
+        # Assert
+        assert status_code == 503
+        assert report["ready"] is False
+        assert report["not_ready_reason"] == (
+            "Missing required values from config: ['blaise_api_url']"
+        )
+
+
+CREATE_DONOR_CASES_CASSETTE = os.path.join(
+    os.path.dirname(__file__),
+    "cassettes",
+    "create_donor_cases_ips_field_interviewer.jsonl",
+)
+
+
+class TestMainCreateDonorCasesCassetteReplay:
+    @staticmethod
+    def replay_config(replay_latency: bool) -> Config:
+        return Config(
+            blaise_api_url="blaise_api_url",
+            blaise_server_park="gusty",
+            blaise_cassette_mode="replay",
+            blaise_cassette_path=CREATE_DONOR_CASES_CASSETTE,
+            blaise_cassette_replay_latency=replay_latency,
+            # Only the recorded latency should shape the replay
+            blaise_write_rate_limit=1000,
+            blaise_write_burst=1000,
+        )
+
+    @mock.patch("appconfig.config.Config.from_env")
+    def test_create_donor_cases_makes_exactly_the_recorded_blaise_calls(
+        self, mock_config
+    ):
+        # Arrange
+        mock_config.return_value = self.replay_config(replay_latency=False)
+        mock_request = MockRequest(
+            {"questionnaire_name": "IPS2403a", "role": "IPS Field Interviewer"}
+        )
+
+        # Act
+        result = create_donor_cases(mock_request)
+
+        # Assert
+        assert result == (
+            "Successfully created donor cases for user role: IPS Field Interviewer",
+            200,
+        )
+        assert get_blaise_client(mock_config.return_value).unused_interactions == []
+
+    @mock.patch("appconfig.config.Config.from_env")
+    def test_create_donor_cases_overlaps_recorded_write_latency(self, mock_config):
+        # Arrange
+        mock_config.return_value = self.replay_config(replay_latency=True)
+        mock_request = MockRequest(
+            {"questionnaire_name": "IPS2403a", "role": "IPS Field Interviewer"}
+        )
+        serial_seconds = (
+            sum(
+                interaction["duration_ms"]
+                for interaction in load_interactions(CREATE_DONOR_CASES_CASSETTE)
+            )
+            / 1000
+        )
+
+        # Act
+        start_time = time.perf_counter()
+        _, status_code = create_donor_cases(mock_request)
+        elapsed_seconds = time.perf_counter() - start_time
+
+        # Assert
+        assert status_code == 200
+        assert elapsed_seconds < serial_seconds * 0.75
+
+
+BUDGET_GUID = "7bded891-3aa6-41b2-824b-0be514018806"
+
+
+class TestMainBlaiseCallBudgets:
+    @pytest.fixture(autouse=True)
+    def fake_blaise_api(self):
+        fake_client = FakeBlaiseRestApiClient(
+            users=[
+                {"name": name, "role": "IPS Field Interviewer"}
+                for name in ("jim", "pam", "dwight")
+            ],
+            questionnaires=[
+                {
+                    "name": "IPS2403a",
+                    "id": BUDGET_GUID,
+                    "serverParkName": "gusty",
+                    "status": "Active",
+                }
+            ],
+        )
+        fake_client.cases = [
+            {"mainSurveyID": BUDGET_GUID, "id": "jim", "cmA_IsDonorCase": "1"}
+        ]
+        with mock.patch(
+            "appconfig.config.Config.from_env",
+            return_value=Config(blaise_api_url="foo", blaise_server_park="gusty"),
+        ), mock.patch(
+            "utilities.blaise_cassette.blaise_restapi.Client",
+            return_value=fake_client,
+        ):
+            yield fake_client
+
+    @pytest.mark.parametrize(
+        "handler, request_json, max_reads, max_writes",
+        [
+            (
+                create_donor_cases,
+                {"questionnaire_name": "IPS2403a", "role": "IPS Field Interviewer"},
+                4,
+                2,
+            ),
+            (
+                create_donor_cases,
+                {
+                    "questionnaire_name": "IPS2403a",
+                    "role": "IPS Field Interviewer",
+                    "mode": "orchestrate",
+                },
+                4,
+                2,
+            ),
+            (
+                create_donor_cases_shard,
+                {
+                    "questionnaire_name": "IPS2403a",
+                    "guid": BUDGET_GUID,
+                    "role": "IPS Field Interviewer",
+                    "shard_index": 0,
+                    "shard_count": 1,
+                    "users": ["pam", "dwight"],
+                },
+                0,
+                2,
+            ),
+            (
+                reissue_new_donor_case,
+                {"questionnaire_name": "IPS2403a", "user": "jim"},
+                4,
+                1,
+            ),
+            (get_users_by_role, {"role": "IPS Field Interviewer"}, 1, 0),
+        ],
+    )
+    def test_handler_stays_within_its_blaise_call_budget(
+        self, handler, request_json, max_reads, max_writes
+    ):
+        # Act
+        with assert_blaise_call_budget(max_reads, max_writes):
+            result = handler(MockRequest(request_json))
+
+        # Assert
+        assert result[1] == 200
+
+    def test_warm_up_stays_within_its_blaise_call_budget(self):
+        # Act
+        with assert_blaise_call_budget(max_reads=2):
+            _, status_code = warm_up(flask.Request.from_values())
+
+        # Assert
+        assert status_code == 200
+
+    def test_diagnostics_makes_no_blaise_calls(self):
+        # Act
+        with assert_blaise_call_budget(max_reads=0):
+            _, status_code = diagnostics(flask.Request.from_values())
+
+        # Assert
+        assert status_code == 200
+
+    def test_create_donor_cases_does_not_write_from_warm_instance_caches(self):
+        # Arrange
+        mock_request = MockRequest(
+            {"questionnaire_name": "IPS2403a", "role": "IPS Field Interviewer"}
+        )
+        create_donor_cases(mock_request)
+
+        # Act - the GUID and users are read again as the run writes donor cases
+        with assert_blaise_call_budget(max_reads=4) as blaise_calls:
+            _, status_code = create_donor_cases(mock_request)
+
+        # Assert
+        assert status_code == 200
+        assert blaise_calls.calls["get_questionnaire_for_server_park"] == 1
+        assert blaise_calls.calls["get_users"] == 1
+
+    def test_blaise_calls_are_counted_per_endpoint(self):
+        # Act
+        create_donor_cases(
+            MockRequest(
+                {"questionnaire_name": "IPS2403a", "role": "IPS Field Interviewer"}
+            )
+        )
+
+        # Assert
+        assert {
+            "name": "create_donor_cases",
+            "invocations": 1,
+            "reads": 4,
+            "writes": 2,
+            "max_reads": 4,
+            "max_writes": 2,
+        } in get_blaise_call_stats()
+        assert (
+            tracer.in_memory_exporter.get_finished_spans()[-1].attributes[
+                "blaise.write_calls"
+            ]
+            == 2
+        )
+
+
+class TestMainMultipleServerParks:
+    @pytest.fixture(autouse=True)
+    def fake_blaise_api(self):
+        fake_client = FakeBlaiseRestApiClient(
+            users=[{"name": "oscar", "role": "IPS Field Interviewer"}],
+            questionnaires=[
+                {
+                    "name": "IPS2402a",
+                    "id": "guid-1",
+                    "serverParkName": "gusty",
+                    "status": "Active",
+                },
+                {
+                    "name": "IPS2403a",
+                    "id": "guid-2",
+                    "serverParkName": "windy",
+                    "status": "Active",
+                },
+            ],
+        )
+        with mock.patch(
+            "appconfig.config.Config.from_env",
+            return_value=Config(
+                blaise_api_url="foo",
+                blaise_server_park="gusty",
+                blaise_server_parks=["gusty", "windy"],
+            ),
+        ), mock.patch(
+            "utilities.blaise_cassette.blaise_restapi.Client",
+            return_value=fake_client,
+        ):
+            yield fake_client
+
+    def test_create_donor_cases_uses_the_park_the_questionnaire_is_on(
+        self, fake_blaise_api
+    ):
+        # Act
+        result = create_donor_cases(
+            MockRequest(
+                {"questionnaire_name": "IPS2403a", "role": "IPS Field Interviewer"}
+            )
+        )
+
+        # Assert
+        assert result == (
+            "Successfully created donor cases for user role: IPS Field Interviewer",
+            200,
+        )
+        assert fake_blaise_api.cases == [
+            {"mainSurveyID": "guid-2", "id": "oscar", "cmA_IsDonorCase": "1"}
+        ]
+
+    def test_reissue_new_donor_case_uses_the_park_the_questionnaire_is_on(
+        self, fake_blaise_api
+    ):
+        # Arrange
+        fake_blaise_api.cases = [
+            {"mainSurveyID": "guid-2", "id": "oscar", "cmA_IsDonorCase": "1"}
+        ]
+
+        # Act
+        result = reissue_new_donor_case(
+            MockRequest({"questionnaire_name": "IPS2403a", "user": "oscar"})
+        )
+
+        # Assert
+        assert result == ("Successfully reissued new donor case for user: oscar", 200)
+
+    def test_create_donor_cases_returns_404_when_no_park_has_the_questionnaire(self):
+        # Act
+        result = create_donor_cases(
+            MockRequest(
+                {"questionnaire_name": "IPS2401a", "role": "IPS Field Interviewer"}
+            )
+        )
+
+        # Assert
+        assert result == (
+            "Error creating IPS donor cases: Questionnaire IPS2401a was not found "
+            "on server parks ['gusty', 'windy']",
+            404,
+        )
+
+    def test_warm_up_warms_every_server_park(self):
+        # Act
+        summary, status_code = warm_up(flask.Request.from_values())
+
+        # Assert
+        assert status_code == 200
+        assert [
+            (park_summary["server_park"], park_summary["active_questionnaires"])
+            for park_summary in summary["server_parks"]
+        ] == [("gusty", ["IPS2402a"]), ("windy", ["IPS2403a"])]
+
+
+class TestMainCreateDonorCasesReconcile:
+    @pytest.fixture(autouse=True)
+    def fake_blaise_api(self):
+        fake_client = FakeBlaiseRestApiClient(
+            users=[
+                {"name": "jim", "role": "IPS Field Interviewer"},
+                {"name": "pam", "role": "IPS Field Interviewer"},
+                {"name": "michael", "role": "IPS Manager"},
+                {"name": "ryan", "role": "DST"},
+            ],
+            questionnaires=[
+                {"name": "IPS2403a", "id": "some-guid", "serverParkName": "gusty"}
+            ],
+        )
+        fake_client.cases = [
+            {"mainSurveyID": "some-guid", "id": "jim", "cmA_IsDonorCase": "1"},
+            {"mainSurveyID": "some-guid", "id": "michael", "cmA_IsDonorCase": "1"},
+            {"mainSurveyID": "some-guid", "id": "ryan", "cmA_IsDonorCase": "1"},
+        ]
+        with mock.patch(
+            "appconfig.config.Config.from_env",
+            return_value=Config(blaise_api_url="foo", blaise_server_park="gusty"),
+        ), mock.patch(
+            "utilities.blaise_cassette.blaise_restapi.Client",
+            return_value=fake_client,
+        ):
+            yield fake_client
+
+    def test_create_donor_cases_reconcile_dry_run_returns_the_planned_actions(
+        self, fake_blaise_api
+    ):
+        # Arrange
+        mock_request = MockRequest(
+            {
+                "questionnaire_name": "IPS2403a",
+                "role": "IPS Field Interviewer",
+                "mode": "reconcile",
+                "dry_run": True,
+            }
+        )
+
+        # Act
+        body, status_code = create_donor_cases(mock_request)
+
+        # Assert
+        assert status_code == 200
+        assert body["summary"] == "Would create: 1, would retire: 1, kept: 1"
+        assert body["actions"] == [
+            {
+                "action": "create",
+                "user": "pam",
+                "case_id": "pam",
+                "status": "planned",
+                "error": None,
+            },
+            {
+                "action": "retire",
+                "user": "ryan",
+                "case_id": "ryan",
+                "status": "planned",
+                "error": None,
+            },
+        ]
+        assert len(fake_blaise_api.cases) == 3
+
+    def test_create_donor_cases_reconcile_creates_and_retires_donor_cases(
+        self, fake_blaise_api
+    ):
+        # Arrange
+        mock_request = MockRequest(
+            {
+                "questionnaire_name": "IPS2403a",
+                "role": "IPS Field Interviewer",
+                "mode": "reconcile",
+            }
+        )
+
+        # Act
+        body, status_code = create_donor_cases(mock_request)
+
+        # Assert
+        assert status_code == 200
+        assert body["summary"] == (
+            "Created: 1, retired: 1, kept: 1, failed: 0, not run: 0"
+        )
+        # michael is an IPS Manager, so his donor case stays
+        assert sorted(case["id"] for case in fake_blaise_api.cases) == [
+            "jim",
+            "michael",
+            "pam",
+        ]
+
+    def test_create_donor_cases_reconcile_returns_202_when_an_action_fails(
+        self, fake_blaise_api
+    ):
+        # Arrange
+        fake_blaise_api.script_writes((0, 500), (0, 500))
+        mock_request = MockRequest(
+            {
+                "questionnaire_name": "IPS2403a",
+                "role": "IPS Field Interviewer",
+                "mode": "reconcile",
+            }
+        )
+
+        # Act
+        body, status_code = create_donor_cases(mock_request)
+
+        # Assert
+        assert status_code == 202
+        assert body["summary"] == (
+            "Created: 0, retired: 0, kept: 1, failed: 2, not run: 0"
+        )
+
+
+class TestMainCreateDonorCasesChangeDetection:
+    @pytest.fixture(autouse=True)
+    def fake_blaise_api(self):
+        fake_client = FakeBlaiseRestApiClient(
+            users=[
+                {"name": "jim", "role": "IPS Field Interviewer"},
+                {"name": "pam", "role": "IPS Field Interviewer"},
+            ],
+            questionnaires=[
+                {"name": "IPS2403a", "id": "some-guid", "serverParkName": "gusty"}
+            ],
+        )
+        with mock.patch(
+            "appconfig.config.Config.from_env",
+            return_value=Config(
+                blaise_api_url="foo",
+                blaise_server_park="gusty",
+                change_detection_store="memory",
+                users_cache_ttl_seconds=0,
+            ),
+        ), mock.patch(
+            "utilities.blaise_cassette.blaise_restapi.Client",
+            return_value=fake_client,
+        ):
+            yield fake_client
+
+    @staticmethod
+    def create_request() -> MockRequest:
+        return MockRequest(
+            {"questionnaire_name": "IPS2403a", "role": "IPS Field Interviewer"}
+        )
+
+    def test_create_donor_cases_skips_the_case_scan_when_nothing_changed(
+        self, fake_blaise_api
+    ):
+        # Arrange - the first run's own writes make the second run a full one
+        create_donor_cases(self.create_request())
+        create_donor_cases(self.create_request())
+        fake_blaise_api.calls.clear()
+
+        # Act
+        result = create_donor_cases(self.create_request())
+
+        # Assert
+        assert result == (
+            "Donor cases are up to date for user role: IPS Field Interviewer. "
+            "Nothing has changed since the last run",
+            200,
+        )
+        assert "get_questionnaire_data" not in fake_blaise_api.calls
+        assert "create_multikey_case" not in fake_blaise_api.calls
+
+    def test_create_donor_cases_runs_in_full_when_the_role_changed(
+        self, fake_blaise_api
+    ):
+        # Arrange
+        create_donor_cases(self.create_request())
+        fake_blaise_api.users.append({"name": "erin", "role": "IPS Field Interviewer"})
+
+        # Act
+        result = create_donor_cases(self.create_request())
+
+        # Assert
+        assert result == (
+            "Successfully created donor cases for user role: IPS Field Interviewer",
+            200,
+        )
+        assert sorted(case["id"] for case in fake_blaise_api.cases) == [
+            "erin",
+            "jim",
+            "pam",
+        ]
+
+    def test_create_donor_cases_runs_in_full_when_a_donor_case_was_removed(
+        self, fake_blaise_api
+    ):
+        # Arrange
+        create_donor_cases(self.create_request())
+        fake_blaise_api.cases.pop()
+
+        # Act
+        create_donor_cases(self.create_request())
+
+        # Assert
+        assert sorted(case["id"] for case in fake_blaise_api.cases) == ["jim", "pam"]
+
+
+class TestMainSweepDonorCases:
+    @pytest.fixture(autouse=True)
+    def fake_blaise_api(self):
+        fake_client = FakeBlaiseRestApiClient(
+            users=[
+                {"name": "jim", "role": "IPS Field Interviewer"},
+                {"name": "michael", "role": "IPS Manager"},
+            ],
+            questionnaires=[
+                {
+                    "name": "IPS2403a",
+                    "id": "guid-a",
+                    "serverParkName": "gusty",
+                    "status": "Active",
+                },
+                {
+                    "name": "IPS2404a",
+                    "id": "guid-b",
+                    "serverParkName": "gusty",
+                    "status": "Active",
+                },
+            ],
+        )
+        with mock.patch(
+            "appconfig.config.Config.from_env",
+            return_value=Config(
+                blaise_api_url="foo",
+                blaise_server_park="gusty",
+                sweep_roles=["IPS Field Interviewer", "IPS Manager"],
+            ),
+        ), mock.patch(
+            "utilities.blaise_cassette.blaise_restapi.Client",
+            return_value=fake_client,
+        ):
+            yield fake_client
+
+    def test_sweep_donor_cases_creates_donor_cases_for_the_configured_roles(
+        self, fake_blaise_api
+    ):
+        # Arrange
+        mock_request = flask.Request.from_values(method="GET")
+
+        # Act
+        with assert_blaise_call_budget(max_reads=3, max_writes=4):
+            body, status_code = sweep_donor_cases(mock_request)
+
+        # Assert
+        assert status_code == 200
+        assert body["summary"] == (
+            "Questionnaires: 2, roles: 2, created: 4, complete: 4, "
+            "no users: 0, partial: 0, failed: 0, not run: 0"
+        )
+        assert sorted(
+            (case["mainSurveyID"], case["id"]) for case in fake_blaise_api.cases
+        ) == [
+            ("guid-a", "jim"),
+            ("guid-a", "michael"),
+            ("guid-b", "jim"),
+            ("guid-b", "michael"),
+        ]
+
+    def test_sweep_donor_cases_returns_202_when_a_questionnaire_fails(
+        self, fake_blaise_api
+    ):
+        # Arrange
+        fake_blaise_api.script_writes((0, 500))
+        mock_request = flask.Request.from_values(json={"roles": ["IPS Manager"]})
+
+        # Act
+        body, status_code = sweep_donor_cases(mock_request)
+
+        # Assert
+        assert status_code == 202
+        assert [entry["status"] for entry in body["entries"]] == [
+            "failed",
+            "complete",
+        ]
+
+    def test_sweep_donor_cases_returns_400_for_an_invalid_role(self):
+        # Arrange
+        mock_request = flask.Request.from_values(json={"roles": ["Regional Manager"]})
+
+        # Act
+        message, status_code = sweep_donor_cases(mock_request)
+
+        # Assert
+        assert status_code == 400
+        assert message.startswith(
+            "Error sweeping IPS donor cases: ['Regional Manager'] are not valid roles"
+        )
+
+
+class TestMainIdempotencyKey:
+    @pytest.fixture(autouse=True)
+    def fake_blaise_api(self):
+        fake_client = FakeBlaiseRestApiClient(
+            users=[{"name": "jim", "role": "IPS Field Interviewer"}],
+            questionnaires=[
+                {"name": "IPS2403a", "id": "some-guid", "serverParkName": "gusty"}
+            ],
+        )
+        fake_client.cases = [
+            {"mainSurveyID": "some-guid", "id": "jim", "cmA_IsDonorCase": "1"},
+        ]
+        with mock.patch(
+            "appconfig.config.Config.from_env",
+            return_value=Config(blaise_api_url="foo", blaise_server_park="gusty"),
+        ), mock.patch(
+            "utilities.blaise_cassette.blaise_restapi.Client",
+            return_value=fake_client,
+        ):
+            yield fake_client
+
+    @staticmethod
+    def create_request(idempotency_key: str) -> flask.Request:
+        # from_values builds an instance of the class it is called on, werkzeug's stubs just don't say so
+        return cast(
+            flask.Request,
+            flask.Request.from_values(
+                json={"questionnaire_name": "IPS2403a", "user": "jim"},
+                headers={"Idempotency-Key": idempotency_key},
+            ),
+        )
+
+    def test_reissue_new_donor_case_retry_does_not_create_another_case(
+        self, fake_blaise_api
+    ):
+        # Arrange
+        reissue_new_donor_case(self.create_request("retry-me"))
+        fake_blaise_api.calls.clear()
+
+        # Act
+        result = reissue_new_donor_case(self.create_request("retry-me"))
+
+        # Assert
+        assert result == (
+            "Successfully reissued new donor case for user: jim",
+            200,
+            {"Idempotent-Replayed": "true"},
+        )
+        assert fake_blaise_api.calls == []
+        assert sorted(case["id"] for case in fake_blaise_api.cases) == [
+            "1-jim",
+            "jim",
+        ]
+
+    def test_reissue_new_donor_case_with_a_new_key_reissues_again(
+        self, fake_blaise_api
+    ):
+        # Arrange
+        reissue_new_donor_case(self.create_request("first"))
+
+        # Act
+        reissue_new_donor_case(self.create_request("second"))
+
+        # Assert
+        assert sorted(case["id"] for case in fake_blaise_api.cases) == [
+            "1-jim",
+            "2-jim",
+            "jim",
+        ]
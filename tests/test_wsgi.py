@@ -0,0 +1,122 @@
+from unittest import mock
+
+import pytest
+
+from appconfig.config import Config
+from tests.fake_blaise_api import FakeBlaiseRestApiClient
+from wsgi import create_app
+
+
+@pytest.fixture()
+def client():
+    return create_app().test_client()
+
+
+class TestCreateApp:
+    @pytest.mark.parametrize(
+        "handler_name",
+        [
+            "create_donor_cases",
+            "reissue_new_donor_case",
+            "get_users_by_role",
+            "sweep_donor_cases",
+        ],
+    )
+    def test_create_app_routes_each_function_to_its_handler(self, client, handler_name):
+        # Arrange
+        with mock.patch(f"main.{handler_name}") as mock_handler:
+            mock_handler.return_value = (f"{handler_name} called", 200)
+
+            # Act
+            response = client.post(f"/{handler_name}", json={"role": "IPS Manager"})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.get_data(as_text=True) == f"{handler_name} called"
+        assert mock_handler.call_args[0][0].get_json() == {"role": "IPS Manager"}
+
+    @mock.patch("main.diagnostics")
+    def test_create_app_serves_diagnostics_on_get(self, mock_diagnostics, client):
+        # Arrange
+        mock_diagnostics.return_value = ({"ready": False}, 503)
+
+        # Act
+        response = client.get("/diagnostics")
+
+        # Assert
+        assert response.status_code == 503
+        assert response.get_json() == {"ready": False}
+
+    @mock.patch("main.get_users_by_role")
+    def test_create_app_returns_list_responses_as_json(
+        self, mock_get_users_by_role, client
+    ):
+        # Arrange
+        mock_get_users_by_role.return_value = (["rich", "sarah"], 200)
+
+        # Act
+        response = client.post("/get_users_by_role", json={"role": "IPS Manager"})
+
+        # Assert
+        assert response.get_json() == ["rich", "sarah"]
+
+    @mock.patch("main.create_donor_cases")
+    def test_create_app_passes_the_handler_status_code_through(
+        self, mock_create_donor_cases, client
+    ):
+        # Arrange
+        mock_create_donor_cases.return_value = ("Error creating IPS donor cases", 400)
+
+        # Act
+        response = client.post("/create_donor_cases", json={})
+
+        # Assert
+        assert response.status_code == 400
+
+    def test_create_app_rejects_get_requests_to_post_only_functions(self, client):
+        # Act
+        response = client.get("/create_donor_cases")
+
+        # Assert
+        assert response.status_code == 405
+
+
+class TestServerTiming:
+    @mock.patch("utilities.blaise_cassette.blaise_restapi.Client")
+    @mock.patch("appconfig.config.Config.from_env")
+    def test_responses_carry_phase_timings_and_blaise_call_counts(
+        self, mock_config, mock_client, client
+    ):
+        # Arrange
+        mock_config.return_value = Config(
+            blaise_api_url="foo", blaise_server_park="gusty"
+        )
+        mock_client.return_value = FakeBlaiseRestApiClient(
+            users=[{"name": "creed", "role": "IPS Manager"}]
+        )
+
+        # Act
+        first_response = client.post("/get_users_by_role", json={"role": "IPS Manager"})
+        second_response = client.post(
+            "/get_users_by_role", json={"role": "IPS Manager"}
+        )
+
+        # Assert
+        assert first_response.get_json() == ["creed"]
+        first_timing = first_response.headers["Server-Timing"]
+        assert "validation;dur=" in first_timing
+        assert "config;dur=" in first_timing
+        assert "users;dur=" in first_timing
+        assert 'blaise_reads;desc="1"' in first_timing
+        assert 'cache_misses;desc="1"' in first_timing
+        second_timing = second_response.headers["Server-Timing"]
+        assert 'blaise_reads;desc="0"' in second_timing
+        assert 'cache_hits;desc="1"' in second_timing
+
+    def test_error_responses_carry_phase_timings(self, client):
+        # Act
+        response = client.post("/create_donor_cases", data="Bears. Beets.")
+
+        # Assert
+        assert response.status_code == 400
+        assert response.headers["Server-Timing"].startswith("validation;dur=")
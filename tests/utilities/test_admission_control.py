@@ -0,0 +1,160 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tests.helpers import get_default_config
+from utilities.admission_control import (
+    AdmissionController,
+    admission_controlled,
+    get_admission_controller,
+    get_admission_controller_stats,
+)
+from utilities.custom_exceptions import AdmissionRejected
+
+
+def hold_slot(controller: AdmissionController, entered, release):
+    with controller.admit():
+        entered.set()
+        release.wait()
+
+
+class TestAdmissionController:
+    def test_admit_rejects_immediately_when_the_wait_queue_is_full(self):
+        # arrange
+        controller = AdmissionController("test", 1, 0, queue_timeout_seconds=5)
+        entered, release = threading.Event(), threading.Event()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            holder = executor.submit(hold_slot, controller, entered, release)
+            entered.wait()
+
+            # act
+            with pytest.raises(
+                AdmissionRejected, match="the wait queue is full"
+            ) as err:
+                with controller.admit():
+                    pass
+
+            release.set()
+            holder.result()
+
+        # assert
+        assert err.value.retry_after_seconds >= 1
+        assert controller.stats()["rejected"] == 1
+        assert controller.stats()["admitted"] == 1
+
+    def test_admit_queues_until_a_slot_is_released(self):
+        # arrange
+        controller = AdmissionController("test", 1, 1, queue_timeout_seconds=5)
+        entered, release = threading.Event(), threading.Event()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            holder = executor.submit(hold_slot, controller, entered, release)
+            entered.wait()
+            queued_entered = threading.Event()
+            queued = executor.submit(hold_slot, controller, queued_entered, release)
+            while controller.stats()["queued"] == 0:
+                time.sleep(0.001)
+
+            # act
+            release.set()
+            holder.result()
+            queued.result(timeout=5)
+
+        # assert
+        assert controller.stats()["admitted"] == 2
+        assert controller.stats()["rejected"] == 0
+
+    def test_admit_rejects_when_no_slot_frees_within_the_queue_timeout(self):
+        # arrange
+        controller = AdmissionController("test", 1, 1, queue_timeout_seconds=0.05)
+        entered, release = threading.Event(), threading.Event()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            holder = executor.submit(hold_slot, controller, entered, release)
+            entered.wait()
+
+            # act & assert
+            with pytest.raises(AdmissionRejected, match="within 0.05s"):
+                with controller.admit():
+                    pass
+
+            release.set()
+            holder.result()
+
+    def test_admit_does_not_limit_when_max_concurrent_is_zero(self):
+        # arrange
+        controller = AdmissionController("test", 0, 0, queue_timeout_seconds=0)
+
+        # act
+        with controller.admit():
+            with controller.admit():
+                stats = controller.stats()
+
+        # assert
+        assert stats["in_flight"] == 2
+
+
+class TestAdmissionControlled:
+    def test_admission_controlled_returns_429_with_retry_after_when_rejected(self):
+        # arrange
+        config = get_default_config()
+        config.admission_donor_cases_max_concurrent = 1
+        config.admission_donor_cases_max_queue = 0
+        entered, release = threading.Event(), threading.Event()
+
+        @admission_controlled(
+            "donor_cases", "Error in test", lambda: config, lambda m: [m]
+        )
+        def handler(request):
+            entered.set()
+            release.wait()
+            return ["done"], 200
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            first = executor.submit(handler, None)
+            entered.wait()
+
+            # act
+            body, status_code, headers = handler(None)
+
+            release.set()
+
+        # assert
+        assert first.result() == (["done"], 200)
+        assert status_code == 429
+        assert body == [
+            "Error in test: Too many concurrent donor_cases requests on this instance, "
+            "the wait queue is full"
+        ]
+        assert int(headers["Retry-After"]) >= 1
+
+    def test_admission_controlled_runs_the_handler_when_there_is_no_config(self):
+        # arrange
+        @admission_controlled("donor_cases", "Error in test", lambda: None)
+        def handler(request):
+            return "Missing required values from config", 500
+
+        # act
+        result = handler(None)
+
+        # assert
+        assert result == ("Missing required values from config", 500)
+        assert get_admission_controller_stats() == []
+
+    def test_get_admission_controller_keeps_separate_limits_per_name(self):
+        # act
+        donor_cases = get_admission_controller("donor_cases", 4, 8, 10)
+        get_users = get_admission_controller("get_users_by_role", 32, 64, 10)
+
+        # assert
+        assert donor_cases is not get_users
+        assert {
+            stats["name"]: stats["max_concurrent"]
+            for stats in get_admission_controller_stats()
+        } == {
+            "donor_cases": 4,
+            "get_users_by_role": 32,
+        }
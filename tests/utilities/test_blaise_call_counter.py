@@ -0,0 +1,104 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from tests.helpers import assert_blaise_call_budget
+from utilities.blaise_call_counter import (
+    CountingClient,
+    count_blaise_call,
+    counting_blaise_calls,
+    get_blaise_call_stats,
+)
+
+
+class TestCountingBlaiseCalls:
+    def test_counting_blaise_calls_splits_reads_and_writes(self):
+        # act
+        with counting_blaise_calls("create_donor_cases") as blaise_calls:
+            count_blaise_call("get_users")
+            count_blaise_call("get_questionnaire_data")
+            count_blaise_call("create_multikey_case")
+
+        # assert
+        assert blaise_calls.reads == 2
+        assert blaise_calls.writes == 1
+
+    def test_nested_scopes_are_counted_by_outer_scopes(self):
+        # act
+        with counting_blaise_calls("outer") as outer_calls:
+            with counting_blaise_calls("inner") as inner_calls:
+                count_blaise_call("get_users")
+            count_blaise_call("get_users")
+
+        # assert
+        assert inner_calls.reads == 1
+        assert outer_calls.reads == 2
+
+    def test_calls_made_on_worker_threads_are_counted(self):
+        # act
+        with counting_blaise_calls("create_donor_cases") as blaise_calls:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                for _ in range(8):
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        count_blaise_call,
+                        "create_multikey_case",
+                    )
+
+        # assert
+        assert blaise_calls.writes == 8
+
+    def test_calls_outside_a_scope_are_not_counted(self):
+        # act
+        count_blaise_call("get_users")
+
+        # assert
+        assert get_blaise_call_stats() == []
+
+    def test_get_blaise_call_stats_aggregates_invocations_per_endpoint(self):
+        # act
+        for reads in (1, 3):
+            with counting_blaise_calls("get_users_by_role"):
+                for _ in range(reads):
+                    count_blaise_call("get_users")
+
+        # assert
+        assert get_blaise_call_stats() == [
+            {
+                "name": "get_users_by_role",
+                "invocations": 2,
+                "reads": 4,
+                "writes": 0,
+                "max_reads": 3,
+                "max_writes": 0,
+            }
+        ]
+
+
+class TestCountingClient:
+    def test_counting_client_counts_and_delegates_calls(self):
+        # arrange
+        client = mock.Mock()
+        client.get_users.return_value = [{"name": "kevin"}]
+
+        # act
+        with counting_blaise_calls("get_users_by_role") as blaise_calls:
+            users = CountingClient(client).get_users()
+
+        # assert
+        assert users == [{"name": "kevin"}]
+        assert blaise_calls.calls == {"get_users": 1}
+
+
+class TestAssertBlaiseCallBudget:
+    def test_assert_blaise_call_budget_fails_when_the_budget_is_exceeded(self):
+        # act & assert
+        with pytest.raises(AssertionError) as error:
+            with assert_blaise_call_budget(max_reads=1):
+                count_blaise_call("get_users")
+                count_blaise_call("get_users")
+        assert str(error.value).startswith(
+            "Blaise call budget exceeded: 2 reads (budget 1) and 0 writes (budget 0)"
+        )
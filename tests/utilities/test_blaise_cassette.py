@@ -0,0 +1,211 @@
+import time
+
+import pytest
+
+from appconfig.config import Config
+from tests.fake_blaise_api import FakeBlaiseRestApiClient, FakeHttpError
+from utilities.blaise_cassette import (
+    CassetteRecorder,
+    RecordingClient,
+    ReplayClient,
+    get_blaise_client,
+    load_interactions,
+)
+from utilities.concurrency_limiter import get_status_code
+from utilities.custom_exceptions import CassetteError
+
+
+@pytest.fixture()
+def fake_client() -> FakeBlaiseRestApiClient:
+    fake_client = FakeBlaiseRestApiClient(
+        users=[
+            {"name": "jim", "role": "IPS Field Interviewer", "password": "beets"},
+            {"name": "jim2", "role": "IPS Manager", "password": "bears"},
+        ],
+        questionnaires=[
+            {"name": "IPS2403a", "id": "some-guid", "serverParkName": "gusty"}
+        ],
+    )
+    fake_client.cases = [
+        {"mainSurveyID": "some-guid", "id": "12-dwight", "cmA_IsDonorCase": "1"}
+    ]
+    return fake_client
+
+
+class TestRecordingClient:
+    def test_recording_client_writes_sanitised_interactions(
+        self, fake_client, tmp_path
+    ):
+        # arrange
+        path = str(tmp_path / "cassette.jsonl")
+        client = RecordingClient(fake_client, CassetteRecorder(path))
+
+        # act
+        client.get_questionnaire_data(
+            "cma", "CMA_Launcher", ["id"], "MainSurveyID='some-guid'"
+        )
+        users = client.get_users()
+        client.create_multikey_case(
+            "cma",
+            "CMA_Launcher",
+            ["MainSurveyID", "ID"],
+            ["some-guid", "jim"],
+            {
+                "mainSurveyID": "some-guid",
+                "id": "jim",
+                "cmA_IsDonorCase": "1",
+                "cmA_ContactData": "ID    jim    ContactInfoShort    IPS",
+            },
+        )
+
+        # assert
+        assert [user["name"] for user in users] == ["jim", "jim2"]
+        interactions = load_interactions(path)
+        assert [interaction["method"] for interaction in interactions] == [
+            "get_questionnaire_data",
+            "get_users",
+            "create_multikey_case",
+        ]
+        assert interactions[0]["response"]["reportingData"][0]["id"] == "12-user-0001"
+        assert interactions[1]["response"] == [
+            {
+                "name": "user-0002",
+                "role": "IPS Field Interviewer",
+                "password": "REDACTED",
+            },
+            {"name": "user-0003", "role": "IPS Manager", "password": "REDACTED"},
+        ]
+        assert interactions[2]["args"][3] == ["some-guid", "user-0002"]
+        assert interactions[2]["args"][4] == {
+            "mainSurveyID": "some-guid",
+            "id": "user-0002",
+            "cmA_IsDonorCase": "1",
+            "cmA_ContactData": "ID    user-0002    ContactInfoShort    IPS",
+        }
+        assert all(interaction["duration_ms"] >= 0 for interaction in interactions)
+
+    def test_recording_client_records_errors_and_reraises_them(
+        self, fake_client, tmp_path
+    ):
+        # arrange
+        path = str(tmp_path / "cassette.jsonl.gz")
+        client = RecordingClient(fake_client, CassetteRecorder(path))
+        fake_client.script_writes((0, 429))
+
+        # act
+        with pytest.raises(FakeHttpError):
+            client.create_multikey_case("cma", "CMA_Launcher", [], [], {})
+
+        # assert
+        assert load_interactions(path)[0]["error"]["status_code"] == 429
+
+
+class TestReplayClient:
+    def test_replay_client_returns_recorded_responses_in_any_order(self):
+        # arrange
+        client = ReplayClient(
+            [
+                {"method": "get_users", "args": [], "response": [{"name": "pam"}]},
+                {
+                    "method": "questionnaire_exists_on_server_park",
+                    "args": ["gusty", "IPS2403a"],
+                    "response": True,
+                },
+            ]
+        )
+
+        # act
+        exists = client.questionnaire_exists_on_server_park("gusty", "IPS2403a")
+        users = client.get_users()
+
+        # assert
+        assert exists is True
+        assert users == [{"name": "pam"}]
+        assert client.unused_interactions == []
+
+    def test_replay_client_raises_recorded_errors_with_their_status_code(self):
+        # arrange
+        client = ReplayClient(
+            [
+                {
+                    "method": "create_multikey_case",
+                    "args": ["cma"],
+                    "error": {"status_code": 503, "message": "Service Unavailable"},
+                }
+            ]
+        )
+
+        # act
+        with pytest.raises(Exception) as error:
+            client.create_multikey_case("cma")
+
+        # assert
+        assert get_status_code(error.value) == 503
+        assert str(error.value) == "Service Unavailable"
+
+    def test_replay_client_raises_a_cassette_error_for_unrecorded_calls(self):
+        # arrange
+        client = ReplayClient([{"method": "get_users", "args": [], "response": []}])
+        client.get_users()
+
+        # act & assert
+        with pytest.raises(CassetteError) as error:
+            client.get_users()
+        assert str(error.value) == (
+            "No recorded interaction left for get_users with arguments [] {}"
+        )
+
+    def test_replay_client_sleeps_for_recorded_latency_when_asked(self):
+        # arrange
+        interactions = [
+            {"method": "get_users", "args": [], "response": [], "duration_ms": 50}
+        ]
+
+        # act
+        start_time = time.perf_counter()
+        ReplayClient(interactions, replay_latency=True).get_users()
+        elapsed_seconds = time.perf_counter() - start_time
+
+        # assert
+        assert elapsed_seconds >= 0.05
+
+
+class TestGetBlaiseClient:
+    def test_get_blaise_client_shares_one_replay_client_per_cassette(self, tmp_path):
+        # arrange
+        path = tmp_path / "cassette.jsonl"
+        path.write_text('{"method":"get_users","args":[],"response":[]}\n')
+        config = Config(
+            blaise_api_url="foo",
+            blaise_server_park="gusty",
+            blaise_cassette_mode="replay",
+            blaise_cassette_path=str(path),
+        )
+
+        # act
+        first_client = get_blaise_client(config)
+        second_client = get_blaise_client(config)
+
+        # assert
+        assert isinstance(first_client, ReplayClient)
+        assert first_client is second_client
+
+    def test_get_blaise_client_ignores_a_mode_without_a_path(self, caplog):
+        # arrange
+        config = Config(
+            blaise_api_url="foo",
+            blaise_server_park="gusty",
+            blaise_cassette_mode="replay",
+        )
+
+        # act
+        client = get_blaise_client(config)
+
+        # assert
+        assert not isinstance(client, (ReplayClient, RecordingClient))
+        assert (
+            "root",
+            30,
+            "Ignoring Blaise cassette mode 'replay', it needs BLAISE_CASSETTE_PATH "
+            "and one of ['off', 'record', 'replay']",
+        ) in caplog.record_tuples
@@ -0,0 +1,182 @@
+from unittest import mock
+
+import pytest
+
+from appconfig.config import Config
+from models.checkpoint_model import Checkpoint
+from tests.helpers import get_default_config
+from utilities.checkpoint_store import (
+    InMemoryCheckpointStore,
+    LocalFileCheckpointStore,
+    get_checkpoint_store,
+)
+from utilities.custom_exceptions import CheckpointError
+
+
+@pytest.fixture()
+def checkpoint() -> Checkpoint:
+    return Checkpoint(
+        questionnaire_name="IPS2406a",
+        role="IPS Field Interviewer",
+        guid="7bded891-3aa6-41b2-824b-0be514018806",
+        pending_users=["james", "rich", "sarah"],
+        cursor=1,
+        users_done=["james"],
+    )
+
+
+@pytest.fixture(params=["memory", "file"])
+def checkpoint_store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryCheckpointStore()
+    return LocalFileCheckpointStore(str(tmp_path / "checkpoints"))
+
+
+class TestCheckpointStores:
+    def test_load_returns_the_saved_checkpoint(self, checkpoint_store, checkpoint):
+        # act
+        checkpoint_store.save(checkpoint)
+        result = checkpoint_store.load(checkpoint.resume_token)
+
+        # assert
+        assert result == checkpoint
+        assert result is not checkpoint
+
+    def test_load_returns_none_for_an_unknown_resume_token(self, checkpoint_store):
+        # act & assert
+        assert checkpoint_store.load("unknown") is None
+
+    def test_delete_removes_the_checkpoint(self, checkpoint_store, checkpoint):
+        # arrange
+        checkpoint_store.save(checkpoint)
+
+        # act
+        checkpoint_store.delete(checkpoint.resume_token)
+        checkpoint_store.delete(checkpoint.resume_token)
+
+        # assert
+        assert checkpoint_store.load(checkpoint.resume_token) is None
+
+    def test_save_overwrites_an_earlier_checkpoint(self, checkpoint_store, checkpoint):
+        # arrange
+        checkpoint_store.save(checkpoint)
+        checkpoint.cursor = 3
+        checkpoint.users_done = ["james", "rich", "sarah"]
+
+        # act
+        checkpoint_store.save(checkpoint)
+
+        # assert
+        assert checkpoint_store.load(checkpoint.resume_token).cursor == 3
+
+
+class TestLocalFileCheckpointStore:
+    def test_load_raises_a_checkpoint_error_for_a_path_traversal_token(self, tmp_path):
+        # arrange
+        checkpoint_store = LocalFileCheckpointStore(str(tmp_path))
+
+        # act & assert
+        with pytest.raises(CheckpointError) as err:
+            checkpoint_store.load("../../etc/passwd")
+        assert err.value.message == "Invalid resume token '../../etc/passwd'"
+
+    def test_load_raises_a_checkpoint_error_for_a_corrupt_checkpoint(self, tmp_path):
+        # arrange
+        (tmp_path / "corrupt.json").write_text("{not json")
+        checkpoint_store = LocalFileCheckpointStore(str(tmp_path))
+
+        # act & assert
+        with pytest.raises(CheckpointError):
+            checkpoint_store.load("corrupt")
+
+
+class TestInMemoryCheckpointStore:
+    def test_load_ignores_an_expired_checkpoint(self, checkpoint):
+        # arrange
+        checkpoint_store = InMemoryCheckpointStore(ttl_seconds=60)
+        with mock.patch("utilities.checkpoint_store.time.time", return_value=1000):
+            checkpoint_store.save(checkpoint)
+
+        # act
+        with mock.patch("utilities.checkpoint_store.time.time", return_value=1060):
+            result = checkpoint_store.load(checkpoint.resume_token)
+
+        # assert
+        assert result is None
+
+    def test_save_drops_expired_checkpoints(self, checkpoint):
+        # arrange
+        checkpoint_store = InMemoryCheckpointStore(ttl_seconds=60)
+        with mock.patch("utilities.checkpoint_store.time.time", return_value=1000):
+            checkpoint_store.save(checkpoint)
+
+        # act
+        with mock.patch("utilities.checkpoint_store.time.time", return_value=1060):
+            checkpoint_store.save(Checkpoint("IPS2407a", "IPS Manager", "guid"))
+
+        # assert
+        assert checkpoint.resume_token not in checkpoint_store._checkpoints
+        assert len(checkpoint_store._checkpoints) == 1
+
+
+class TestGetCheckpointStore:
+    def test_get_checkpoint_store_returns_a_shared_in_memory_store_by_default(self):
+        # arrange
+        config = get_default_config()
+
+        # act & assert
+        assert isinstance(get_checkpoint_store(config), InMemoryCheckpointStore)
+        assert get_checkpoint_store(config) is get_checkpoint_store(config)
+
+    def test_get_checkpoint_store_returns_a_local_file_store(self, tmp_path):
+        # arrange
+        config = get_default_config()
+        config.checkpoint_store = "file"
+        config.checkpoint_dir = str(tmp_path)
+
+        # act & assert
+        assert isinstance(get_checkpoint_store(config), LocalFileCheckpointStore)
+
+    def test_config_uses_the_file_store_when_a_checkpoint_dir_is_set(
+        self, monkeypatch, tmp_path
+    ):
+        # arrange
+        monkeypatch.delenv("CHECKPOINT_STORE", raising=False)
+        monkeypatch.setenv("CHECKPOINT_DIR", str(tmp_path))
+
+        # act
+        config = Config.from_env()
+
+        # assert
+        assert isinstance(get_checkpoint_store(config), LocalFileCheckpointStore)
+
+    def test_get_checkpoint_store_returns_none_when_disabled(self):
+        # arrange
+        config = get_default_config()
+        config.checkpoint_store = "none"
+
+        # act & assert
+        assert get_checkpoint_store(config) is None
+
+
+class TestCheckpoint:
+    def test_prepare_for_resume_retries_failed_users_then_remaining_users(self):
+        # arrange
+        checkpoint = Checkpoint(
+            questionnaire_name="IPS2406a",
+            role="IPS Manager",
+            guid="guid",
+            pending_users=["james", "rich", "sarah", "kris"],
+            cursor=2,
+            users_done=["james"],
+            users_failed=["rich"],
+        )
+
+        # act
+        checkpoint.prepare_for_resume()
+
+        # assert
+        assert checkpoint.pending_users == ["rich", "sarah", "kris"]
+        assert checkpoint.cursor == 0
+        assert checkpoint.users_failed == []
+        assert checkpoint.users_done == ["james"]
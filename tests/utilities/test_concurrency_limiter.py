@@ -0,0 +1,225 @@
+import threading
+
+import pytest
+import requests
+
+from models.donor_case_model import DonorCaseModel
+from services.blaise_service import BlaiseService
+from services.donor_case_service import DonorCaseService
+from tests.fake_blaise_api import FakeBlaiseRestApiClient, FakeHttpError
+from tests.helpers import get_default_config
+from utilities.concurrency_limiter import (
+    AIMDConcurrencyLimiter,
+    get_concurrency_limiter,
+    get_concurrency_limiter_stats,
+    is_overload_error,
+)
+from utilities.custom_exceptions import BlaiseError, DeadlineExceeded
+from utilities.deadline import Deadline, deadline_scope
+
+
+@pytest.fixture()
+def limiter() -> AIMDConcurrencyLimiter:
+    return AIMDConcurrencyLimiter(
+        "blaise_write",
+        initial_limit=2,
+        min_limit=1,
+        max_limit=8,
+        latency_target_seconds=0.5,
+    )
+
+
+class TestIsOverloadError:
+    @pytest.mark.parametrize(
+        "error, expected",
+        [
+            (FakeHttpError(429), True),
+            (FakeHttpError(500), True),
+            (FakeHttpError(503), True),
+            (FakeHttpError(404), False),
+            (FakeHttpError(400), False),
+            (TimeoutError("timed out"), True),
+            (requests.exceptions.ReadTimeout("read timed out"), True),
+            (Exception("503 Server Error: Service Unavailable for url"), True),
+            (Exception("429 Client Error: Too Many Requests for url"), True),
+            (Exception("user 500 not found"), False),
+            (ValueError("Nope"), False),
+        ],
+    )
+    def test_is_overload_error_classifies_errors(self, error, expected):
+        # act & assert
+        assert is_overload_error(error) is expected
+
+
+class TestAIMDConcurrencyLimiter:
+    def test_limit_increases_additively_while_latency_is_under_target(self, limiter):
+        # act
+        for _ in range(6):
+            limiter.on_success(0.1)
+
+        # assert
+        assert limiter.limit == 4
+        assert limiter.stats()["limit_increases"] == 2
+
+    def test_limit_does_not_increase_when_latency_is_over_target(self, limiter):
+        # act
+        for _ in range(10):
+            limiter.on_success(0.6)
+
+        # assert
+        assert limiter.limit == 2
+
+    def test_limit_never_exceeds_the_maximum(self, limiter):
+        # act
+        for _ in range(500):
+            limiter.on_success(0.1)
+
+        # assert
+        assert limiter.limit == 8
+
+    def test_limit_is_cut_multiplicatively_on_overload_but_not_below_the_minimum(
+        self, limiter
+    ):
+        # arrange
+        for _ in range(500):
+            limiter.on_success(0.1)
+
+        # act & assert
+        limiter.on_overload("429")
+        assert limiter.limit == 4
+        limiter.on_overload("429")
+        limiter.on_overload("429")
+        limiter.on_overload("429")
+        assert limiter.limit == 1
+        history = limiter.stats()["limit_history"]
+        assert [(h["old_limit"], h["new_limit"]) for h in history[-3:]] == [
+            (8, 4),
+            (4, 2),
+            (2, 1),
+        ]
+
+    def test_limit_concurrency_reacts_to_overload_errors_and_reraises(self, limiter):
+        # act
+        with pytest.raises(FakeHttpError):
+            with limiter.limit_concurrency():
+                raise FakeHttpError(503)
+
+        # assert
+        assert limiter.limit == 1
+        assert limiter.in_flight == 0
+
+    def test_limit_concurrency_ignores_client_errors(self, limiter):
+        # act
+        with pytest.raises(FakeHttpError):
+            with limiter.limit_concurrency():
+                raise FakeHttpError(400)
+
+        # assert
+        assert limiter.limit == 2
+
+    def test_limit_concurrency_blocks_beyond_the_limit_until_the_deadline(
+        self, limiter
+    ):
+        # arrange
+        release = threading.Event()
+        entered = threading.Barrier(3)
+
+        def hold_slot():
+            with limiter.limit_concurrency():
+                entered.wait()
+                release.wait()
+
+        holders = [threading.Thread(target=hold_slot) for _ in range(2)]
+        for holder in holders:
+            holder.start()
+        entered.wait()
+
+        # act & assert
+        with deadline_scope(Deadline(0.05)):
+            with pytest.raises(DeadlineExceeded):
+                with limiter.limit_concurrency():
+                    pass
+        release.set()
+        for holder in holders:
+            holder.join()
+        assert limiter.in_flight == 0
+
+    def test_get_concurrency_limiter_returns_a_process_wide_limiter(self):
+        # act
+        first = get_concurrency_limiter("blaise_write", 2, 1, 8, 1.0)
+        second = get_concurrency_limiter("blaise_write", 2, 1, 8, 1.0)
+
+        # assert
+        assert first is second
+        assert get_concurrency_limiter_stats()[0]["name"] == "blaise_write"
+
+
+class TestAdaptiveConcurrencyAgainstFakeBlaiseApi:
+    @pytest.fixture()
+    def fake_client(self) -> FakeBlaiseRestApiClient:
+        return FakeBlaiseRestApiClient()
+
+    @pytest.fixture()
+    def blaise_service(self, fake_client) -> BlaiseService:
+        config = get_default_config()
+        config.blaise_write_rate_limit = 0
+        config.blaise_write_initial_concurrency = 2
+        config.blaise_write_max_concurrency = 6
+        config.blaise_write_latency_target_seconds = 0.05
+        blaise_service = BlaiseService(config)
+        blaise_service.restapi_client = fake_client
+        return blaise_service
+
+    def test_limit_rises_while_writes_are_fast(self, blaise_service, fake_client):
+        # arrange
+        fake_client.write_latency_seconds = 0.002
+        donor_case_service = DonorCaseService(blaise_service)
+        users = [f"user{number}" for number in range(40)]
+
+        # act
+        result = donor_case_service.check_and_create_donor_case_for_users(
+            "IPS2406a", "guid", users
+        )
+
+        # assert
+        stats = get_concurrency_limiter_stats()[0]
+        assert sorted(result.created) == sorted(users)
+        assert len(fake_client.cases) == 40
+        assert stats["limit"] == 6
+        assert stats["limit_increases"] == 4
+        assert stats["limit_decreases"] == 0
+        assert fake_client.max_concurrent_writes <= 6
+
+    def test_limit_holds_while_writes_are_slower_than_target(
+        self, blaise_service, fake_client
+    ):
+        # arrange
+        fake_client.script_writes(*[(0.06, None)] * 6)
+
+        # act
+        for number in range(6):
+            blaise_service.create_donor_case_for_user(
+                DonorCaseModel(f"user{number}", "IPS2406a", "guid")
+            )
+
+        # assert
+        assert get_concurrency_limiter_stats()[0]["limit"] == 2
+
+    def test_limit_is_cut_on_429_and_5xx_responses(self, blaise_service, fake_client):
+        # arrange
+        fake_client.script_writes(*[(0.0, None)] * 20, (0.0, 429), (0.0, 503))
+
+        # act
+        for number in range(22):
+            try:
+                blaise_service.create_donor_case_for_user(
+                    DonorCaseModel(f"user{number}", "IPS2406a", "guid")
+                )
+            except BlaiseError:
+                pass
+
+        # assert
+        stats = get_concurrency_limiter_stats()[0]
+        assert [h["new_limit"] for h in stats["limit_history"]] == [3, 4, 5, 6, 3, 1]
+        assert stats["limit"] == 1
+        assert stats["limit_decreases"] == 2
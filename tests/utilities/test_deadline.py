@@ -0,0 +1,80 @@
+from unittest import mock
+
+import pytest
+
+from tests.helpers import get_default_config
+from utilities.custom_exceptions import DeadlineExceeded
+from utilities.deadline import (
+    Deadline,
+    check_deadline,
+    deadline_scope,
+    get_current_deadline,
+)
+
+
+class TestDeadline:
+    def test_deadline_is_not_expired_while_budget_remains(self):
+        # act
+        deadline = Deadline(60)
+
+        # assert
+        assert deadline.expired() is False
+        assert 59 < deadline.remaining() <= 60
+
+    def test_deadline_is_expired_once_budget_is_used(self):
+        # act
+        deadline = Deadline(0)
+
+        # assert
+        assert deadline.expired() is True
+        assert deadline.remaining() == 0.0
+
+    def test_from_config_subtracts_the_safety_margin(self):
+        # arrange
+        config = get_default_config()
+        config.request_deadline_seconds = 60
+        config.deadline_margin_seconds = 10
+
+        # act
+        deadline = Deadline.from_config(config)
+
+        # assert
+        assert deadline.budget_seconds == 50
+
+
+class TestDeadlineScope:
+    def test_deadline_scope_sets_and_resets_the_current_deadline(self):
+        # arrange
+        deadline = Deadline(60)
+
+        # act & assert
+        with deadline_scope(deadline):
+            assert get_current_deadline() is deadline
+        assert get_current_deadline() is None
+
+    def test_check_deadline_does_nothing_without_a_deadline(self):
+        # act & assert
+        check_deadline("creating donor case")
+
+    def test_check_deadline_raises_when_current_deadline_has_expired(self):
+        # act
+        with deadline_scope(Deadline(0)):
+            with pytest.raises(DeadlineExceeded) as err:
+                check_deadline("creating donor case")
+
+        # assert
+        assert (
+            err.value.message
+            == "Request deadline of 0s exceeded before creating donor case"
+        )
+
+    @mock.patch("utilities.deadline.time.monotonic")
+    def test_check_deadline_does_not_raise_before_the_deadline(self, mock_monotonic):
+        # arrange
+        mock_monotonic.return_value = 100.0
+        deadline = Deadline(30)
+        mock_monotonic.return_value = 129.0
+
+        # act & assert
+        with deadline_scope(deadline):
+            check_deadline("creating donor case")
@@ -0,0 +1,54 @@
+import pytest
+
+from models.run_digest_model import RunDigest
+from utilities.digest_store import InMemoryDigestStore, LocalFileDigestStore
+
+
+def run_digest(role: str = "IPS Field Interviewer") -> RunDigest:
+    return RunDigest("IPS2403a", role, "some-guid", "users-hash", 42)
+
+
+@pytest.fixture(params=["memory", "file"])
+def digest_store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryDigestStore()
+    return LocalFileDigestStore(str(tmp_path / "digests"))
+
+
+class TestDigestStore:
+    def test_saved_digest_is_loaded_back_by_questionnaire_and_role(self, digest_store):
+        # arrange
+        digest = run_digest()
+
+        # act
+        digest_store.save(digest)
+
+        # assert
+        assert digest_store.load("IPS2403a", "IPS Field Interviewer") == digest
+        assert digest_store.load("IPS2403a", "IPS Manager") is None
+
+    def test_deleted_digest_is_not_loaded(self, digest_store):
+        # arrange
+        digest_store.save(run_digest())
+
+        # act
+        digest_store.delete("IPS2403a", "IPS Field Interviewer")
+
+        # assert
+        assert digest_store.load("IPS2403a", "IPS Field Interviewer") is None
+
+
+class TestLocalFileDigestStore:
+    def test_unreadable_digest_is_treated_as_missing(self, tmp_path, caplog):
+        # arrange
+        digest_store = LocalFileDigestStore(str(tmp_path))
+        digest_store.save(run_digest("../../IPS Manager"))
+        (digest_file,) = tmp_path.glob("*.json")
+        digest_file.write_text("That's what she said")
+
+        # act
+        digest = digest_store.load("IPS2403a", "../../IPS Manager")
+
+        # assert
+        assert digest is None
+        assert caplog.records[-1].message.startswith("Ignoring unreadable run digest")
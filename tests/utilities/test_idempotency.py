@@ -0,0 +1,151 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import cast
+
+import flask
+import pytest
+
+from utilities.idempotency import idempotent
+from utilities.idempotency_store import InMemoryIdempotencyStore
+
+
+@pytest.fixture()
+def idempotency_store() -> InMemoryIdempotencyStore:
+    return InMemoryIdempotencyStore()
+
+
+def create_request(idempotency_key=None, json=None) -> flask.Request:
+    headers = {"Idempotency-Key": idempotency_key} if idempotency_key else {}
+    # from_values builds an instance of the class it is called on, werkzeug's stubs just don't say so
+    return cast(
+        flask.Request,
+        flask.Request.from_values(
+            json=json or {"questionnaire_name": "IPS2403a", "user": "jim"},
+            headers=headers,
+        ),
+    )
+
+
+def counting_handler(idempotency_store, responses):
+    calls = []
+
+    @idempotent("reissue_new_donor_case", "Error reissuing", lambda: idempotency_store)
+    def handler(request):
+        calls.append(request)
+        return responses[len(calls) - 1]
+
+    return handler, calls
+
+
+class TestIdempotent:
+    def test_retry_with_the_same_key_gets_the_stored_response(self, idempotency_store):
+        # arrange
+        handler, calls = counting_handler(idempotency_store, [("Reissued jim", 200)])
+        handler(create_request("abc"))
+
+        # act
+        result = handler(create_request("abc"))
+
+        # assert
+        assert result == ("Reissued jim", 200, {"Idempotent-Replayed": "true"})
+        assert len(calls) == 1
+
+    def test_requests_without_a_key_always_run(self, idempotency_store):
+        # arrange
+        handler, calls = counting_handler(
+            idempotency_store, [("Reissued jim", 200), ("Reissued jim", 200)]
+        )
+
+        # act
+        handler(create_request())
+        handler(create_request())
+
+        # assert
+        assert len(calls) == 2
+
+    def test_failed_responses_are_not_stored(self, idempotency_store):
+        # arrange
+        handler, calls = counting_handler(
+            idempotency_store, [("Blaise is down", 500), ("Reissued jim", 200)]
+        )
+        handler(create_request("abc"))
+
+        # act
+        result = handler(create_request("abc"))
+
+        # assert
+        assert result == ("Reissued jim", 200)
+        assert len(calls) == 2
+
+    def test_partial_responses_are_not_replayed(self, idempotency_store):
+        # arrange
+        handler, calls = counting_handler(
+            idempotency_store,
+            [
+                ("Created: 1, remaining: 2", 202),
+                ("Successfully created donor cases", 200),
+            ],
+        )
+        handler(create_request("abc"))
+
+        # act
+        result = handler(create_request("abc"))
+
+        # assert
+        assert result == ("Successfully created donor cases", 200)
+        assert len(calls) == 2
+
+    def test_key_reused_with_a_different_request_is_rejected(self, idempotency_store):
+        # arrange
+        handler, calls = counting_handler(idempotency_store, [("Reissued jim", 200)])
+        handler(create_request("abc"))
+
+        # act
+        result = handler(
+            create_request("abc", {"questionnaire_name": "IPS2403a", "user": "pam"})
+        )
+
+        # assert
+        assert result == (
+            "Error reissuing: Idempotency-Key abc was already used with a different request",
+            422,
+        )
+        assert len(calls) == 1
+
+    def test_invalid_key_is_rejected(self, idempotency_store):
+        # arrange
+        handler, calls = counting_handler(idempotency_store, [])
+
+        # act
+        message, status_code = handler(create_request("not a key"))
+
+        # assert
+        assert status_code == 400
+        assert calls == []
+
+    def test_retry_arriving_during_the_first_call_waits_for_its_response(
+        self, idempotency_store
+    ):
+        # arrange
+        started = threading.Event()
+        calls = []
+
+        @idempotent(
+            "reissue_new_donor_case", "Error reissuing", lambda: idempotency_store
+        )
+        def handler(request):
+            calls.append(request)
+            started.set()
+            time.sleep(0.1)
+            return "Reissued jim", 200
+
+        # act
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(handler, create_request("abc"))
+            started.wait()
+            retry = executor.submit(handler, create_request("abc"))
+
+        # assert
+        assert first.result() == retry.result() == ("Reissued jim", 200)
+        assert len(calls) == 1
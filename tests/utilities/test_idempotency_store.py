@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from models.idempotent_response_model import IdempotentResponse
+from utilities.idempotency_store import (
+    InMemoryIdempotencyStore,
+    SqliteIdempotencyStore,
+)
+
+
+def idempotent_response(
+    key: str = "reissue_new_donor_case:abc", expires_in: float = 60
+) -> IdempotentResponse:
+    return IdempotentResponse(
+        key,
+        "request-hash",
+        "Successfully reissued new donor case for user: jim",
+        200,
+        time.time() + expires_in,
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def idempotency_store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryIdempotencyStore()
+    return SqliteIdempotencyStore(str(tmp_path / "idempotency" / "store.sqlite3"))
+
+
+class TestIdempotencyStore:
+    def test_saved_response_is_loaded_back_by_key(self, idempotency_store):
+        # arrange
+        response = idempotent_response()
+
+        # act
+        idempotency_store.save(response)
+
+        # assert
+        assert idempotency_store.load("reissue_new_donor_case:abc") == response
+        assert idempotency_store.load("reissue_new_donor_case:xyz") is None
+
+    def test_expired_response_is_not_loaded(self, idempotency_store):
+        # arrange
+        idempotency_store.save(idempotent_response(expires_in=-1))
+
+        # act
+        result = idempotency_store.load("reissue_new_donor_case:abc")
+
+        # assert
+        assert result is None
+
+    def test_deleted_response_is_not_loaded(self, idempotency_store):
+        # arrange
+        idempotency_store.save(idempotent_response())
+
+        # act
+        idempotency_store.delete("reissue_new_donor_case:abc")
+
+        # assert
+        assert idempotency_store.load("reissue_new_donor_case:abc") is None
+
+
+class TestSqliteIdempotencyStore:
+    def test_responses_are_shared_between_store_instances(self, tmp_path):
+        # arrange
+        path = str(tmp_path / "store.sqlite3")
+        SqliteIdempotencyStore(path).save(idempotent_response())
+
+        # act
+        result = SqliteIdempotencyStore(path).load("reissue_new_donor_case:abc")
+
+        # assert
+        assert result.status_code == 200
+
+    def test_unusable_database_is_treated_as_missing(self, tmp_path, caplog):
+        # arrange
+        path = tmp_path / "store.sqlite3"
+        path.write_text("not a database")
+        idempotency_store = SqliteIdempotencyStore(str(path))
+
+        # act
+        result = idempotency_store.load("reissue_new_donor_case:abc")
+
+        # assert
+        assert result is None
+        assert caplog.records[0].levelname == "WARNING"
@@ -0,0 +1,141 @@
+import logging
+import time
+
+import flask
+import pytest
+
+from appconfig.config import Config
+from tests.helpers import get_default_config
+from utilities.profiling import PROFILING_HEADER, get_profiling_mode, profiled
+
+
+def busy_work(request):
+    end_time = time.perf_counter() + 0.05
+    total = 0
+    while time.perf_counter() < end_time:
+        total += sum(range(100))
+    return "done", 200
+
+
+def get_config() -> Config:
+    config = get_default_config()
+    config.profiling_sample_interval_ms = 1
+    return config
+
+
+@pytest.fixture(autouse=True)
+def profiling_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("PROFILING_MODE", raising=False)
+    monkeypatch.delenv("PROFILING_HEADER_ENABLED", raising=False)
+    monkeypatch.setenv("PROFILING_OUTPUT_DIR", str(tmp_path))
+
+
+class TestGetProfilingMode:
+    def test_get_profiling_mode_returns_none_when_not_configured(self):
+        # arrange
+        request = flask.Request.from_values(json={})
+
+        # act & assert
+        assert get_profiling_mode(request) is None
+
+    def test_get_profiling_mode_returns_the_environment_mode(self, monkeypatch):
+        # arrange
+        monkeypatch.setenv("PROFILING_MODE", "cProfile")
+
+        # act & assert
+        assert get_profiling_mode(None) == "cprofile"
+
+    def test_get_profiling_mode_ignores_the_header_unless_enabled(self):
+        # arrange
+        request = flask.Request.from_values(headers={PROFILING_HEADER: "sample"})
+
+        # act & assert
+        assert get_profiling_mode(request) is None
+
+    def test_get_profiling_mode_returns_the_header_mode_when_enabled(self, monkeypatch):
+        # arrange
+        monkeypatch.setenv("PROFILING_HEADER_ENABLED", "true")
+        request = flask.Request.from_values(headers={PROFILING_HEADER: "sample"})
+
+        # act & assert
+        assert get_profiling_mode(request) == "sample"
+
+    def test_get_profiling_mode_logs_and_ignores_unknown_modes(
+        self, monkeypatch, caplog
+    ):
+        # arrange
+        monkeypatch.setenv("PROFILING_MODE", "vibes")
+
+        # act
+        with caplog.at_level(logging.WARNING):
+            result = get_profiling_mode(None)
+
+        # assert
+        assert result is None
+        assert (
+            "root",
+            logging.WARNING,
+            "Ignoring unknown profiling mode 'vibes'. Valid modes are: ['cprofile', 'sample']",
+        ) in caplog.record_tuples
+
+
+class TestProfiled:
+    def test_profiled_returns_the_handler_response_without_profiling(self, tmp_path):
+        # act
+        result = profiled("busy_work", get_config)(busy_work)(None)
+
+        # assert
+        assert result == ("done", 200)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_profiled_writes_cprofile_stats_and_logs_a_summary(
+        self, monkeypatch, tmp_path, caplog
+    ):
+        # arrange
+        monkeypatch.setenv("PROFILING_MODE", "cprofile")
+
+        # act
+        with caplog.at_level(logging.INFO):
+            result = profiled("busy_work", get_config)(busy_work)(None)
+
+        # assert
+        assert result == ("done", 200)
+        assert len(list(tmp_path.glob("busy_work-*.prof"))) == 1
+        assert any(
+            "Profiling summary (cprofile) for 'busy_work'" in message
+            and "busy_work (test_profiling.py" in message
+            for message in caplog.messages
+        )
+
+    def test_profiled_writes_collapsed_stacks_and_logs_a_summary(
+        self, monkeypatch, tmp_path, caplog
+    ):
+        # arrange
+        monkeypatch.setenv("PROFILING_MODE", "sample")
+
+        # act
+        with caplog.at_level(logging.INFO):
+            result = profiled("busy_work", get_config)(busy_work)(None)
+
+        # assert
+        assert result == ("done", 200)
+        stacks_files = list(tmp_path.glob("busy_work-*.collapsed"))
+        assert len(stacks_files) == 1
+        assert "busy_work (test_profiling.py" in stacks_files[0].read_text()
+        assert any(
+            "Profiling summary (sample) for 'busy_work'" in message
+            for message in caplog.messages
+        )
+
+    def test_profiled_runs_the_handler_unprofiled_without_a_valid_config(
+        self, monkeypatch, tmp_path
+    ):
+        # arrange
+        monkeypatch.setenv("PROFILING_MODE", "cprofile")
+
+        # act
+        result = profiled("busy_work", lambda: None)(busy_work)(None)
+
+        # assert
+        assert result == ("done", 200)
+        assert list(tmp_path.iterdir()) == []
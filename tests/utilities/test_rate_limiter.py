@@ -0,0 +1,152 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from utilities.custom_exceptions import DeadlineExceeded
+from utilities.deadline import Deadline, deadline_scope
+from utilities.rate_limiter import (
+    TokenBucket,
+    acquire_within_deadline,
+    get_rate_limiter,
+    get_rate_limiter_stats,
+)
+
+
+@pytest.fixture()
+def mock_clock():
+    with mock.patch("utilities.rate_limiter.time") as mock_time:
+        mock_time.monotonic.return_value = 1000.0
+        yield mock_time
+
+
+class TestTokenBucket:
+    def test_acquire_does_not_wait_while_burst_capacity_remains(self, mock_clock):
+        # arrange
+        limiter = TokenBucket("blaise_write", rate_per_second=10, capacity=3)
+
+        # act
+        waits = [limiter.acquire() for _ in range(3)]
+
+        # assert
+        assert waits == [0.0, 0.0, 0.0]
+        mock_clock.sleep.assert_not_called()
+
+    def test_acquire_waits_for_tokens_once_capacity_is_used(self, mock_clock):
+        # arrange
+        limiter = TokenBucket("blaise_write", rate_per_second=10, capacity=2)
+        limiter.acquire()
+        limiter.acquire()
+
+        # act
+        first_wait = limiter.acquire()
+        second_wait = limiter.acquire()
+
+        # assert
+        assert first_wait == pytest.approx(0.1)
+        assert second_wait == pytest.approx(0.2)
+        assert mock_clock.sleep.call_args_list == [
+            mock.call(pytest.approx(0.1)),
+            mock.call(pytest.approx(0.2)),
+        ]
+
+    def test_acquire_refills_tokens_over_time(self, mock_clock):
+        # arrange
+        limiter = TokenBucket("blaise_write", rate_per_second=10, capacity=2)
+        limiter.acquire()
+        limiter.acquire()
+
+        # act
+        mock_clock.monotonic.return_value = 1000.5
+        wait = limiter.acquire()
+
+        # assert
+        assert wait == 0.0
+
+    def test_acquire_never_waits_when_unlimited(self, mock_clock):
+        # arrange
+        limiter = TokenBucket("blaise_read", rate_per_second=0, capacity=1)
+
+        # act
+        waits = [limiter.acquire() for _ in range(100)]
+
+        # assert
+        assert set(waits) == {0.0}
+
+    def test_acquire_raises_deadline_exceeded_when_the_wait_exceeds_the_timeout(
+        self, mock_clock
+    ):
+        # arrange
+        limiter = TokenBucket("blaise_write", rate_per_second=1, capacity=1)
+        limiter.acquire()
+
+        # act & assert
+        with pytest.raises(DeadlineExceeded):
+            limiter.acquire(timeout=0.5)
+        assert limiter.acquire(timeout=1.5) == pytest.approx(1.0)
+
+    def test_stats_report_wait_time_metrics(self, mock_clock):
+        # arrange
+        limiter = TokenBucket("blaise_write", rate_per_second=10, capacity=1)
+
+        # act
+        for _ in range(3):
+            limiter.acquire()
+
+        # assert
+        stats = limiter.stats()
+        assert stats["acquisitions"] == 3
+        assert stats["throttled"] == 2
+        assert stats["total_wait_seconds"] == pytest.approx(0.3)
+        assert stats["max_wait_seconds"] == pytest.approx(0.2)
+
+    def test_acquire_is_thread_safe(self):
+        # arrange
+        limiter = TokenBucket("blaise_read", rate_per_second=1_000_000, capacity=1000)
+
+        # act
+        threads = [
+            threading.Thread(target=lambda: [limiter.acquire() for _ in range(100)])
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # assert
+        assert limiter.stats()["acquisitions"] == 1000
+
+
+class TestRateLimiterRegistry:
+    def test_get_rate_limiter_returns_a_process_wide_limiter(self):
+        # act
+        first = get_rate_limiter("blaise_read", 20, 20)
+        second = get_rate_limiter("blaise_read", 20, 20)
+
+        # assert
+        assert first is second
+        assert [stats["name"] for stats in get_rate_limiter_stats()] == ["blaise_read"]
+
+    def test_get_rate_limiter_applies_new_configuration(self):
+        # arrange
+        first = get_rate_limiter("blaise_write", 10, 10)
+
+        # act
+        second = get_rate_limiter("blaise_write", 5, 2)
+
+        # assert
+        assert second is first
+        assert (second.rate_per_second, second.capacity) == (5, 2)
+
+    def test_acquire_within_deadline_uses_the_remaining_deadline_as_the_timeout(
+        self, mock_clock
+    ):
+        # arrange
+        limiter = TokenBucket("blaise_write", rate_per_second=1, capacity=1)
+        limiter.acquire()
+
+        # act & assert
+        with deadline_scope(Deadline(0)):
+            with pytest.raises(DeadlineExceeded):
+                acquire_within_deadline(limiter)
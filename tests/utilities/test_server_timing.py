@@ -0,0 +1,51 @@
+import flask
+
+from utilities.server_timing import add_server_timing_header, format_server_timing
+
+
+class TestFormatServerTiming:
+    def test_format_server_timing_reports_phases_in_handler_order(self):
+        # act
+        server_timing = format_server_timing(
+            52.04,
+            [
+                ("donor_case_handler", 40.0),
+                ("blaise_handler", 1.5),
+                ("request_handler", 0.25),
+                ("guid_handler", 2.0),
+                ("blaise.get_users", 9.0),
+            ],
+            blaise_reads=4,
+            blaise_writes=2,
+            cache_hits=1,
+            cache_misses=3,
+        )
+
+        # assert
+        assert server_timing == (
+            "validation;dur=0.2, questionnaire;dur=3.5, writes;dur=40.0, "
+            'blaise_reads;desc="4", blaise_writes;desc="2", '
+            'cache_hits;desc="1", cache_misses;desc="3", total;dur=52.0'
+        )
+
+
+class TestAddServerTimingHeader:
+    def test_add_server_timing_header_sets_the_header_on_the_response(self):
+        # arrange
+        app = flask.Flask(__name__)
+
+        @app.route("/")
+        def view():
+            add_server_timing_header("total;dur=1.0")
+            return "Hello from Scranton", 200
+
+        # act
+        response = app.test_client().get("/")
+
+        # assert
+        assert response.headers["Server-Timing"] == "total;dur=1.0"
+        assert response.get_data(as_text=True) == "Hello from Scranton"
+
+    def test_add_server_timing_header_does_nothing_outside_a_request(self):
+        # act & assert
+        add_server_timing_header("total;dur=1.0")
@@ -0,0 +1,111 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utilities.custom_exceptions import DeadlineExceeded
+from utilities.deadline import Deadline, deadline_scope
+from utilities.single_flight import SingleFlight
+
+
+def run_concurrently(single_flight, key, func, callers):
+    started = threading.Barrier(callers)
+
+    def call():
+        started.wait()
+        return single_flight.do(key, func)
+
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        futures = [executor.submit(call) for _ in range(callers)]
+    return futures
+
+
+class TestSingleFlight:
+    def test_do_executes_once_and_shares_the_result_with_concurrent_callers(self):
+        # arrange
+        single_flight = SingleFlight("test")
+        calls = []
+
+        def slow_call():
+            calls.append(1)
+            time.sleep(0.1)
+            return ["jim", "pam"]
+
+        # act
+        futures = run_concurrently(single_flight, "users", slow_call, callers=5)
+
+        # assert
+        assert [future.result() for future in futures] == [["jim", "pam"]] * 5
+        assert len(calls) == 1
+        assert single_flight.stats() == {
+            "name": "test",
+            "executions": 1,
+            "shared": 4,
+            "in_flight": 0,
+        }
+
+    def test_do_shares_the_leaders_exception_with_concurrent_callers(self):
+        # arrange
+        single_flight = SingleFlight("test")
+
+        def failing_call():
+            time.sleep(0.1)
+            raise Exception("Dunder Mifflin is unavailable")
+
+        # act
+        futures = run_concurrently(single_flight, "users", failing_call, callers=3)
+
+        # assert
+        for future in futures:
+            with pytest.raises(Exception, match="Dunder Mifflin is unavailable"):
+                future.result()
+        assert single_flight.stats()["executions"] == 1
+
+    def test_do_executes_again_once_the_previous_call_has_finished(self):
+        # arrange
+        single_flight = SingleFlight("test")
+        calls = []
+
+        # act
+        single_flight.do("users", calls.append, 1)
+        single_flight.do("users", calls.append, 2)
+
+        # assert
+        assert calls == [1, 2]
+        assert single_flight.stats()["shared"] == 0
+
+    def test_do_does_not_share_calls_with_different_keys(self):
+        # arrange
+        single_flight = SingleFlight("test")
+
+        # act
+        first = single_flight.do(("cases", "guid-1"), lambda: "first")
+        second = single_flight.do(("cases", "guid-2"), lambda: "second")
+
+        # assert
+        assert (first, second) == ("first", "second")
+        assert single_flight.stats()["executions"] == 2
+
+    def test_do_raises_deadline_exceeded_when_a_follower_runs_out_of_time(self):
+        # arrange
+        single_flight = SingleFlight("test")
+        leader_started = threading.Event()
+        release_leader = threading.Event()
+
+        def blocked_call():
+            leader_started.set()
+            release_leader.wait()
+            return "done"
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(single_flight.do, "users", blocked_call)
+            leader_started.wait()
+
+            # act & assert
+            with deadline_scope(Deadline(0.05)):
+                with pytest.raises(DeadlineExceeded, match="shared test call"):
+                    single_flight.do("users", blocked_call)
+
+            release_leader.set()
+            assert leader.result() == "done"
@@ -0,0 +1,116 @@
+from unittest import mock
+
+import pytest
+
+from appconfig.config import Config
+from models.shard_model import ShardResult, ShardTask
+from utilities.deadline import Deadline, deadline_scope
+from utilities.task_transport import (
+    HttpTaskTransport,
+    LocalQueueTransport,
+    get_task_transport,
+)
+
+
+@pytest.fixture()
+def task() -> ShardTask:
+    return ShardTask("IPS2402a", "some-guid", "IPS Manager", 0, 1, ["jim"])
+
+
+class TestHttpTaskTransport:
+    @pytest.fixture(autouse=True)
+    def mock_fetch_id_token(self):
+        with mock.patch(
+            "utilities.task_transport.google.oauth2.id_token.fetch_id_token",
+            return_value="id-token",
+        ) as mock_fetch_id_token:
+            yield mock_fetch_id_token
+
+    @mock.patch("utilities.task_transport.requests.post")
+    def test_dispatch_posts_the_shard_to_the_worker_url(self, mock_post, task):
+        # arrange
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.json.return_value = {
+            "shard_index": 0,
+            "created": ["jim"],
+            "remaining": [],
+        }
+        transport = HttpTaskTransport("http://worker/create_donor_cases_shard", 1)
+
+        # act
+        with deadline_scope(Deadline(30)):
+            result = transport.dispatch(task).result()
+
+        # assert
+        assert result == ShardResult(0, created=["jim"])
+        assert mock_post.call_args[0][0] == "http://worker/create_donor_cases_shard"
+        assert mock_post.call_args[1]["json"] == task.to_dict()
+        assert 0 < mock_post.call_args[1]["timeout"] <= 30
+
+    @mock.patch("utilities.task_transport.requests.post")
+    def test_dispatch_authenticates_with_an_id_token_for_the_worker_url(
+        self, mock_post, mock_fetch_id_token, task
+    ):
+        # arrange
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.json.return_value = {"shard_index": 0}
+        transport = HttpTaskTransport("http://worker/create_donor_cases_shard", 1)
+
+        # act
+        transport.dispatch(task).result()
+        transport.dispatch(task).result()
+
+        # assert
+        assert mock_post.call_args[1]["headers"] == {"Authorization": "Bearer id-token"}
+        mock_fetch_id_token.assert_called_once()
+        assert (
+            mock_fetch_id_token.call_args[0][1]
+            == "http://worker/create_donor_cases_shard"
+        )
+
+    @mock.patch("utilities.task_transport.requests.post")
+    def test_dispatch_does_not_send_the_shard_without_an_id_token(
+        self, mock_post, mock_fetch_id_token, task
+    ):
+        # arrange
+        mock_fetch_id_token.side_effect = Exception("No service account credentials")
+        transport = HttpTaskTransport("http://worker", 1)
+
+        # act & assert
+        with pytest.raises(Exception, match="No service account credentials"):
+            transport.dispatch(task).result()
+        mock_post.assert_not_called()
+
+    @mock.patch("utilities.task_transport.requests.post")
+    def test_dispatch_raises_when_the_worker_returns_an_error(self, mock_post, task):
+        # arrange
+        mock_post.return_value.status_code = 500
+        mock_post.return_value.text = "Error creating IPS donor cases shard"
+        transport = HttpTaskTransport("http://worker", 1)
+
+        # act & assert
+        with pytest.raises(Exception, match="Shard 0 worker returned 500"):
+            transport.dispatch(task).result()
+
+
+class TestGetTaskTransport:
+    def test_get_task_transport_returns_a_local_queue_by_default(self):
+        # act
+        transport = get_task_transport(
+            Config(blaise_api_url="foo", blaise_server_park="bar"), mock.Mock()
+        )
+
+        # assert
+        assert isinstance(transport, LocalQueueTransport)
+
+    def test_get_task_transport_returns_an_http_transport_when_configured(self):
+        # arrange
+        config = Config(
+            blaise_api_url="foo",
+            blaise_server_park="bar",
+            orchestrator_transport="http",
+            orchestrator_worker_url="http://worker",
+        )
+
+        # act & assert
+        assert isinstance(get_task_transport(config, mock.Mock()), HttpTaskTransport)
@@ -0,0 +1,215 @@
+import json
+from unittest import mock
+
+import pytest
+
+from utilities.tracing import (
+    JsonFileSpanExporter,
+    LatencyStatsExporter,
+    Span,
+    Tracer,
+    get_current_span,
+    set_span_attribute,
+    traced,
+    traced_handler,
+    tracer,
+)
+
+
+@pytest.fixture()
+def test_tracer() -> Tracer:
+    return Tracer()
+
+
+class TestTracer:
+    def test_start_as_current_span_records_a_finished_span(self, test_tracer):
+        # act
+        with test_tracer.start_as_current_span("config_handler", {"foo": "bar"}):
+            pass
+
+        # assert
+        spans = test_tracer.in_memory_exporter.get_finished_spans()
+        assert len(spans) == 1
+        assert spans[0].name == "config_handler"
+        assert spans[0].attributes == {"foo": "bar"}
+        assert spans[0].status_code == "OK"
+        assert spans[0].end_time_unix_nano >= spans[0].start_time_unix_nano
+
+    def test_nested_spans_share_a_trace_id_and_link_to_their_parent(self, test_tracer):
+        # act
+        with test_tracer.start_as_current_span("create_donor_cases") as parent:
+            with test_tracer.start_as_current_span("user_handler") as child:
+                assert get_current_span() is child
+            assert get_current_span() is parent
+
+        # assert
+        assert child.trace_id == parent.trace_id
+        assert child.parent_span_id == parent.span_id
+        assert parent.parent_span_id is None
+        assert get_current_span() is None
+
+    def test_span_is_marked_as_error_and_exception_is_reraised(self, test_tracer):
+        # act
+        with pytest.raises(ValueError):
+            with test_tracer.start_as_current_span("guid_handler"):
+                raise ValueError("Bears, beets, Battlestar Galactica")
+
+        # assert
+        span = test_tracer.in_memory_exporter.get_finished_spans()[0]
+        assert span.status_code == "ERROR"
+        assert span.status_message == "Bears, beets, Battlestar Galactica"
+
+    def test_set_span_attribute_sets_attribute_on_the_current_span(self, test_tracer):
+        # act
+        with test_tracer.start_as_current_span("blaise.get_users") as span:
+            set_span_attribute("blaise.user_count", 42)
+
+        # assert
+        assert span.attributes["blaise.user_count"] == 42
+
+    def test_set_span_attribute_does_nothing_without_a_current_span(self):
+        # act & assert
+        set_span_attribute("blaise.user_count", 42)
+
+    def test_get_finished_spans_filters_by_trace_id(self, test_tracer):
+        # arrange
+        with test_tracer.start_as_current_span("first") as first:
+            pass
+        with test_tracer.start_as_current_span("second"):
+            pass
+
+        # act
+        result = test_tracer.in_memory_exporter.get_finished_spans(first.trace_id)
+
+        # assert
+        assert [span.name for span in result] == ["first"]
+
+
+class TestTracedHandler:
+    @mock.patch("utilities.tracing.add_server_timing_header")
+    def test_server_timing_reports_phases_that_have_left_the_in_memory_exporter(
+        self, mock_add_server_timing_header
+    ):
+        # arrange
+        @traced("user_handler")
+        def get_users():
+            return ["dwight"]
+
+        @traced_handler("get_users_by_role")
+        def handler():
+            get_users()
+            # Spans from other requests can push this request's spans out of the exporter
+            tracer.in_memory_exporter.clear()
+            return "", 200
+
+        # act
+        handler()
+
+        # assert
+        assert "users;dur=" in mock_add_server_timing_header.call_args[0][0]
+
+    @mock.patch("utilities.tracing.add_server_timing_header")
+    def test_server_timing_only_reports_phases_from_its_own_invocation(
+        self, mock_add_server_timing_header
+    ):
+        # arrange
+        @traced("user_handler")
+        def get_users():
+            return ["dwight"]
+
+        @traced_handler("get_users_by_role")
+        def handler(with_users):
+            if with_users:
+                get_users()
+            return "", 200
+
+        # act
+        handler(True)
+        handler(False)
+
+        # assert
+        assert "users;dur=" not in mock_add_server_timing_header.call_args[0][0]
+
+
+class TestJsonFileSpanExporter:
+    def test_export_writes_otlp_json_lines(self, tmp_path):
+        # arrange
+        export_path = tmp_path / "spans.jsonl"
+        test_tracer = Tracer([JsonFileSpanExporter(str(export_path))])
+
+        # act
+        with test_tracer.start_as_current_span("donor_case_handler") as span:
+            span.set_attribute("donor_cases.created_count", 3)
+            span.set_attribute("request.role", "IPS Manager")
+
+        # assert
+        exported = [json.loads(line) for line in export_path.read_text().splitlines()]
+        assert len(exported) == 1
+        assert exported[0]["name"] == "donor_case_handler"
+        assert exported[0]["traceId"] == span.trace_id
+        assert exported[0]["status"] == {"code": "OK", "message": ""}
+        assert {
+            "key": "donor_cases.created_count",
+            "value": {"intValue": "3"},
+        } in exported[0]["attributes"]
+        assert {
+            "key": "request.role",
+            "value": {"stringValue": "IPS Manager"},
+        } in exported[0]["attributes"]
+
+
+def finished_span(name: str, duration_ms: float, status_code: str = "OK") -> Span:
+    return Span(
+        name,
+        "trace-id",
+        "span-id",
+        start_time_unix_nano=0,
+        end_time_unix_nano=int(duration_ms * 1_000_000),
+        status_code=status_code,
+    )
+
+
+class TestLatencyStatsExporter:
+    def test_get_latency_stats_reports_percentiles_per_span_name(self):
+        # arrange
+        exporter = LatencyStatsExporter()
+        for duration_ms in range(1, 101):
+            exporter.export(finished_span("blaise.get_users", duration_ms))
+        exporter.export(finished_span("blaise.get_questionnaire", 7, "ERROR"))
+
+        # act
+        stats = exporter.get_latency_stats()
+
+        # assert
+        assert stats["blaise.get_users"]["samples"] == 100
+        assert stats["blaise.get_users"]["p50_ms"] == pytest.approx(50, abs=0.01)
+        assert stats["blaise.get_users"]["p90_ms"] == pytest.approx(90, abs=0.01)
+        assert stats["blaise.get_users"]["p99_ms"] == pytest.approx(99, abs=0.01)
+        assert stats["blaise.get_users"]["max_ms"] == pytest.approx(100, abs=0.01)
+        assert stats["blaise.get_users"]["errors"] == 0
+        assert stats["blaise.get_questionnaire"]["errors"] == 1
+
+    def test_get_latency_stats_filters_by_prefix(self):
+        # arrange
+        exporter = LatencyStatsExporter()
+        exporter.export(finished_span("blaise.get_users", 5))
+        exporter.export(finished_span("create_donor_cases", 50))
+
+        # act
+        stats = exporter.get_latency_stats("blaise.")
+
+        # assert
+        assert list(stats) == ["blaise.get_users"]
+
+    def test_export_only_keeps_the_most_recent_samples(self):
+        # arrange
+        exporter = LatencyStatsExporter(max_samples=2)
+
+        # act
+        for duration_ms in (1000, 2, 3):
+            exporter.export(finished_span("blaise.get_users", duration_ms))
+
+        # assert
+        stats = exporter.get_latency_stats()["blaise.get_users"]
+        assert stats["samples"] == 2
+        assert stats["max_ms"] == pytest.approx(3, abs=0.01)
@@ -0,0 +1,83 @@
+from unittest import mock
+
+from utilities.ttl_cache import TTLCache, get_ttl_cache, get_ttl_cache_stats
+
+
+class TestTTLCache:
+    def test_get_or_load_loads_once_and_then_serves_the_cached_value(self):
+        # arrange
+        cache = TTLCache("users", ttl_seconds=60)
+        loader = mock.Mock(return_value=["jim", "pam"])
+
+        # act
+        first = cache.get_or_load("gusty", loader)
+        second = cache.get_or_load("gusty", loader)
+
+        # assert
+        assert first == second == ["jim", "pam"]
+        loader.assert_called_once()
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    @mock.patch("utilities.ttl_cache.time.monotonic")
+    def test_get_or_load_reloads_once_the_entry_has_expired(self, mock_monotonic):
+        # arrange
+        cache = TTLCache("users", ttl_seconds=60)
+        loader = mock.Mock(side_effect=[["jim"], ["jim", "pam"]])
+        mock_monotonic.return_value = 1000.0
+        cache.get_or_load("gusty", loader)
+
+        # act
+        mock_monotonic.return_value = 1061.0
+        result = cache.get_or_load("gusty", loader)
+
+        # assert
+        assert result == ["jim", "pam"]
+        assert loader.call_count == 2
+
+    def test_get_or_load_always_loads_when_the_ttl_is_zero(self):
+        # arrange
+        cache = TTLCache("users", ttl_seconds=0)
+        loader = mock.Mock(return_value=["jim"])
+
+        # act
+        cache.get_or_load("gusty", loader)
+        cache.get_or_load("gusty", loader)
+
+        # assert
+        assert loader.call_count == 2
+        assert cache.stats()["size"] == 0
+
+    def test_invalidate_removes_the_entry(self):
+        # arrange
+        cache = TTLCache("users", ttl_seconds=60)
+        cache.set("gusty", ["jim"])
+
+        # act
+        cache.invalidate("gusty")
+
+        # assert
+        assert cache.get("gusty") is None
+
+
+class TestGetTTLCache:
+    def test_get_ttl_cache_returns_the_same_cache_for_the_same_name(self):
+        # act
+        first = get_ttl_cache("users", 60)
+        second = get_ttl_cache("users", 60)
+
+        # assert
+        assert first is second
+        assert [stats["name"] for stats in get_ttl_cache_stats()] == ["users"]
+
+    def test_get_ttl_cache_clears_the_cache_when_the_ttl_changes(self):
+        # arrange
+        cache = get_ttl_cache("users", 60)
+        cache.set("gusty", ["jim"])
+
+        # act
+        get_ttl_cache("users", 30)
+
+        # assert
+        assert cache.ttl_seconds == 30
+        assert cache.get("gusty") is None
@@ -0,0 +1,187 @@
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional
+
+from appconfig.config import Config
+from utilities.custom_exceptions import AdmissionRejected
+from utilities.tracing import set_span_attribute
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout_seconds: float,
+    ) -> None:
+        self.name = name
+        self._condition = threading.Condition()
+        self.configure(max_concurrent, max_queue, queue_timeout_seconds)
+        self._in_flight = 0
+        self._queued = 0
+        self._admitted = 0
+        self._rejected = 0
+        # Smoothed duration of admitted operations, used to suggest a Retry-After
+        self._average_duration_seconds = 1.0
+
+    def configure(
+        self, max_concurrent: int, max_queue: int, queue_timeout_seconds: float
+    ) -> None:
+        with self._condition:
+            self.max_concurrent = max_concurrent
+            self.max_queue = max(0, max_queue)
+            self.queue_timeout_seconds = queue_timeout_seconds
+            self._condition.notify_all()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.max_concurrent <= 0
+
+    def retry_after_seconds(self) -> int:
+        slots = max(1, self.max_concurrent)
+        return max(
+            1, math.ceil(self._average_duration_seconds * (self._queued + 1) / slots)
+        )
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self._rejected += 1
+        retry_after_seconds = self.retry_after_seconds()
+        logging.warning(
+            f"Rejected {self.name} request, {reason}. Retry after {retry_after_seconds}s"
+        )
+        return AdmissionRejected(
+            f"Too many concurrent {self.name} requests on this instance, {reason}",
+            retry_after_seconds,
+        )
+
+    def _acquire(self) -> None:
+        with self._condition:
+            if self.unlimited or self._in_flight < self.max_concurrent:
+                self._in_flight += 1
+                self._admitted += 1
+                return
+            if self._queued >= self.max_queue:
+                raise self._reject("the wait queue is full")
+
+            self._queued += 1
+            try:
+                admitted = self._condition.wait_for(
+                    lambda: self.unlimited or self._in_flight < self.max_concurrent,
+                    self.queue_timeout_seconds,
+                )
+            finally:
+                self._queued -= 1
+            if not admitted:
+                raise self._reject(
+                    f"no slot became free within {self.queue_timeout_seconds}s"
+                )
+            self._in_flight += 1
+            self._admitted += 1
+
+    def _release(self, duration_seconds: float) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._average_duration_seconds = (
+                0.8 * self._average_duration_seconds + 0.2 * duration_seconds
+            )
+            self._condition.notify()
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        queued_at = time.monotonic()
+        self._acquire()
+        set_span_attribute(
+            f"admission.{self.name}.wait_ms",
+            round((time.monotonic() - queued_at) * 1000, 3),
+        )
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - start_time)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "name": self.name,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queued": self._queued,
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "average_duration_seconds": round(self._average_duration_seconds, 3),
+            }
+
+
+_admission_controllers: dict[str, AdmissionController] = {}
+_admission_controllers_lock = threading.Lock()
+
+
+def get_admission_controller(
+    name: str, max_concurrent: int, max_queue: int, queue_timeout_seconds: float
+) -> AdmissionController:
+    with _admission_controllers_lock:
+        controller = _admission_controllers.get(name)
+        if controller is None:
+            controller = AdmissionController(
+                name, max_concurrent, max_queue, queue_timeout_seconds
+            )
+            _admission_controllers[name] = controller
+        elif (
+            controller.max_concurrent,
+            controller.max_queue,
+            controller.queue_timeout_seconds,
+        ) != (max_concurrent, max(0, max_queue), queue_timeout_seconds):
+            controller.configure(max_concurrent, max_queue, queue_timeout_seconds)
+        return controller
+
+
+def get_admission_controller_stats() -> list[dict]:
+    with _admission_controllers_lock:
+        controllers = list(_admission_controllers.values())
+    return [controller.stats() for controller in controllers]
+
+
+def reset_admission_controllers() -> None:
+    with _admission_controllers_lock:
+        _admission_controllers.clear()
+
+
+def admission_controlled(
+    name: str,
+    error_message_prefix: str,
+    get_config: Callable[[], Optional[Config]],
+    format_body: Callable[[str], Any] = lambda message: message,
+):
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(*args, **kwargs):
+            config = get_config()
+            if config is None:
+                # Without a config the handler fails straight away and reports why
+                return handler(*args, **kwargs)
+            controller = get_admission_controller(
+                name,
+                getattr(config, f"admission_{name}_max_concurrent"),
+                getattr(config, f"admission_{name}_max_queue"),
+                config.admission_queue_timeout_seconds,
+            )
+            try:
+                with controller.admit():
+                    return handler(*args, **kwargs)
+            except AdmissionRejected as e:
+                return (
+                    format_body(f"{error_message_prefix}: {e}"),
+                    429,
+                    {"Retry-After": str(e.retry_after_seconds)},
+                )
+
+        return wrapper
+
+    return decorator
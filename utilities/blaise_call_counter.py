@@ -0,0 +1,143 @@
+import contextvars
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+BLAISE_WRITE_METHODS = frozenset({"create_multikey_case", "delete_multikey_case"})
+
+
+class BlaiseCallCounter:
+    def __init__(self, name: str, parent: Optional["BlaiseCallCounter"] = None) -> None:
+        self.name = name
+        self.parent = parent
+        self.calls: Counter = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def reads(self) -> int:
+        with self._lock:
+            return sum(
+                count
+                for method, count in self.calls.items()
+                if method not in BLAISE_WRITE_METHODS
+            )
+
+    @property
+    def writes(self) -> int:
+        with self._lock:
+            return sum(
+                count
+                for method, count in self.calls.items()
+                if method in BLAISE_WRITE_METHODS
+            )
+
+    def count(self, method: str) -> None:
+        # Outer scopes see nested calls too, so a test can count across a whole handler
+        counter: Optional[BlaiseCallCounter] = self
+        while counter is not None:
+            with counter._lock:
+                counter.calls[method] += 1
+            counter = counter.parent
+
+    def count_cache_lookup(self, hit: bool) -> None:
+        counter: Optional[BlaiseCallCounter] = self
+        while counter is not None:
+            with counter._lock:
+                if hit:
+                    counter.cache_hits += 1
+                else:
+                    counter.cache_misses += 1
+            counter = counter.parent
+
+
+_current_counter: contextvars.ContextVar[Optional[BlaiseCallCounter]] = (
+    contextvars.ContextVar("current_blaise_call_counter", default=None)
+)
+
+
+class _EndpointCallStats:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.invocations = 0
+        self.reads = 0
+        self.writes = 0
+        self.max_reads = 0
+        self.max_writes = 0
+
+    def record(self, counter: BlaiseCallCounter) -> None:
+        reads, writes = counter.reads, counter.writes
+        self.invocations += 1
+        self.reads += reads
+        self.writes += writes
+        self.max_reads = max(self.max_reads, reads)
+        self.max_writes = max(self.max_writes, writes)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "invocations": self.invocations,
+            "reads": self.reads,
+            "writes": self.writes,
+            "max_reads": self.max_reads,
+            "max_writes": self.max_writes,
+        }
+
+
+_endpoint_stats: dict[str, _EndpointCallStats] = {}
+_endpoint_stats_lock = threading.Lock()
+
+
+@contextmanager
+def counting_blaise_calls(name: str) -> Iterator[BlaiseCallCounter]:
+    counter = BlaiseCallCounter(name, _current_counter.get())
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+        with _endpoint_stats_lock:
+            if name not in _endpoint_stats:
+                _endpoint_stats[name] = _EndpointCallStats(name)
+            _endpoint_stats[name].record(counter)
+
+
+def count_blaise_call(method: str) -> None:
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.count(method)
+
+
+def count_cache_lookup(hit: bool) -> None:
+    # Cache hits are Blaise reads an invocation did not have to make
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.count_cache_lookup(hit)
+
+
+class CountingClient:
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    def __getattr__(self, method: str) -> Any:
+        func = getattr(self._client, method)
+        if not callable(func):
+            return func
+
+        def counted_call(*args, **kwargs):
+            count_blaise_call(method)
+            return func(*args, **kwargs)
+
+        return counted_call
+
+
+def get_blaise_call_stats() -> list[dict[str, Any]]:
+    with _endpoint_stats_lock:
+        return [stats.stats() for stats in _endpoint_stats.values()]
+
+
+def reset_blaise_call_stats() -> None:
+    with _endpoint_stats_lock:
+        _endpoint_stats.clear()
@@ -0,0 +1,237 @@
+import gzip
+import json
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Optional, TextIO, cast
+
+import blaise_restapi
+import requests
+
+from utilities.concurrency_limiter import get_status_code
+from utilities.custom_exceptions import CassetteError
+from utilities.regex import extract_username_from_case_id
+
+CASSETTE_MODES = ("off", "record", "replay")
+REDACTED = "REDACTED"
+REDACTED_KEYS = frozenset({"password", "Password"})
+
+
+def _open_cassette(path: str, mode: str) -> TextIO:
+    # Appending to a .gz file adds a gzip member, which gzip reads back as one stream
+    if path.endswith(".gz"):
+        return cast(TextIO, gzip.open(path, mode + "t", encoding="utf-8"))
+    return cast(TextIO, open(path, mode, encoding="utf-8"))
+
+
+def load_interactions(path: str) -> list[dict[str, Any]]:
+    with _open_cassette(path, "r") as cassette_file:
+        return [json.loads(line) for line in cassette_file if line.strip()]
+
+
+class CassetteSanitiser:
+    # Usernames are swapped for stable pseudonyms, so recorded writes still line up with recorded users
+    def __init__(self) -> None:
+        self._pseudonyms: dict[str, str] = {}
+        self._pattern: Optional[re.Pattern] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _find_usernames(method: str, response: Any) -> list[str]:
+        if method == "get_users" and isinstance(response, list):
+            return [
+                user["name"]
+                for user in response
+                if isinstance(user, dict) and user.get("name")
+            ]
+        if method == "get_questionnaire_data" and isinstance(response, dict):
+            # Existing cases can name users before the users download is recorded
+            return [
+                extract_username_from_case_id(case.get("id") or "")
+                for case in response.get("reportingData") or []
+                if isinstance(case, dict)
+            ]
+        return []
+
+    def _learn_usernames(self, method: str, response: Any) -> None:
+        usernames = self._find_usernames(method, response)
+        with self._lock:
+            for username in usernames:
+                if username and username not in self._pseudonyms:
+                    self._pseudonyms[username] = f"user-{len(self._pseudonyms) + 1:04d}"
+            if self._pseudonyms:
+                self._pattern = re.compile(
+                    "|".join(
+                        rf"(?<!\w){re.escape(username)}(?!\w)"
+                        for username in sorted(self._pseudonyms, key=len, reverse=True)
+                    )
+                )
+
+    def _scrub(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                key: REDACTED if key in REDACTED_KEYS else self._scrub(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, (list, tuple)):
+            return [self._scrub(item) for item in value]
+        if isinstance(value, str) and self._pattern is not None:
+            return self._pattern.sub(lambda match: self._pseudonyms[match[0]], value)
+        return value
+
+    def sanitise(self, interaction: dict[str, Any]) -> dict[str, Any]:
+        self._learn_usernames(interaction["method"], interaction.get("response"))
+        return self._scrub(interaction)
+
+
+class CassetteRecorder:
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._sanitiser = CassetteSanitiser()
+        self._lock = threading.Lock()
+
+    def record(self, interaction: dict[str, Any]) -> None:
+        line = json.dumps(
+            self._sanitiser.sanitise(interaction), separators=(",", ":"), default=str
+        )
+        with self._lock:
+            # Written per call, as a Cloud Functions instance has no shutdown hook
+            with _open_cassette(self._path, "a") as cassette_file:
+                cassette_file.write(line + "\n")
+
+
+class RecordingClient:
+    def __init__(self, client: Any, recorder: CassetteRecorder) -> None:
+        self._client = client
+        self._recorder = recorder
+
+    def __getattr__(self, method: str) -> Any:
+        func = getattr(self._client, method)
+        if not callable(func):
+            return func
+
+        def record_call(*args, **kwargs):
+            interaction: dict[str, Any] = {
+                "method": method,
+                "args": list(args),
+                "kwargs": kwargs,
+            }
+            start_time = time.perf_counter()
+            try:
+                interaction["response"] = func(*args, **kwargs)
+                return interaction["response"]
+            except Exception as e:
+                interaction["error"] = {
+                    "status_code": get_status_code(e),
+                    "message": str(e),
+                }
+                raise
+            finally:
+                interaction["duration_ms"] = round(
+                    (time.perf_counter() - start_time) * 1000, 3
+                )
+                self._recorder.record(interaction)
+
+        return record_call
+
+
+class ReplayError(requests.exceptions.HTTPError):
+    def __init__(self, message: str, status_code: Optional[int]) -> None:
+        response = requests.Response()
+        # Errors recorded without a status, such as timeouts, keep the response's unset default
+        if status_code is not None:
+            response.status_code = status_code
+        super().__init__(message, response=response)
+
+
+class ReplayClient:
+    # Calls are matched on method and arguments, so concurrent writes replay in any order
+    def __init__(
+        self, interactions: list[dict[str, Any]], replay_latency: bool = False
+    ) -> None:
+        self._interactions = interactions
+        self._used = [False] * len(interactions)
+        self._replay_latency = replay_latency
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str, replay_latency: bool = False) -> "ReplayClient":
+        return cls(load_interactions(path), replay_latency)
+
+    @property
+    def unused_interactions(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                interaction
+                for interaction, used in zip(self._interactions, self._used)
+                if not used
+            ]
+
+    def _take(self, method: str, args: list, kwargs: dict) -> dict[str, Any]:
+        # Arguments are compared in their JSON form, as they were recorded
+        call = json.loads(json.dumps({"args": list(args), "kwargs": kwargs}))
+        with self._lock:
+            for index, interaction in enumerate(self._interactions):
+                if (
+                    not self._used[index]
+                    and interaction["method"] == method
+                    and interaction["args"] == call["args"]
+                    and interaction.get("kwargs", {}) == call["kwargs"]
+                ):
+                    self._used[index] = True
+                    return interaction
+        raise CassetteError(
+            f"No recorded interaction left for {method} with arguments {args} {kwargs}"
+        )
+
+    def __getattr__(self, method: str) -> Callable:
+        def replay_call(*args, **kwargs):
+            interaction = self._take(method, list(args), kwargs)
+            if self._replay_latency:
+                time.sleep(interaction.get("duration_ms", 0) / 1000)
+            if "error" in interaction:
+                raise ReplayError(
+                    interaction["error"]["message"],
+                    interaction["error"]["status_code"],
+                )
+            return interaction.get("response")
+
+        return replay_call
+
+
+_recorders: dict[str, CassetteRecorder] = {}
+_replay_clients: dict[str, ReplayClient] = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_blaise_client(config) -> Any:
+    client = blaise_restapi.Client(f"http://{config.blaise_api_url}")
+    mode = config.blaise_cassette_mode
+    if mode == "off" or not mode:
+        return client
+    if mode not in CASSETTE_MODES or not config.blaise_cassette_path:
+        logging.warning(
+            f"Ignoring Blaise cassette mode '{mode}', "
+            f"it needs BLAISE_CASSETTE_PATH and one of {list(CASSETTE_MODES)}"
+        )
+        return client
+
+    # One recorder or replayer per file, so every service in the process shares it
+    path = config.blaise_cassette_path
+    with _cassettes_lock:
+        if mode == "record":
+            if path not in _recorders:
+                _recorders[path] = CassetteRecorder(path)
+            return RecordingClient(client, _recorders[path])
+        if path not in _replay_clients:
+            _replay_clients[path] = ReplayClient.from_file(
+                path, config.blaise_cassette_replay_latency
+            )
+        return _replay_clients[path]
+
+
+def reset_blaise_cassettes() -> None:
+    with _cassettes_lock:
+        _recorders.clear()
+        _replay_clients.clear()
@@ -0,0 +1,128 @@
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from models.checkpoint_model import Checkpoint
+from utilities.custom_exceptions import CheckpointError
+
+VALID_RESUME_TOKEN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class CheckpointStore(ABC):
+    @abstractmethod
+    def save(self, checkpoint: Checkpoint) -> None:
+        pass
+
+    @abstractmethod
+    def load(self, resume_token: str) -> Optional[Checkpoint]:
+        pass
+
+    @abstractmethod
+    def delete(self, resume_token: str) -> None:
+        pass
+
+
+class InMemoryCheckpointStore(CheckpointStore):
+    def __init__(self, ttl_seconds: float = 86400.0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._checkpoints: dict[str, tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        now = time.time()
+        with self._lock:
+            # Expired checkpoints are dropped on write so abandoned runs do not pile up
+            for resume_token in [
+                resume_token
+                for resume_token, (expires_at, _) in self._checkpoints.items()
+                if now >= expires_at
+            ]:
+                del self._checkpoints[resume_token]
+            self._checkpoints[checkpoint.resume_token] = (
+                now + self.ttl_seconds,
+                checkpoint.to_dict(),
+            )
+
+    def load(self, resume_token: str) -> Optional[Checkpoint]:
+        with self._lock:
+            entry = self._checkpoints.get(resume_token)
+        if entry is None or time.time() >= entry[0]:
+            return None
+        return Checkpoint.from_dict(entry[1])
+
+    def delete(self, resume_token: str) -> None:
+        with self._lock:
+            self._checkpoints.pop(resume_token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._checkpoints.clear()
+
+
+class LocalFileCheckpointStore(CheckpointStore):
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+
+    def _path(self, resume_token: str) -> str:
+        if not VALID_RESUME_TOKEN.match(resume_token):
+            raise CheckpointError(f"Invalid resume token '{resume_token}'")
+        return os.path.join(self._directory, f"{resume_token}.json")
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        path = self._path(checkpoint.resume_token)
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            # Write then rename so a killed invocation never leaves a torn checkpoint
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self._directory, suffix=".tmp", delete=False
+            ) as checkpoint_file:
+                json.dump(checkpoint.to_dict(), checkpoint_file)
+            os.replace(checkpoint_file.name, path)
+        except OSError as e:
+            error_message = (
+                f"Error saving checkpoint '{checkpoint.resume_token}' to {path}: {e}"
+            )
+            logging.error(error_message)
+            raise CheckpointError(error_message)
+
+    def load(self, resume_token: str) -> Optional[Checkpoint]:
+        path = self._path(resume_token)
+        try:
+            with open(path) as checkpoint_file:
+                return Checkpoint.from_dict(json.load(checkpoint_file))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            error_message = (
+                f"Error loading checkpoint '{resume_token}' from {path}: {e}"
+            )
+            logging.error(error_message)
+            raise CheckpointError(error_message)
+
+    def delete(self, resume_token: str) -> None:
+        try:
+            os.remove(self._path(resume_token))
+        except FileNotFoundError:
+            pass
+
+
+_in_memory_checkpoint_store = InMemoryCheckpointStore()
+
+
+def get_checkpoint_store(config) -> Optional[CheckpointStore]:
+    if config.checkpoint_store == "file":
+        return LocalFileCheckpointStore(config.checkpoint_dir)
+    if config.checkpoint_store == "memory":
+        _in_memory_checkpoint_store.ttl_seconds = config.checkpoint_ttl_seconds
+        return _in_memory_checkpoint_store
+    return None
+
+
+def reset_checkpoint_stores() -> None:
+    _in_memory_checkpoint_store.clear()
@@ -0,0 +1,201 @@
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import requests
+
+from utilities.custom_exceptions import DeadlineExceeded
+from utilities.deadline import get_current_deadline
+from utilities.tracing import set_span_attribute
+
+OVERLOAD_STATUS_PATTERN = re.compile(r"\b(429|5\d\d) (Client|Server) Error\b")
+
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    response = getattr(error, "response", None)
+    status_code = getattr(response, "status_code", None) or getattr(
+        error, "status_code", None
+    )
+    if isinstance(status_code, int):
+        return status_code
+    match = OVERLOAD_STATUS_PATTERN.search(str(error))
+    return int(match.group(1)) if match else None
+
+
+def is_overload_error(error: BaseException) -> bool:
+    if isinstance(error, (TimeoutError, requests.exceptions.Timeout)):
+        return True
+    status_code = get_status_code(error)
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+
+class AIMDConcurrencyLimiter:
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target_seconds: float,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        self.name = name
+        self._condition = threading.Condition()
+        self.configure(
+            initial_limit, min_limit, max_limit, latency_target_seconds, decrease_factor
+        )
+        self._in_flight = 0
+        self._increases = 0
+        self._decreases = 0
+        self._history: deque[dict] = deque(maxlen=50)
+
+    def configure(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target_seconds: float,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        with self._condition:
+            self.min_limit = max(1, min_limit)
+            self.max_limit = max(self.min_limit, max_limit)
+            self.latency_target_seconds = latency_target_seconds
+            self.decrease_factor = decrease_factor
+            self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+            self._condition.notify_all()
+
+    @property
+    def limit(self) -> int:
+        # Tolerate float drift from repeated 1 / limit increments
+        return int(self._limit + 1e-9)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _acquire(self, timeout: Optional[float]) -> None:
+        with self._condition:
+            acquired = self._condition.wait_for(
+                lambda: self._in_flight < self.limit, timeout
+            )
+            if not acquired:
+                raise DeadlineExceeded(
+                    f"Timed out waiting for a free slot in the {self.name} concurrency limiter"
+                )
+            self._in_flight += 1
+
+    def _release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    def _change_limit(self, new_limit: float, reason: str) -> None:
+        old_limit = self.limit
+        self._limit = new_limit
+        if self.limit == old_limit:
+            return
+        if self.limit > old_limit:
+            self._increases += 1
+        else:
+            self._decreases += 1
+        self._history.append(
+            {
+                "timestamp": time.time(),
+                "old_limit": old_limit,
+                "new_limit": self.limit,
+                "reason": reason,
+            }
+        )
+        logging.debug(
+            f"{self.name} concurrency limit changed from {old_limit} to {self.limit} ({reason})"
+        )
+        self._condition.notify_all()
+
+    def on_success(self, latency_seconds: float) -> None:
+        with self._condition:
+            if latency_seconds > self.latency_target_seconds:
+                return
+            # Additive increase of roughly one slot per full window of successful calls
+            new_limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+            self._change_limit(new_limit, "latency under target")
+
+    def on_overload(self, reason: str) -> None:
+        with self._condition:
+            new_limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+            self._change_limit(new_limit, reason)
+
+    @contextmanager
+    def limit_concurrency(self) -> Iterator[None]:
+        deadline = get_current_deadline()
+        self._acquire(deadline.remaining() if deadline is not None else None)
+        set_span_attribute("concurrency.limit", self.limit)
+        start_time = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            if is_overload_error(e):
+                self.on_overload(f"{type(e).__name__}: {e}")
+            raise
+        else:
+            self.on_success(time.monotonic() - start_time)
+        finally:
+            self._release()
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "name": self.name,
+                "limit": self.limit,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "latency_target_seconds": self.latency_target_seconds,
+                "limit_increases": self._increases,
+                "limit_decreases": self._decreases,
+                "limit_history": list(self._history),
+            }
+
+
+_concurrency_limiters: dict[str, AIMDConcurrencyLimiter] = {}
+_concurrency_limiters_lock = threading.Lock()
+
+
+def get_concurrency_limiter(
+    name: str,
+    initial_limit: int,
+    min_limit: int,
+    max_limit: int,
+    latency_target_seconds: float,
+) -> AIMDConcurrencyLimiter:
+    with _concurrency_limiters_lock:
+        limiter = _concurrency_limiters.get(name)
+        if limiter is None:
+            limiter = AIMDConcurrencyLimiter(
+                name, initial_limit, min_limit, max_limit, latency_target_seconds
+            )
+            _concurrency_limiters[name] = limiter
+        elif (
+            limiter.min_limit,
+            limiter.max_limit,
+            limiter.latency_target_seconds,
+        ) != (max(1, min_limit), max_limit, latency_target_seconds):
+            limiter.configure(
+                initial_limit, min_limit, max_limit, latency_target_seconds
+            )
+        return limiter
+
+
+def get_concurrency_limiter_stats() -> list[dict]:
+    with _concurrency_limiters_lock:
+        limiters = list(_concurrency_limiters.values())
+    return [limiter.stats() for limiter in limiters]
+
+
+def reset_concurrency_limiters() -> None:
+    with _concurrency_limiters_lock:
+        _concurrency_limiters.clear()
@@ -122,3 +122,60 @@ class InvalidQuestionnaireMonth(Exception):
 
     def __str__(self):
         return self._format_message()
+
+
+class DeadlineExceeded(Exception):
+    def __init__(self, message=None):
+        self.message = message
+        super().__init__(self._format_message())
+
+    def _format_message(self):
+        if self.message:
+            return self.message
+        return ""
+
+    def __str__(self):
+        return self._format_message()
+
+
+class CheckpointError(Exception):
+    def __init__(self, message=None):
+        self.message = message
+        super().__init__(self._format_message())
+
+    def _format_message(self):
+        if self.message:
+            return self.message
+        return ""
+
+    def __str__(self):
+        return self._format_message()
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, message=None, retry_after_seconds=1):
+        self.message = message
+        self.retry_after_seconds = retry_after_seconds
+        super().__init__(self._format_message())
+
+    def _format_message(self):
+        if self.message:
+            return self.message
+        return ""
+
+    def __str__(self):
+        return self._format_message()
+
+
+class CassetteError(Exception):
+    def __init__(self, message=None):
+        self.message = message
+        super().__init__(self._format_message())
+
+    def _format_message(self):
+        if self.message:
+            return self.message
+        return ""
+
+    def __str__(self):
+        return self._format_message()
@@ -0,0 +1,47 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from utilities.custom_exceptions import DeadlineExceeded
+
+_current_deadline: contextvars.ContextVar[Optional["Deadline"]] = (
+    contextvars.ContextVar("current_deadline", default=None)
+)
+
+
+class Deadline:
+    def __init__(self, budget_seconds: float) -> None:
+        self.budget_seconds = budget_seconds
+        self._expires_at = time.monotonic() + budget_seconds
+
+    @classmethod
+    def from_config(cls, config) -> "Deadline":
+        return cls(config.request_deadline_seconds - config.deadline_margin_seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self._expires_at
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def get_current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+def check_deadline(operation: str) -> None:
+    deadline = _current_deadline.get()
+    if deadline is not None and deadline.expired():
+        raise DeadlineExceeded(
+            f"Request deadline of {deadline.budget_seconds}s exceeded before {operation}"
+        )
@@ -0,0 +1,53 @@
+import os
+import time
+from typing import Any
+
+from utilities.admission_control import get_admission_controller_stats
+from utilities.blaise_call_counter import get_blaise_call_stats
+from utilities.concurrency_limiter import get_concurrency_limiter_stats
+from utilities.rate_limiter import get_rate_limiter_stats
+from utilities.single_flight import get_single_flight_stats
+from utilities.tracing import tracer
+from utilities.ttl_cache import get_ttl_cache_stats
+
+_instance_started_at = time.time()
+
+
+def get_cache_diagnostics() -> list[dict[str, Any]]:
+    caches = []
+    for stats in get_ttl_cache_stats():
+        lookups = stats["hits"] + stats["misses"]
+        caches.append(
+            {
+                **stats,
+                "hit_rate": round(stats["hits"] / lookups, 3) if lookups else None,
+            }
+        )
+    return caches
+
+
+def get_diagnostics() -> dict[str, Any]:
+    admission = get_admission_controller_stats()
+    return {
+        "instance": {
+            "pid": os.getpid(),
+            "started_at": _instance_started_at,
+            "uptime_seconds": round(time.time() - _instance_started_at, 3),
+        },
+        "in_flight_requests": {
+            stats["name"]: {"in_flight": stats["in_flight"], "queued": stats["queued"]}
+            for stats in admission
+        },
+        "caches": get_cache_diagnostics(),
+        "blaise_latency": tracer.latency_stats_exporter.get_latency_stats("blaise."),
+        "handler_latency": {
+            name: stats
+            for name, stats in tracer.latency_stats_exporter.get_latency_stats().items()
+            if not name.startswith("blaise.") and not name.endswith("_handler")
+        },
+        "blaise_calls": get_blaise_call_stats(),
+        "admission_control": admission,
+        "rate_limiters": get_rate_limiter_stats(),
+        "write_concurrency": get_concurrency_limiter_stats(),
+        "coalesced_calls": get_single_flight_stats(),
+    }
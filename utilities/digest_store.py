@@ -0,0 +1,109 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from models.run_digest_model import RunDigest
+
+
+def digest_key(questionnaire_name: str, role: str) -> str:
+    # Hashed so the key is safe to use as a file name whatever the role contains
+    return hashlib.sha256(f"{questionnaire_name}\n{role}".encode()).hexdigest()
+
+
+class DigestStore(ABC):
+    @abstractmethod
+    def save(self, digest: RunDigest) -> None:
+        pass
+
+    @abstractmethod
+    def load(self, questionnaire_name: str, role: str) -> Optional[RunDigest]:
+        pass
+
+    @abstractmethod
+    def delete(self, questionnaire_name: str, role: str) -> None:
+        pass
+
+
+class InMemoryDigestStore(DigestStore):
+    def __init__(self) -> None:
+        self._digests: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def save(self, digest: RunDigest) -> None:
+        with self._lock:
+            self._digests[digest_key(digest.questionnaire_name, digest.role)] = (
+                digest.to_dict()
+            )
+
+    def load(self, questionnaire_name: str, role: str) -> Optional[RunDigest]:
+        with self._lock:
+            data = self._digests.get(digest_key(questionnaire_name, role))
+        return RunDigest.from_dict(data) if data else None
+
+    def delete(self, questionnaire_name: str, role: str) -> None:
+        with self._lock:
+            self._digests.pop(digest_key(questionnaire_name, role), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._digests.clear()
+
+
+class LocalFileDigestStore(DigestStore):
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+
+    def _path(self, questionnaire_name: str, role: str) -> str:
+        return os.path.join(
+            self._directory, f"{digest_key(questionnaire_name, role)}.json"
+        )
+
+    def save(self, digest: RunDigest) -> None:
+        path = self._path(digest.questionnaire_name, digest.role)
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self._directory, suffix=".tmp", delete=False
+            ) as digest_file:
+                json.dump(digest.to_dict(), digest_file)
+            os.replace(digest_file.name, path)
+        except OSError as e:
+            # A lost digest only costs the next run a full scan
+            logging.warning(f"Error saving run digest to {path}: {e}")
+
+    def load(self, questionnaire_name: str, role: str) -> Optional[RunDigest]:
+        path = self._path(questionnaire_name, role)
+        try:
+            with open(path) as digest_file:
+                return RunDigest.from_dict(json.load(digest_file))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logging.warning(f"Ignoring unreadable run digest {path}: {e}")
+            return None
+
+    def delete(self, questionnaire_name: str, role: str) -> None:
+        try:
+            os.remove(self._path(questionnaire_name, role))
+        except FileNotFoundError:
+            pass
+
+
+_in_memory_digest_store = InMemoryDigestStore()
+
+
+def get_digest_store(config) -> Optional[DigestStore]:
+    if config.change_detection_store == "file":
+        return LocalFileDigestStore(config.change_detection_dir)
+    if config.change_detection_store == "memory":
+        return _in_memory_digest_store
+    return None
+
+
+def reset_digest_stores() -> None:
+    _in_memory_digest_store.clear()
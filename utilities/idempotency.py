@@ -0,0 +1,96 @@
+import hashlib
+import logging
+import re
+import time
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from models.idempotent_response_model import IdempotentResponse
+from utilities.idempotency_store import IdempotencyStore
+from utilities.single_flight import SingleFlight
+from utilities.tracing import set_span_attribute
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+VALID_IDEMPOTENCY_KEY = re.compile(r"^[\x21-\x7e]{1,255}$")
+
+_idempotency_flight = SingleFlight("idempotency")
+
+
+def _get_idempotency_key(request) -> Optional[str]:
+    headers = getattr(request, "headers", None)
+    return headers.get(IDEMPOTENCY_KEY_HEADER) if headers is not None else None
+
+
+def _request_hash(request) -> str:
+    return hashlib.sha256(request.get_data(cache=True)).hexdigest()
+
+
+def idempotent(
+    name: str,
+    error_message_prefix: str,
+    get_store: Callable[[], Optional[IdempotencyStore]],
+    format_body: Callable[[str], Any] = lambda message: message,
+):
+    def decorator(handler):
+        def run_once(
+            request, store: IdempotencyStore, key: str, request_hash: str
+        ) -> Any:
+            stored = store.load(key)
+            if stored is not None:
+                if stored.request_hash != request_hash:
+                    error_message = (
+                        f"{error_message_prefix}: {IDEMPOTENCY_KEY_HEADER} "
+                        f"{key.split(':', 1)[1]} was already used with a different request"
+                    )
+                    logging.error(error_message)
+                    return format_body(error_message), 422
+                set_span_attribute("idempotency.replayed", True)
+                logging.info(f"Replaying the stored {name} response for {key}")
+                return (
+                    stored.body,
+                    stored.status_code,
+                    {"Idempotent-Replayed": "true"},
+                )
+
+            response = handler(request)
+            body, status_code = response[0], response[1]
+            # Only complete responses are kept, a retry after a failure or a partial
+            # 202 runs again and picks up where the earlier call stopped
+            if status_code == 200:
+                store.save(
+                    IdempotentResponse(
+                        key,
+                        request_hash,
+                        body,
+                        status_code,
+                        time.time() + store.ttl_seconds,
+                    )
+                )
+            return response
+
+        @wraps(handler)
+        def wrapper(request):
+            idempotency_key = _get_idempotency_key(request)
+            if idempotency_key is None:
+                return handler(request)
+            if not VALID_IDEMPOTENCY_KEY.match(idempotency_key):
+                error_message = (
+                    f"{error_message_prefix}: {IDEMPOTENCY_KEY_HEADER} must be 1 to 255 "
+                    "printable characters without spaces"
+                )
+                logging.error(error_message)
+                return format_body(error_message), 400
+
+            store = get_store()
+            if store is None:
+                return handler(request)
+            key = f"{name}:{idempotency_key}"
+            request_hash = _request_hash(request)
+            # A retry that arrives while the first call is still running waits for its response
+            return _idempotency_flight.do(
+                (key, request_hash), run_once, request, store, key, request_hash
+            )
+
+        return wrapper
+
+    return decorator
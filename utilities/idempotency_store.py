@@ -0,0 +1,155 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import closing
+from typing import Optional
+
+from models.idempotent_response_model import IdempotentResponse
+
+
+class IdempotencyStore(ABC):
+    ttl_seconds: float = 86400.0
+
+    @abstractmethod
+    def save(self, response: IdempotentResponse) -> None:
+        pass
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[IdempotentResponse]:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    def __init__(self, ttl_seconds: float = 86400.0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._responses: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def save(self, response: IdempotentResponse) -> None:
+        now = time.time()
+        with self._lock:
+            # Expired keys are dropped on write so the store does not grow without bound
+            for key in [
+                key
+                for key, data in self._responses.items()
+                if now >= data["expires_at"]
+            ]:
+                del self._responses[key]
+            self._responses[response.key] = response.to_dict()
+
+    def load(self, key: str) -> Optional[IdempotentResponse]:
+        with self._lock:
+            data = self._responses.get(key)
+        if not data:
+            return None
+        response = IdempotentResponse.from_dict(data)
+        return None if response.is_expired(time.time()) else response
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._responses.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._responses.clear()
+
+
+class SqliteIdempotencyStore(IdempotencyStore):
+    # Shared by every worker process on a host, unlike the in-memory store
+    def __init__(self, path: str, ttl_seconds: float = 86400.0) -> None:
+        self._path = path
+        self.ttl_seconds = ttl_seconds
+        self._initialised = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialised:
+            with self._lock:
+                if not self._initialised:
+                    os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+                    with closing(sqlite3.connect(self._path, timeout=5)) as connection:
+                        with connection:
+                            connection.execute(
+                                "CREATE TABLE IF NOT EXISTS idempotent_responses ("
+                                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                                "expires_at REAL NOT NULL)"
+                            )
+                    self._initialised = True
+        return sqlite3.connect(self._path, timeout=5)
+
+    def save(self, response: IdempotentResponse) -> None:
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute(
+                    "DELETE FROM idempotent_responses WHERE expires_at <= ?",
+                    (time.time(),),
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO idempotent_responses VALUES (?, ?, ?)",
+                    (
+                        response.key,
+                        json.dumps(response.to_dict()),
+                        response.expires_at,
+                    ),
+                )
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            # A lost response only costs a retry a full run
+            logging.warning(
+                f"Error saving idempotent response for key {response.key}: {e}"
+            )
+
+    def load(self, key: str) -> Optional[IdempotentResponse]:
+        try:
+            with closing(self._connect()) as connection:
+                row = connection.execute(
+                    "SELECT response FROM idempotent_responses "
+                    "WHERE key = ? AND expires_at > ?",
+                    (key, time.time()),
+                ).fetchone()
+            return IdempotentResponse.from_dict(json.loads(row[0])) if row else None
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable idempotent response for {key}: {e}")
+            return None
+
+    def delete(self, key: str) -> None:
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute(
+                    "DELETE FROM idempotent_responses WHERE key = ?", (key,)
+                )
+        except (sqlite3.Error, OSError) as e:
+            logging.warning(f"Error deleting idempotent response for {key}: {e}")
+
+
+_in_memory_idempotency_store = InMemoryIdempotencyStore()
+_sqlite_idempotency_stores: dict[str, SqliteIdempotencyStore] = {}
+_sqlite_idempotency_stores_lock = threading.Lock()
+
+
+def get_idempotency_store(config) -> Optional[IdempotencyStore]:
+    store: Optional[IdempotencyStore] = None
+    if config.idempotency_store == "sqlite":
+        with _sqlite_idempotency_stores_lock:
+            store = _sqlite_idempotency_stores.get(config.idempotency_db_path)
+            if store is None:
+                store = SqliteIdempotencyStore(config.idempotency_db_path)
+                _sqlite_idempotency_stores[config.idempotency_db_path] = store
+    elif config.idempotency_store == "memory":
+        store = _in_memory_idempotency_store
+    if store is not None:
+        store.ttl_seconds = config.idempotency_ttl_seconds
+    return store
+
+
+def reset_idempotency_stores() -> None:
+    _in_memory_idempotency_store.clear()
+    with _sqlite_idempotency_stores_lock:
+        _sqlite_idempotency_stores.clear()
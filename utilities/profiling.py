@@ -0,0 +1,195 @@
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from typing import Callable, Optional
+
+from appconfig.config import Config
+
+PROFILING_HEADER = "X-Profiling-Mode"
+CPROFILE_MODE = "cprofile"
+SAMPLE_MODE = "sample"
+VALID_PROFILING_MODES = (CPROFILE_MODE, SAMPLE_MODE)
+
+# cProfile can only have one active profiler per process
+_cprofile_lock = threading.Lock()
+
+
+def get_profiling_mode(request) -> Optional[str]:
+    mode = os.getenv("PROFILING_MODE")
+    headers = getattr(request, "headers", None)
+    if headers and os.getenv("PROFILING_HEADER_ENABLED", "").lower() == "true":
+        mode = headers.get(PROFILING_HEADER) or mode
+    if not mode:
+        return None
+
+    mode = mode.strip().lower()
+    if mode not in VALID_PROFILING_MODES:
+        logging.warning(
+            f"Ignoring unknown profiling mode '{mode}'. "
+            f"Valid modes are: {list(VALID_PROFILING_MODES)}"
+        )
+        return None
+    return mode
+
+
+def get_profiling_output_dir() -> str:
+    return os.getenv("PROFILING_OUTPUT_DIR") or tempfile.gettempdir()
+
+
+def format_frame(filename: str, line_number: int, function: str) -> str:
+    return f"{function} ({os.path.basename(filename)}:{line_number})"
+
+
+class StackSampler:
+    def __init__(self, thread_id: int, interval_seconds: float = 0.005) -> None:
+        self._thread_id = thread_id
+        self._interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.stack_counts: Counter[str] = Counter()
+        self.leaf_counts: Counter[str] = Counter()
+        self.total_samples = 0
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval_seconds):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    format_frame(code.co_filename, frame.f_lineno, code.co_name)
+                )
+                frame = frame.f_back
+
+            self.leaf_counts[stack[0]] += 1
+            self.stack_counts[";".join(reversed(stack))] += 1
+            self.total_samples += 1
+
+    def hotspot_summary(self, top_n: int) -> list[str]:
+        return [
+            f"{count / self.total_samples:6.1%} {frame}"
+            for frame, count in self.leaf_counts.most_common(top_n)
+        ]
+
+    def write_collapsed_stacks(self, file_path: str) -> None:
+        with open(file_path, "w") as stacks_file:
+            for stack, count in self.stack_counts.items():
+                stacks_file.write(f"{stack} {count}\n")
+
+
+def cprofile_hotspot_summary(profiler: cProfile.Profile, top_n: int) -> list[str]:
+    stats = pstats.Stats(profiler)
+    entries = sorted(
+        stats.stats.items(),  # type: ignore[attr-defined]
+        key=lambda item: item[1][2],
+        reverse=True,
+    )
+    return [
+        f"{total_time * 1000:9.2f}ms self {cumulative_time * 1000:9.2f}ms cum "
+        f"{calls:6d} calls {format_frame(*function)}"
+        for function, (_, calls, total_time, cumulative_time, _) in entries[:top_n]
+    ]
+
+
+def _output_path(function_name: str, extension: str) -> str:
+    file_name = f"{function_name}-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{threading.get_ident()}.{extension}"
+    return os.path.join(get_profiling_output_dir(), file_name)
+
+
+def _log_summary(function_name: str, mode: str, lines: list[str], path: str) -> None:
+    summary = "\n".join(lines)
+    logging.info(
+        f"Profiling summary ({mode}) for '{function_name}', raw stats written to {path}:\n{summary}"
+    )
+
+
+def _run_with_cprofile(
+    function_name: str, config: Config, func: Callable, *args, **kwargs
+):
+    if not _cprofile_lock.acquire(blocking=False):
+        logging.warning(
+            f"cProfile is already running in this process, '{function_name}' will not be profiled"
+        )
+        return func(*args, **kwargs)
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            try:
+                path = _output_path(function_name, "prof")
+                profiler.dump_stats(path)
+                _log_summary(
+                    function_name,
+                    CPROFILE_MODE,
+                    cprofile_hotspot_summary(profiler, config.profiling_top_n),
+                    path,
+                )
+            except OSError as e:
+                logging.warning(f"Unable to write profiling stats: {e}")
+    finally:
+        _cprofile_lock.release()
+
+
+def _run_with_sampler(
+    function_name: str, config: Config, func: Callable, *args, **kwargs
+):
+    sampler = StackSampler(
+        threading.get_ident(), config.profiling_sample_interval_ms / 1000
+    )
+    sampler.start()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        sampler.stop()
+        try:
+            path = _output_path(function_name, "collapsed")
+            sampler.write_collapsed_stacks(path)
+            _log_summary(
+                function_name,
+                SAMPLE_MODE,
+                [f"{sampler.total_samples} samples"]
+                + sampler.hotspot_summary(config.profiling_top_n),
+                path,
+            )
+        except OSError as e:
+            logging.warning(f"Unable to write profiling stats: {e}")
+
+
+def profiled(
+    function_name: str, get_config: Callable[[], Optional[Config]]
+) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(request, *args, **kwargs):
+            mode = get_profiling_mode(request)
+            # Without a valid config the handler only reports the config error
+            config = get_config() if mode else None
+            if config is None:
+                return func(request, *args, **kwargs)
+            runner = _run_with_cprofile if mode == CPROFILE_MODE else _run_with_sampler
+            return runner(function_name, config, func, request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,104 @@
+import threading
+import time
+from typing import Optional
+
+from utilities.custom_exceptions import DeadlineExceeded
+from utilities.deadline import get_current_deadline
+
+
+class TokenBucket:
+    def __init__(self, name: str, rate_per_second: float, capacity: float) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self.configure(rate_per_second, capacity)
+        self._acquisitions = 0
+        self._throttled = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def configure(self, rate_per_second: float, capacity: float) -> None:
+        with self._lock:
+            self.rate_per_second = rate_per_second
+            self.capacity = max(capacity, 1.0)
+            self._tokens = self.capacity
+            self._last_refill = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate_per_second <= 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+        self._last_refill = now
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> float:
+        if self.unlimited:
+            return 0.0
+
+        with self._lock:
+            self._refill(time.monotonic())
+            # Reserve the tokens up front, callers then sleep off any debt in arrival order
+            wait_seconds = max(0.0, (tokens - self._tokens) / self.rate_per_second)
+            if timeout is not None and wait_seconds > timeout:
+                raise DeadlineExceeded(
+                    f"Waiting {wait_seconds:.2f}s for the {self.name} rate limiter "
+                    f"would exceed the remaining {timeout:.2f}s"
+                )
+            self._tokens -= tokens
+            self._acquisitions += 1
+            if wait_seconds > 0:
+                self._throttled += 1
+                self._total_wait_seconds += wait_seconds
+                self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+        return wait_seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "rate_per_second": self.rate_per_second,
+                "capacity": self.capacity,
+                "acquisitions": self._acquisitions,
+                "throttled": self._throttled,
+                "total_wait_seconds": round(self._total_wait_seconds, 6),
+                "max_wait_seconds": round(self._max_wait_seconds, 6),
+            }
+
+
+_rate_limiters: dict[str, TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate_per_second: float, capacity: float) -> TokenBucket:
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(name)
+        if limiter is None:
+            limiter = TokenBucket(name, rate_per_second, capacity)
+            _rate_limiters[name] = limiter
+        elif (limiter.rate_per_second, limiter.capacity) != (
+            rate_per_second,
+            max(capacity, 1.0),
+        ):
+            limiter.configure(rate_per_second, capacity)
+        return limiter
+
+
+def acquire_within_deadline(limiter: TokenBucket, tokens: float = 1.0) -> float:
+    deadline = get_current_deadline()
+    timeout = deadline.remaining() if deadline is not None else None
+    return limiter.acquire(tokens, timeout)
+
+
+def get_rate_limiter_stats() -> list[dict]:
+    with _rate_limiters_lock:
+        limiters = list(_rate_limiters.values())
+    return [limiter.stats() for limiter in limiters]
+
+
+def reset_rate_limiters() -> None:
+    with _rate_limiters_lock:
+        _rate_limiters.clear()
@@ -0,0 +1,95 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    name: str
+    required: bool = True
+    pattern: Optional[str] = None
+    allowed: Optional[Iterable[str]] = None
+    invalid_message: str = "{value} is not a valid {name}"
+    blank_is_missing: bool = False
+    kind: str = "string"
+
+
+def _is_valid_kind(kind: str, value: Any) -> bool:
+    if kind == "string_list":
+        return isinstance(value, list) and all(
+            isinstance(item, str) and item for item in value
+        )
+    if kind == "boolean":
+        return isinstance(value, bool)
+    if kind == "integer":
+        return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+    return isinstance(value, str)
+
+
+class _CompiledField:
+    __slots__ = (
+        "name",
+        "kind",
+        "required",
+        "match",
+        "allowed",
+        "invalid_message",
+        "blank_is_missing",
+    )
+
+    def __init__(self, spec: FieldSpec) -> None:
+        self.name = spec.name
+        self.kind = spec.kind
+        self.required = spec.required
+        self.match = re.compile(spec.pattern).match if spec.pattern else None
+        self.allowed = frozenset(spec.allowed) if spec.allowed is not None else None
+        self.invalid_message = spec.invalid_message
+        self.blank_is_missing = spec.blank_is_missing
+
+
+class RequestSchema:
+    def __init__(
+        self,
+        fields: list[FieldSpec],
+        missing_message: str = "Missing required values from request",
+    ) -> None:
+        # Regexes and role sets are compiled once here, not per request
+        self._fields = tuple(_CompiledField(spec) for spec in fields)
+        self._missing_message = missing_message
+
+    def validate(self, request_json: Any) -> tuple[dict[str, Any], list[str]]:
+        if not isinstance(request_json, dict):
+            return {}, [f"Request body must be a JSON object, not {request_json!r}"]
+
+        values: dict[str, Any] = {}
+        missing: list[str] = []
+        violations: list[str] = []
+        for field in self._fields:
+            value = request_json.get(field.name)
+            if (
+                value is None
+                or value == ""
+                or value == []
+                or (
+                    field.blank_is_missing
+                    and isinstance(value, str)
+                    and not value.strip()
+                )
+            ):
+                if field.required:
+                    missing.append(field.name)
+                values[field.name] = None
+                continue
+            if (
+                not _is_valid_kind(field.kind, value)
+                or (field.match is not None and not field.match(value))
+                or (field.allowed is not None and value not in field.allowed)
+            ):
+                violations.append(
+                    field.invalid_message.format(value=value, name=field.name)
+                )
+            values[field.name] = value
+
+        if missing:
+            violations.insert(0, f"{self._missing_message}: {missing}")
+        return values, violations
@@ -0,0 +1,55 @@
+from typing import Iterable
+
+from flask import after_this_request, has_request_context
+
+# Handler phase spans and the Server-Timing metric each one is reported under
+SERVER_TIMING_PHASES = {
+    "request_handler": "validation",
+    "config_handler": "config",
+    "blaise_handler": "questionnaire",
+    "guid_handler": "questionnaire",
+    "user_handler": "users",
+    "existing_donor_case_handler": "case_scan",
+    "donor_case_handler": "writes",
+    "warmup_handler": "warm_up",
+}
+
+
+def format_server_timing(
+    total_ms: float,
+    phase_durations: Iterable[tuple[str, float]],
+    blaise_reads: int,
+    blaise_writes: int,
+    cache_hits: int,
+    cache_misses: int,
+) -> str:
+    durations: dict[str, float] = {}
+    for span_name, duration_ms in phase_durations:
+        metric = SERVER_TIMING_PHASES.get(span_name)
+        if metric is not None:
+            durations[metric] = durations.get(metric, 0.0) + duration_ms
+
+    metrics = [
+        f"{metric};dur={durations[metric]:.1f}"
+        for metric in dict.fromkeys(SERVER_TIMING_PHASES.values())
+        if metric in durations
+    ]
+    metrics += [
+        f'blaise_reads;desc="{blaise_reads}"',
+        f'blaise_writes;desc="{blaise_writes}"',
+        f'cache_hits;desc="{cache_hits}"',
+        f'cache_misses;desc="{cache_misses}"',
+        f"total;dur={total_ms:.1f}",
+    ]
+    return ", ".join(metrics)
+
+
+def add_server_timing_header(value: str) -> None:
+    # Handlers keep returning (body, status), the header is added to the Flask response on the way out
+    if not has_request_context():
+        return
+
+    @after_this_request
+    def set_server_timing(response):
+        response.headers["Server-Timing"] = value
+        return response
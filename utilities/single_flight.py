@@ -0,0 +1,75 @@
+import threading
+from typing import Any, Callable, Hashable, Optional
+
+from utilities.custom_exceptions import DeadlineExceeded
+from utilities.deadline import get_current_deadline
+from utilities.tracing import set_span_attribute
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._executions = 0
+        self._shared = 0
+        _single_flights.append(self)
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                self._shared += 1
+                is_leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._executions += 1
+                is_leader = True
+
+        if not is_leader:
+            set_span_attribute(f"single_flight.{self.name}.shared", True)
+            deadline = get_current_deadline()
+            if not call.done.wait(deadline.remaining() if deadline else None):
+                raise DeadlineExceeded(
+                    f"Request deadline exceeded waiting for a shared {self.name} call"
+                )
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "executions": self._executions,
+                "shared": self._shared,
+                "in_flight": len(self._calls),
+            }
+
+
+_single_flights: list[SingleFlight] = []
+
+
+def get_single_flight_stats() -> list[dict]:
+    return [single_flight.stats() for single_flight in _single_flights]
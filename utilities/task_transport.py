@@ -0,0 +1,95 @@
+import contextvars
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+import google.auth.transport.requests
+import google.oauth2.id_token
+import requests
+
+from models.shard_model import ShardResult, ShardTask
+from utilities.deadline import get_current_deadline
+
+
+class TaskTransport(ABC):
+    @abstractmethod
+    def dispatch(self, task: ShardTask) -> "Future[ShardResult]":
+        pass
+
+
+class LocalQueueTransport(TaskTransport):
+    # Runs shards on an in-process worker pool, a stand-in for a real task queue
+    def __init__(
+        self, worker: Callable[[ShardTask], ShardResult], max_workers: int
+    ) -> None:
+        self._worker = worker
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="shard-worker"
+        )
+
+    def dispatch(self, task: ShardTask) -> "Future[ShardResult]":
+        return self._executor.submit(contextvars.copy_context().run, self._worker, task)
+
+
+class HttpTaskTransport(TaskTransport):
+    # Sends each shard to the create_donor_cases_shard function, so shards run on separate instances
+    # ID tokens last an hour, so one is reused until shortly before it expires
+    ID_TOKEN_LIFETIME_SECONDS = 3000
+
+    def __init__(self, worker_url: str, max_workers: int) -> None:
+        self._worker_url = worker_url
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="shard-dispatch"
+        )
+        self._id_token: Optional[str] = None
+        self._id_token_expires_at = 0.0
+        self._id_token_lock = threading.Lock()
+
+    def _get_id_token(self) -> str:
+        # The worker only accepts calls carrying an ID token for its own URL
+        with self._id_token_lock:
+            if self._id_token is None or time.monotonic() >= self._id_token_expires_at:
+                self._id_token = google.oauth2.id_token.fetch_id_token(
+                    google.auth.transport.requests.Request(), self._worker_url
+                )
+                self._id_token_expires_at = (
+                    time.monotonic() + self.ID_TOKEN_LIFETIME_SECONDS
+                )
+            return self._id_token
+
+    def _send(self, task: ShardTask, timeout: Optional[float]) -> ShardResult:
+        response = requests.post(
+            self._worker_url,
+            json=task.to_dict(),
+            headers={"Authorization": f"Bearer {self._get_id_token()}"},
+            timeout=timeout,
+        )
+        if response.status_code not in (200, 202):
+            raise Exception(
+                f"Shard {task.shard_index} worker returned {response.status_code}: {response.text}"
+            )
+        return ShardResult.from_dict(response.json())
+
+    def dispatch(self, task: ShardTask) -> "Future[ShardResult]":
+        deadline = get_current_deadline()
+        return self._executor.submit(
+            self._send, task, deadline.remaining() if deadline is not None else None
+        )
+
+
+def get_task_transport(
+    config, worker: Callable[[ShardTask], ShardResult]
+) -> TaskTransport:
+    if config.orchestrator_transport == "http":
+        if not config.orchestrator_worker_url:
+            logging.warning(
+                "ORCHESTRATOR_WORKER_URL is not set, running shards on the local queue"
+            )
+        else:
+            return HttpTaskTransport(
+                config.orchestrator_worker_url, config.orchestrator_max_parallel_shards
+            )
+    return LocalQueueTransport(worker, config.orchestrator_max_parallel_shards)
@@ -0,0 +1,283 @@
+import contextvars
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional
+
+from utilities.blaise_call_counter import counting_blaise_calls
+from utilities.server_timing import add_server_timing_header, format_server_timing
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+# Durations of the spans ended during the current handler invocation, for its Server-Timing header
+_handler_phase_durations: contextvars.ContextVar[Optional[list[tuple[str, float]]]] = (
+    contextvars.ContextVar("handler_phase_durations", default=None)
+)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    start_time_unix_nano: int = 0
+    end_time_unix_nano: Optional[int] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status_code: str = "UNSET"
+    status_message: str = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_status(self, status_code: str, status_message: str = "") -> None:
+        self.status_code = status_code
+        self.status_message = status_message
+
+    def end(self) -> None:
+        if self.end_time_unix_nano is None:
+            self.end_time_unix_nano = time.time_ns()
+
+    @property
+    def duration_ms(self) -> float:
+        end_time = self.end_time_unix_nano or time.time_ns()
+        return (end_time - self.start_time_unix_nano) / 1_000_000
+
+    def to_dict(self) -> dict[str, Any]:
+        # Follows the OTLP/JSON span layout so exports can be loaded by standard tooling
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id or "",
+            "name": self.name,
+            "startTimeUnixNano": str(self.start_time_unix_nano),
+            "endTimeUnixNano": str(self.end_time_unix_nano or ""),
+            "attributes": [
+                {"key": key, "value": _format_attribute_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": self.status_code, "message": self.status_message},
+        }
+
+
+def _format_attribute_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    def __init__(self, max_spans: int = 1000) -> None:
+        self._spans: deque[Span] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def get_finished_spans(self, trace_id: Optional[str] = None) -> list[Span]:
+        with self._lock:
+            spans = list(self._spans)
+        if trace_id is None:
+            return spans
+        return [span for span in spans if span.trace_id == trace_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class LatencyStatsExporter(SpanExporter):
+    def __init__(self, max_samples: int = 512) -> None:
+        self._max_samples = max_samples
+        self._durations: dict[str, deque[float]] = {}
+        self._errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            durations = self._durations.get(span.name)
+            if durations is None:
+                durations = self._durations[span.name] = deque(maxlen=self._max_samples)
+                self._errors[span.name] = 0
+            durations.append(span.duration_ms)
+            if span.status_code == "ERROR":
+                self._errors[span.name] += 1
+
+    @staticmethod
+    def _percentile(sorted_durations: list[float], percentile: int) -> float:
+        # Nearest-rank percentile over the recent samples
+        index = max(0, -(-percentile * len(sorted_durations) // 100) - 1)
+        return round(sorted_durations[index], 3)
+
+    def get_latency_stats(self, prefix: str = "") -> dict[str, dict[str, Any]]:
+        with self._lock:
+            samples = {
+                name: (sorted(durations), self._errors[name])
+                for name, durations in self._durations.items()
+                if name.startswith(prefix)
+            }
+        return {
+            name: {
+                "samples": len(durations),
+                "errors": errors,
+                "p50_ms": self._percentile(durations, 50),
+                "p90_ms": self._percentile(durations, 90),
+                "p99_ms": self._percentile(durations, 99),
+                "max_ms": round(durations[-1], 3),
+            }
+            for name, (durations, errors) in sorted(samples.items())
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._durations.clear()
+            self._errors.clear()
+
+
+class JsonFileSpanExporter(SpanExporter):
+    def __init__(self, file_path: str) -> None:
+        self._file_path = file_path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        try:
+            with self._lock, open(self._file_path, "a") as export_file:
+                export_file.write(json.dumps(span.to_dict()) + "\n")
+        except OSError as e:
+            logging.warning(f"Unable to export span '{span.name}': {e}")
+
+
+class Tracer:
+    def __init__(self, exporters: Optional[list[SpanExporter]] = None) -> None:
+        self.in_memory_exporter = InMemorySpanExporter()
+        self.latency_stats_exporter = LatencyStatsExporter()
+        self._exporters: list[SpanExporter] = [
+            self.in_memory_exporter,
+            self.latency_stats_exporter,
+        ]
+        self._exporters.extend(exporters or [])
+
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        self._exporters.append(exporter)
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, attributes: Optional[dict[str, Any]] = None
+    ) -> Iterator[Span]:
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_span_id=parent.span_id if parent else None,
+            start_time_unix_nano=time.time_ns(),
+            attributes=dict(attributes or {}),
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.set_status("ERROR", str(e))
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            if span.status_code == "UNSET":
+                span.set_status("OK")
+            phase_durations = _handler_phase_durations.get()
+            if phase_durations is not None:
+                phase_durations.append((span.name, span.duration_ms))
+            self._export(span)
+
+    def _export(self, span: Span) -> None:
+        for exporter in self._exporters:
+            exporter.export(span)
+
+
+def get_current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def set_span_attribute(key: str, value: Any) -> None:
+    span = _current_span.get()
+    if span is not None:
+        span.set_attribute(key, value)
+
+
+def traced(name: str) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def traced_handler(name: str) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            phase_durations: list[tuple[str, float]] = []
+            phases_token = _handler_phase_durations.set(phase_durations)
+            try:
+                with tracer.start_as_current_span(name) as span, counting_blaise_calls(
+                    name
+                ) as blaise_calls:
+                    response = func(*args, **kwargs)
+                    span.set_attribute("http.status_code", response[1])
+                    span.set_attribute("blaise.read_calls", blaise_calls.reads)
+                    span.set_attribute("blaise.write_calls", blaise_calls.writes)
+                    add_server_timing_header(
+                        format_server_timing(
+                            span.duration_ms,
+                            list(phase_durations),
+                            blaise_calls.reads,
+                            blaise_calls.writes,
+                            blaise_calls.cache_hits,
+                            blaise_calls.cache_misses,
+                        )
+                    )
+                    if response[1] >= 500:
+                        span.set_status("ERROR")
+                    logging.info(
+                        f"Trace {span.trace_id} for '{name}' finished in {span.duration_ms:.1f}ms"
+                    )
+                    return response
+            finally:
+                _handler_phase_durations.reset(phases_token)
+
+        return wrapper
+
+    return decorator
+
+
+def setup_tracer() -> None:
+    export_path = os.getenv("TRACING_EXPORT_PATH")
+    if export_path:
+        tracer.add_exporter(JsonFileSpanExporter(export_path))
+
+
+tracer = Tracer()
@@ -0,0 +1,97 @@
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+from utilities.blaise_call_counter import count_cache_lookup
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, name: str, ttl_seconds: float) -> None:
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            hit = entry is not None and time.monotonic() - entry[0] < self.ttl_seconds
+            if hit:
+                self._hits += 1
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+        count_cache_lookup(hit)
+        return entry[1] if hit and entry is not None else default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return loader()
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            ages = [now - stored_at for stored_at, _ in self._entries.values()]
+            return {
+                "name": self.name,
+                "ttl_seconds": self.ttl_seconds,
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "oldest_entry_age_seconds": round(max(ages), 3) if ages else None,
+            }
+
+
+_ttl_caches: dict[str, TTLCache] = {}
+_ttl_caches_lock = threading.Lock()
+
+
+def get_ttl_cache(name: str, ttl_seconds: float) -> TTLCache:
+    with _ttl_caches_lock:
+        cache = _ttl_caches.get(name)
+        if cache is None:
+            cache = TTLCache(name, ttl_seconds)
+            _ttl_caches[name] = cache
+        elif cache.ttl_seconds != ttl_seconds:
+            cache.ttl_seconds = ttl_seconds
+            cache.clear()
+        return cache
+
+
+def get_ttl_cache_stats() -> list[dict]:
+    with _ttl_caches_lock:
+        caches = list(_ttl_caches.values())
+    return [cache.stats() for cache in caches]
+
+
+def reset_ttl_caches() -> None:
+    with _ttl_caches_lock:
+        _ttl_caches.clear()
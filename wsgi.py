@@ -0,0 +1,41 @@
+import os
+
+from flask import Flask, request
+
+import main
+
+HANDLERS = {
+    "create_donor_cases": ["POST"],
+    "create_donor_cases_shard": ["POST"],
+    "reissue_new_donor_case": ["POST"],
+    "get_users_by_role": ["POST"],
+    "sweep_donor_cases": ["GET", "POST"],
+    "warm_up": ["GET", "POST"],
+    "diagnostics": ["GET"],
+}
+
+
+def _route_to(handler_name: str):
+    def view():
+        # Pass the concrete request rather than the context-local proxy, as GCF does
+        return getattr(main, handler_name)(request._get_current_object())
+
+    view.__name__ = handler_name
+    return view
+
+
+def create_app() -> Flask:
+    app = Flask(__name__)
+    for handler_name, methods in HANDLERS.items():
+        app.add_url_rule(
+            f"/{handler_name}", view_func=_route_to(handler_name), methods=methods
+        )
+    return app
+
+
+if __name__ == "__main__":
+    create_app().run(
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8080")),
+        threaded=True,
+    )